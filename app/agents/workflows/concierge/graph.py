@@ -1,6 +1,5 @@
 from typing import List, Literal
 
-from langchain_anthropic import ChatAnthropic
 from langgraph.graph import StateGraph, END, START
 from langgraph.prebuilt import ToolNode
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, ToolMessage
@@ -12,6 +11,8 @@ from app.core.config import settings
 from app.agents.workflows.concierge.state import ConciergeState
 from app.agents.tools.concierge_tools import concierge_tools
 from app.agents.utils import load_system_prompt, generate_schema_description
+from app.agents.workflows.drafting.llm_utils import create_cached_llm
+from app.agents.workflows.drafting.scheduler import Priority
 from app.api.v1.schemas.client import IndividualClient, CompanyClient
 from app.api.v1.schemas.case import CaseCreate
 
@@ -43,10 +44,14 @@ def get_tools_for_company(company_id: str):
 # So the agent WILL generate `search_clients(company_id="123", query="...")`.
 
 def get_model():
-    return ChatAnthropic(
+    # Interactive priority: users are waiting on the concierge, so it is
+    # scheduled ahead of drafting and background summarization.
+    return create_cached_llm(
         model=settings.LLM_MODEL,
         temperature=0,
-        api_key=settings.ANTHROPIC_API_KEY
+        provider="anthropic",
+        priority=Priority.INTERACTIVE,
+        tools=concierge_tools
     )
 
 # --- 2. Nodes ---
@@ -80,12 +85,11 @@ async def assistant_node(state: ConciergeState):
     filtered_msgs = [m for m in messages if m.type != "system"]
     final_messages = [SystemMessage(content=system_prompt)] + filtered_msgs
     
-    # 2. Bind Tools
-    model = get_model()
-    model_with_tools = model.bind_tools(concierge_tools)
+    # 2. Tool-bound model (shared client from the registry, bound once per process)
+    model_with_tools = get_model()
     
     # 3. Invoke
-    response = await model_with_tools.ainvoke(final_messages)
+    response = await model_with_tools.ainvoke(final_messages, tenant_id=company_id)
     
     return {"messages": [response]}
 
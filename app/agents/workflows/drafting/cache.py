@@ -15,10 +15,11 @@ import hashlib
 import json
 
 class Cache:
-    """Simple in-memory cache with TTL support."""
+    """Simple in-memory cache with TTL support (and an optional entry limit)."""
 
-    def __init__(self):
+    def __init__(self, max_entries: Optional[int] = None):
         self._cache: Dict[str, Dict[str, Any]] = {}
+        self.max_entries = max_entries
         self._stats = {
             "hits": 0,
             "misses": 0,
@@ -57,7 +58,13 @@ class Cache:
             "created_at": time.time(),
             "expires_at": time.time() + ttl if ttl else None
         }
+        # Re-insert so the oldest written entry is evicted first
+        self._cache.pop(key, None)
         self._cache[key] = entry
+        if self.max_entries:
+            while len(self._cache) > self.max_entries:
+                del self._cache[next(iter(self._cache))]
+                self._stats["evictions"] += 1
 
     def delete(self, key: str):
         """Remove key from cache."""
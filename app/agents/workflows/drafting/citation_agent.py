@@ -15,12 +15,13 @@ class DraftCitationAgent:
 
         try:
              # Use shared factory
-             base_llm = create_cached_llm(
+             self.llm = create_cached_llm(
                  model=settings.LLM_MODEL,
                  provider=settings.LLM_PROVIDER,
-                 temperature=0
+                 temperature=0,
+                 tools=citation_tools,
+                 agent_name="citation"
              )
-             self.llm = base_llm.bind_tools(citation_tools)
         except Exception as e:
              # Fallback or error handling
              print(f"Warning: Could not init Citation Agent LLM: {e}")
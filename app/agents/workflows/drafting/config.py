@@ -1,3 +1,4 @@
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 class DraftingConfig(BaseSettings):
@@ -17,6 +18,12 @@ class DraftingConfig(BaseSettings):
     # Context Management
     Initial_DOC_LIMIT: int = 5
     MAX_CONTEXT_TOKENS: int = 16000 # Default context window safe limit
+    CONTEXT_TOKEN_BUDGETS: Dict[str, int] = { # Packed context per agent, see context_packer.py
+        "writer": 6000,          # Related document summaries per section
+        "writer_facts": 2000,    # Section facts not already in case data or document summaries
+        "smart_resolver": 8000   # Case fields + documents for missing-fact inference
+    }
+    DOCUMENT_INDEX_TOP_K: int = 6 # Passages retrieved per section from the case document index
     
     # System Prompts & LLM
     DEFAULT_TEMPERATURE: float = 0.0
@@ -24,6 +31,30 @@ class DraftingConfig(BaseSettings):
     # Cache Settings
     CACHE_TTL_SECONDS: int = 300
 
+    # LLM Scheduler (process-wide, see scheduler.py)
+    LLM_MAX_CONCURRENCY: int = 8 # In-flight requests per model
+    LLM_TOKENS_PER_MINUTE: int = 400000 # Per-model budget, 0 disables budgeting
+    LLM_MODEL_CONCURRENCY: Dict[str, int] = {} # Per-model overrides
+    LLM_MODEL_TOKENS_PER_MINUTE: Dict[str, int] = {} # Per-model overrides
+    LLM_EXPECTED_OUTPUT_TOKENS: int = 1500 # Output reservation when max_tokens isn't given
+
+    # Response Cache (deterministic temperature-0 calls only, see response_cache.py)
+    RESPONSE_CACHE_AGENTS: List[str] = ["reviewer", "fact_extractor", "document_router"]
+    RESPONSE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600 # Durable tier expiry
+    RESPONSE_CACHE_DURABLE: bool = True # Use DynamoDB tier in addition to memory
+    RESPONSE_CACHE_MEMORY_ENTRIES: int = 1000 # In-process tier size
+
+    # Planner Plan Cache (parsed template structure stored on the template record)
+    PLAN_CACHE_ENABLED: bool = True
+    PLAN_CACHE_MAX_ENTRIES: int = 4 # Per template (content edited before drafting gets its own entry)
+
+    # Writer Streaming
+    WRITER_STREAMING: bool = True # Stream section generation and publish live previews
+    WRITER_PREVIEW_INTERVAL_CHARS: int = 400 # Publish a preview every N new characters
+    WRITER_CANCEL_ON_UNFILLED_PLACEHOLDERS: int = 3 # Abort stream after N echoed {placeholders}, 0 disables
+    WRITER_PREFILL_PLACEHOLDERS: bool = True # Substitute registry facts into the section template before the LLM
+    WRITER_SKIP_BOILERPLATE: bool = True # Fully resolvable sections without markers skip the writer and reviewer LLMs
+
     class Config:
         env_prefix = "DRAFTING_"
 
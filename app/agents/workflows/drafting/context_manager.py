@@ -6,6 +6,7 @@ from app.agents.workflows.drafting.config import drafting_config
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import os
+import asyncio
 import html
 import re
 import json
@@ -13,6 +14,17 @@ from app.services.core.case_service import CaseService
 from app.services.core.document_service import DocumentService
 from app.services.core.template_service import TemplateService
 from app.agents.workflows.drafting.cache import cache_content
+from app.agents.workflows.drafting.template_compiler import compile_template
+from app.services.lib.document_index import format_passage_source
+from app.agents.workflows.drafting.context_packer import (
+    ContextItem,
+    extract_terms,
+    pack_for_agent,
+    relevance_score
+)
+
+# Case fields always passed to inference regardless of relevance
+CORE_CASE_FIELDS = {"caseName", "caseNumber", "caseType", "courtName", "jurisdiction"}
 
 # Right after imports
 print(f"DEBUG: Module level - FactEntry imported: {FactEntry}")
@@ -235,6 +247,7 @@ class DraftContextManager:
         - required_facts: Dict of facts needed for this section
         - previous_sections: Last 2-3 drafted sections
         - related_documents: Document summaries relevant to this section
+        - related_passages: Top-k extracted-text passages from the case document index
         - case_context: Case summary, position, prayer
         - consistency_warnings: Any detected conflicts
         - missing_facts: Facts that couldn't be found
@@ -246,8 +259,7 @@ class DraftContextManager:
 
         # Get required facts for this section
         # CRITICAL FIX: Also inspect template for placeholders, don't just rely on static plan
-        import re
-        template_vars = re.findall(r'\{(\w+)\}', getattr(section, 'template_text', ''))
+        template_vars = compile_template(getattr(section, 'template_text', '')).fact_keys
         
         # Merge lists (deduplicate)
         all_needed_keys = set(section.required_facts) | set(template_vars)
@@ -263,6 +275,8 @@ class DraftContextManager:
                     "source": fact_entry.source_document,
                     "confidence": fact_entry.confidence
                 }
+                if fact_entry.source_page is not None:
+                    required_facts[fact_key]["page"] = fact_entry.source_page
             else:
                 missing_facts.append({
                     "key": fact_key,
@@ -280,17 +294,40 @@ class DraftContextManager:
                 "facts_used": prev_section.facts_used
             })
 
-        # Get related documents (all for now, could be filtered by relevance)
-        related_documents = [
-            {
+        # Related documents and passages: most relevant items that fit the writer's budget
+        query_text = " ".join([
+            getattr(section, 'title', ''),
+            getattr(section, 'template_text', ''),
+            " ".join(all_needed_keys)
+        ])
+        query_terms = extract_terms(query_text)
+        candidates = []
+        for doc_id, summary in document_summaries.items():
+            doc = {
                 "doc_id": doc_id,
                 "filename": summary["filename"],
                 "type": summary["type"],
                 "summary": summary["summary"],
                 "url": summary.get("url")
             }
-            for doc_id, summary in document_summaries.items()
-        ]
+            text = f"{doc['filename']} {doc['type']} {doc['summary']}"
+            candidates.append(ContextItem(
+                key=doc_id,
+                text=text,
+                # Small prior keeps unmatched documents when there is room for them
+                score=relevance_score(query_terms, text, prior=0.05),
+                payload=doc
+            ))
+        for passage in await self._retrieve_passages(state, query_text):
+            candidates.append(ContextItem(
+                key=f"passage:{passage['id']}",
+                text=passage["text"],
+                score=passage["score"],
+                payload=passage
+            ))
+        packed = pack_for_agent("writer", candidates)
+        related_documents = [item.payload for item in packed.selected if not item.key.startswith("passage:")]
+        related_passages = [item.payload for item in packed.selected if item.key.startswith("passage:")]
 
         # Build case context
         case_context = {
@@ -305,11 +342,31 @@ class DraftContextManager:
             "required_facts": required_facts,
             "previous_sections": previous_sections,
             "related_documents": related_documents,
+            "related_passages": related_passages,
             "case_context": case_context,
             "consistency_warnings": [],  # TODO: Implement consistency checking
             "missing_facts": missing_facts
         }
 
+    async def _retrieve_passages(self, state: DraftState, query: str) -> List[Dict[str, Any]]:
+        """Top-k text passages for a section from the case's document index."""
+        from app.core.config import settings
+
+        documents = state.get("documents", [])
+        if not settings.DOCUMENT_INDEX_ENABLED or not documents or not query.strip():
+            return []
+        try:
+            from app.services.lib.document_index import document_index_store
+
+            case_key = f"{state.get('company_id')}/{state.get('case_id')}"
+            # Sidecar loads are blocking S3 reads; cached per case after the first section
+            index = await asyncio.to_thread(document_index_store.load_case, case_key, documents)
+            # Summaries are already candidates via document_summaries; retrieve text chunks only
+            return index.search(query, top_k=drafting_config.DOCUMENT_INDEX_TOP_K, kinds=["chunk"])
+        except Exception as e:
+            print(f"  ⚠️ Passage retrieval failed: {e}")
+            return []
+
     async def store_drafted_section(self, state: DraftState, drafted_section: DraftedSection) -> dict:
         """
         Store a completed section in section memory and update fact usage.
@@ -419,7 +476,7 @@ Extract facts:"""
             response = await self.llm.ainvoke([
                 SystemMessage(content=system_prompt),
                 HumanMessage(content=user_msg)
-            ])
+            ], tenant_id=state.get("company_id"), agent_name="fact_extractor")
             
             content = response.content
             # Extract JSON
@@ -450,7 +507,8 @@ Extract facts:"""
                                   fact_registry[res.key] = FactEntry(
                                     key=res.key,
                                     value=res.value,
-                                    source_document=f"AI_Inference ({res.confidence})",
+                                    source_document=res.source_document or f"AI_Inference ({res.confidence})",
+                                    source_page=res.source_page,
                                     confidence=res.confidence,
                                     used_in_sections=[],
                                     last_updated=datetime.now()
@@ -504,8 +562,9 @@ Extract facts:"""
 
         missing_keys = truly_missing
         
-        # 1. Gather rich context
-        context_str = self._gather_complete_context(state)
+        # 1. Gather rich context (document excerpts carry their page for citation)
+        passages = await self._retrieve_passages(state, " ".join(sorted(extract_terms(" ".join(missing_keys)))))
+        context_str = self._gather_complete_context(state, missing_keys, passages)
         
         # 2. Prepare Prompt
         system_prompt = load_drafting_prompt("smart_resolver")
@@ -521,6 +580,7 @@ For each missing key, attempt to infer the value from the context.
 - Assign a confidence score (0.0 - 1.0).
 - If confidence >= {drafting_config.CONFIDENCE_THRESHOLD}, it will be auto-resolved.
 - If confidence < {drafting_config.CONFIDENCE_THRESHOLD}, we will ask the human.
+- If the value comes from a document excerpt, set "source_document" to its filename and "source_page" to its page number.
 
 Provide output in JSON format matching the FactResolution schema."""
 
@@ -535,7 +595,7 @@ Provide output in JSON format matching the FactResolution schema."""
             response = await self.llm.ainvoke([
                 SystemMessage(content=system_prompt),
                 HumanMessage(content=user_msg)
-            ])
+            ], tenant_id=state.get("company_id"), agent_name="smart_resolver")
             
             # 4. Parse & Process Results
             content = response.content
@@ -590,24 +650,58 @@ Provide output in JSON format matching the FactResolution schema."""
 
         return ResolutionResult(resolved_facts=[], human_input_needed=missing_keys, rag_context_used=[])
 
-    def _gather_complete_context(self, state: DraftState) -> str:
-        """Aggregate all available context for inference."""
+    def _gather_complete_context(self, state: DraftState, missing_keys: Optional[List[str]] = None,
+                                 passages: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Aggregate context for inference, packed to the smart resolver's token budget.
+
+        Case fields, document summaries and retrieved text passages are scored
+        against the missing keys; identifying case fields are always kept.
+        """
+        query_terms = extract_terms(" ".join(missing_keys or []))
+        items: List[ContextItem] = []
+
+        # Case Data: one item per top-level field
+        for key, value in (state.get("case_data") or {}).items():
+            if value in (None, "", [], {}):
+                continue
+            text = f"{key}: {json.dumps(value, default=str) if isinstance(value, (dict, list)) else value}"
+            items.append(ContextItem(
+                key=f"case:{key}",
+                text=text,
+                score=relevance_score(query_terms, text, prior=0.2),
+                required=key in CORE_CASE_FIELDS
+            ))
+
+        # Documents (Summaries)
+        for d in state.get("documents", []):
+            text = f"- Title: {d.get('title')}\n  Type: {d.get('documentType')}\n  Summary: {d.get('aiSummary')}"
+            items.append(ContextItem(
+                key=f"doc:{d.get('documentId') or d.get('title')}",
+                text=text,
+                score=relevance_score(query_terms, text, prior=0.05)
+            ))
+
+        # Text passages from the case document index, labelled with file and page
+        for passage in passages or []:
+            items.append(ContextItem(
+                key=f"passage:{passage['id']}",
+                text=f"[{format_passage_source(passage)}]\n{passage['text']}",
+                score=passage["score"]
+            ))
+
+        packed = pack_for_agent("smart_resolver", items)
+        case_lines = [item.text for item in packed.selected if item.key.startswith("case:")]
+        doc_lines = [item.text for item in packed.selected if item.key.startswith("doc:")]
+        passage_lines = [item.text for item in packed.selected if item.key.startswith("passage:")]
+
         parts = []
-        
-        # Case Data
-        if state.get("case_data"):
-             parts.append(f"CASE DATA:\n{json.dumps(state['case_data'], indent=2)}")
-             
-        # Documents (Summaries & partial text inferred)
-        # In a real RAG system, we'd query vector DB here. 
-        # For now, we use loaded doc dumps which might be large, so we truncate.
-        docs = state.get("documents", [])
-        if docs:
-            doc_context = ""
-            for d in docs[:drafting_config.Initial_DOC_LIMIT]: 
-                doc_context += f"- Title: {d.get('title')}\n  Type: {d.get('documentType')}\n  Summary: {d.get('aiSummary')}\n"
-            parts.append(f"DOCUMENTS (Top {drafting_config.Initial_DOC_LIMIT}):\n{doc_context}")
-            
+        if case_lines:
+            parts.append("CASE DATA:\n" + "\n".join(case_lines))
+        if doc_lines:
+            parts.append(f"DOCUMENTS ({len(doc_lines)} most relevant):\n" + "\n".join(doc_lines))
+        if passage_lines:
+            parts.append("DOCUMENT EXCERPTS:\n" + "\n\n".join(passage_lines))
         return "\n\n".join(parts)
 
     def _update_fact_registry(self, state: DraftState, resolution: FactResolution) -> dict:
@@ -624,7 +718,8 @@ Provide output in JSON format matching the FactResolution schema."""
             entry = FactEntry(
                 key=resolution.key,
                 value=resolution.value,
-                source_document=f"AI_Inference ({resolution.confidence})", # Correct field
+                source_document=resolution.source_document or f"AI_Inference ({resolution.confidence})", # Correct field
+                source_page=resolution.source_page,
                 confidence=resolution.confidence,
                 used_in_sections=[],
                 last_updated=datetime.now()
@@ -0,0 +1,153 @@
+"""
+Token-budgeted context packing.
+
+Agents receive a bounded amount of context no matter how many documents a
+matter accumulates. Candidate items (document summaries, case fields) are
+scored for relevance against the current query and a 0/1 knapsack picks the
+subset with the highest total relevance that fits the agent's token budget.
+
+Implements:
+1. Local token estimate per item (no tokenizer download or network call)
+2. Lexical relevance scoring (term overlap, length-normalised)
+3. Knapsack selection with required items and per-agent budgets
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.agents.workflows.drafting.config import drafting_config
+from app.agents.workflows.drafting.llm_utils import estimate_tokens
+
+# Knapsack weights are bucketed to keep the DP table small for large budgets
+TOKEN_GRANULARITY = 32
+
+_CAMEL_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+_TERM_PATTERN = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "was", "were", "with"
+})
+
+
+def extract_terms(text: str) -> Set[str]:
+    """Lower-case terms, splitting snake_case and camelCase identifiers."""
+    if not text:
+        return set()
+    text = _CAMEL_BOUNDARY.sub(" ", str(text)).replace("_", " ").lower()
+    return {t for t in _TERM_PATTERN.findall(text) if len(t) > 1 and t not in _STOPWORDS}
+
+
+def relevance_score(query_terms: Set[str], text: str, prior: float = 0.0) -> float:
+    """
+    Overlap between query and item terms, normalised so long items don't win
+    on size alone. `prior` lifts items that are useful regardless of the query.
+    """
+    if not query_terms:
+        return prior
+    item_terms = extract_terms(text)
+    if not item_terms:
+        return prior
+    overlap = len(query_terms & item_terms)
+    return prior + overlap / math.sqrt(len(item_terms))
+
+
+@dataclass
+class ContextItem:
+    """A candidate piece of context."""
+    key: str
+    text: str
+    score: float = 0.0
+    required: bool = False
+    payload: Any = None  # Original object returned to the caller when selected
+    tokens: int = field(default=0)
+
+    def __post_init__(self):
+        if not self.tokens:
+            self.tokens = estimate_tokens(self.text)
+
+
+@dataclass
+class PackResult:
+    selected: List[ContextItem]
+    dropped: List[ContextItem]
+    used_tokens: int
+    budget: int
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "selected": len(self.selected),
+            "dropped": len(self.dropped),
+            "used_tokens": self.used_tokens,
+            "budget": self.budget
+        }
+
+
+def get_context_budget(agent_name: str) -> int:
+    """Token budget for an agent's packed context (falls back to MAX_CONTEXT_TOKENS)."""
+    return drafting_config.CONTEXT_TOKEN_BUDGETS.get(agent_name, drafting_config.MAX_CONTEXT_TOKENS)
+
+
+def _knapsack(items: List[ContextItem], capacity: int) -> List[int]:
+    """Indices of the max-score subset whose bucketed weight fits capacity."""
+    units = capacity // TOKEN_GRANULARITY
+    if units <= 0 or not items:
+        return []
+    weights = [max(1, math.ceil(item.tokens / TOKEN_GRANULARITY)) for item in items]
+
+    best = [0.0] * (units + 1)
+    # keep[i] marks capacities at which item i improved the best value
+    keep: List[bytearray] = []
+    for i, item in enumerate(items):
+        w = weights[i]
+        taken = bytearray(units + 1)
+        if w <= units:
+            for c in range(units, w - 1, -1):
+                candidate = best[c - w] + item.score
+                if candidate > best[c]:
+                    best[c] = candidate
+                    taken[c] = 1
+        keep.append(taken)
+
+    chosen, c = [], units
+    for i in range(len(items) - 1, -1, -1):
+        if keep[i][c]:
+            chosen.append(i)
+            c -= weights[i]
+    return sorted(chosen)
+
+
+def pack_context(items: Iterable[ContextItem], budget: int) -> PackResult:
+    """
+    Select items that fit `budget` tokens.
+
+    Required items are always kept (in order); the remaining budget is filled
+    by knapsack over relevance scores. Selected items keep their input order.
+    """
+    items = list(items)
+    required = [item for item in items if item.required]
+    optional = [item for item in items if not item.required and item.score > 0]
+
+    used = sum(item.tokens for item in required)
+    remaining = max(0, budget - used)
+    picked = {id(optional[i]) for i in _knapsack(optional, remaining)}
+
+    selected = [item for item in items if item.required or id(item) in picked]
+    dropped = [item for item in items if not (item.required or id(item) in picked)]
+    return PackResult(
+        selected=selected,
+        dropped=dropped,
+        used_tokens=sum(item.tokens for item in selected),
+        budget=budget
+    )
+
+
+def pack_for_agent(agent_name: str, items: Iterable[ContextItem],
+                   budget: Optional[int] = None) -> PackResult:
+    """pack_context with the agent's configured budget, logging what was dropped."""
+    result = pack_context(items, budget if budget is not None else get_context_budget(agent_name))
+    if result.dropped:
+        print(f"  📦 Context packed for {agent_name}: kept {len(result.selected)}, "
+              f"dropped {len(result.dropped)} ({result.used_tokens}/{result.budget} tokens)")
+    return result
@@ -127,7 +127,8 @@ async def smart_resolution_node(state: DraftState):
             updated_registry[res.key] = FactEntry(
                 key=res.key,
                 value=res.value,
-                source_document=f"AI_Inference ({res.confidence})",
+                source_document=res.source_document or f"AI_Inference ({res.confidence})",
+                source_page=res.source_page,
                 confidence=res.confidence,
                 used_in_sections=[],
                 # is_verified=False, # Removed invalid field
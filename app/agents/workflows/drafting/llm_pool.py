@@ -0,0 +1,265 @@
+"""
+Shared LLM client registry.
+
+Chat model clients (and the HTTP connection pools inside them) are built once
+per (provider, model, temperature, tools) key and reused by every agent and
+request, instead of being constructed per agent or per graph node.
+
+Implements:
+1. Keyed client registry with tool-bound variants
+2. Startup warm-up for the configured default models
+3. Pool metrics (hits, misses, build time, per-client use counts)
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+# Connection limits for the shared HTTP pools (per provider)
+MAX_CONNECTIONS = 50
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+ClientKey = Tuple[str, str, float, Tuple[str, ...]]
+
+
+def _tools_key(tools: Optional[Sequence[Any]]) -> Tuple[str, ...]:
+    if not tools:
+        return ()
+    return tuple(sorted(getattr(t, "name", None) or getattr(t, "__name__", str(t)) for t in tools))
+
+
+class LLMClientRegistry:
+    """Process-wide cache of chat model clients keyed by their configuration."""
+
+    def __init__(self):
+        self._clients: Dict[ClientKey, Any] = {}
+        self._meta: Dict[ClientKey, Dict[str, Any]] = {}
+        self._http_clients: Dict[str, Dict[str, Any]] = {}
+        self._unpooled: Dict[str, str] = {}  # provider -> why its SDK client couldn't use the shared pool
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get_client(
+        self,
+        provider: str,
+        model: str,
+        temperature: float = 0,
+        tools: Optional[Sequence[Any]] = None
+    ) -> Any:
+        """
+        Get (or build once) a chat model client.
+
+        Args:
+            provider: "anthropic" or "openai"
+            model: Model name
+            temperature: Sampling temperature
+            tools: Optional tools; the tool-bound runnable is cached under its own key
+
+        Returns:
+            LangChain chat model (or tool-bound runnable)
+        """
+        key: ClientKey = (provider, model, float(temperature), _tools_key(tools))
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._stats["hits"] += 1
+                self._meta[key]["uses"] += 1
+                return client
+
+            self._stats["misses"] += 1
+            start = time.time()
+            if tools:
+                base = self._get_base_locked(provider, model, float(temperature))
+                client = base.bind_tools(list(tools))
+            else:
+                client = self._build(provider, model, float(temperature))
+
+            self._clients[key] = client
+            self._meta[key] = {
+                "created_at": time.time(),
+                "build_ms": int((time.time() - start) * 1000),
+                "uses": 1
+            }
+            return client
+
+    def _get_base_locked(self, provider: str, model: str, temperature: float) -> Any:
+        key: ClientKey = (provider, model, temperature, ())
+        client = self._clients.get(key)
+        if client is None:
+            start = time.time()
+            client = self._build(provider, model, temperature)
+            self._clients[key] = client
+            self._meta[key] = {
+                "created_at": time.time(),
+                "build_ms": int((time.time() - start) * 1000),
+                "uses": 0
+            }
+        return client
+
+    def _shared_http_clients(self, provider: str) -> Dict[str, Any]:
+        """One sync and one async httpx pool per provider, shared by all its clients."""
+        clients = self._http_clients.get(provider)
+        if clients is None:
+            limits = httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+            )
+            clients = {
+                "sync": httpx.Client(limits=limits),
+                "async": httpx.AsyncClient(limits=limits)
+            }
+            self._http_clients[provider] = clients
+        return clients
+
+    def _build(self, provider: str, model: str, temperature: float) -> Any:
+        from app.core.config import settings
+
+        if provider == "anthropic":
+            from langchain_anthropic import ChatAnthropic
+            llm = ChatAnthropic(
+                model=model,
+                api_key=settings.ANTHROPIC_API_KEY,
+                temperature=temperature,
+                # Anthropic-specific: Enable prompt caching
+                model_kwargs={
+                    "extra_headers": {
+                        "anthropic-beta": "prompt-caching-2024-07-31"
+                    }
+                }
+            )
+            self._attach_anthropic_pool(llm, settings.ANTHROPIC_API_KEY)
+            return llm
+
+        from langchain_openai import ChatOpenAI
+        http = self._shared_http_clients(provider)
+        return ChatOpenAI(
+            model=model,
+            api_key=settings.OPENAI_API_KEY,
+            temperature=temperature,
+            http_client=http["sync"],
+            http_async_client=http["async"]
+        )
+
+    def _attach_anthropic_pool(self, llm: Any, api_key: str):
+        """
+        Swap the Anthropic SDK clients inside ChatAnthropic for ones on the shared pool.
+
+        ChatAnthropic has no http_client parameter, so the SDK clients are
+        replaced after construction. If the installed langchain_anthropic
+        keeps them elsewhere the model keeps its own pool, and the reason
+        is reported under "unpooled" in the metrics.
+        """
+        try:
+            import anthropic
+
+            http = self._shared_http_clients("anthropic")
+            params = {"api_key": api_key, "max_retries": getattr(llm, "max_retries", 2)}
+            if getattr(llm, "default_headers", None):
+                params["default_headers"] = llm.default_headers
+            if getattr(llm, "anthropic_api_url", None):
+                params["base_url"] = llm.anthropic_api_url
+
+            sync_client = anthropic.Client(http_client=http["sync"], **params)
+            async_client = anthropic.AsyncClient(http_client=http["async"], **params)
+            # Instance attributes shadow the lazily created clients (cached_property in newer versions)
+            object.__setattr__(llm, "_client", sync_client)
+            object.__setattr__(llm, "_async_client", async_client)
+            if getattr(llm, "_client", None) is not sync_client or getattr(llm, "_async_client", None) is not async_client:
+                raise TypeError("ChatAnthropic does not expose _client/_async_client")
+            self._unpooled.pop("anthropic", None)
+        except Exception as e:
+            if "anthropic" not in self._unpooled:
+                print(f"⚠️ Anthropic client not on the shared HTTP pool ({e})")
+            self._unpooled["anthropic"] = str(e)
+
+    def warm_up(self, specs: List[Tuple[str, str, float]]) -> Dict[str, Any]:
+        """
+        Build clients ahead of the first request.
+
+        Also materialises the provider SDK clients (and their HTTP pools) that
+        LangChain otherwise creates lazily on the first call.
+
+        Args:
+            specs: List of (provider, model, temperature)
+
+        Returns:
+            Dict with warmed client count and any failures
+        """
+        warmed, failures = 0, []
+        for provider, model, temperature in specs:
+            try:
+                client = self.get_client(provider, model, temperature)
+                for attr in ("_client", "_async_client"):
+                    try:
+                        getattr(client, attr, None)
+                    except Exception:
+                        pass
+                warmed += 1
+            except Exception as e:
+                failures.append({"provider": provider, "model": model, "error": str(e)})
+        return {"warmed": warmed, "failures": failures}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registry and connection pool metrics."""
+        with self._lock:
+            total = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate_percent": round(self._stats["hits"] / total * 100, 2) if total else 0,
+                "clients": [
+                    {
+                        "provider": key[0],
+                        "model": key[1],
+                        "temperature": key[2],
+                        "tools": list(key[3]),
+                        **meta
+                    }
+                    for key, meta in self._meta.items()
+                ],
+                "http_pools": sorted(p for p in self._http_clients if p not in self._unpooled),
+                "unpooled": dict(self._unpooled)
+            }
+
+    def clear(self):
+        """Drop all cached clients (used in tests / key rotation)."""
+        with self._lock:
+            self._clients.clear()
+            self._meta.clear()
+            self._stats = {"hits": 0, "misses": 0}
+
+
+# Global registry instance (one per process)
+llm_registry = LLMClientRegistry()
+
+
+def warm_up_llm_clients() -> Dict[str, Any]:
+    """Warm the clients used by the default agent configurations."""
+    from app.core.config import settings
+
+    specs = [
+        (settings.LLM_PROVIDER, settings.LLM_MODEL, 0.0),    # Writer, reviewer, refiner, context manager
+        ("anthropic", settings.LLM_MODEL, 0.4),              # Planner
+    ]
+    if settings.ANTHROPIC_API_KEY:
+        specs.append(("anthropic", settings.LLM_MODEL, 0.0))  # Concierge
+        specs.append(("anthropic", "claude-sonnet-4-20250514", 0.0))  # Document summarizer
+        specs.append(("anthropic", "claude-sonnet-4-20250514", 0.2))  # Template architect
+    return llm_registry.warm_up(list(dict.fromkeys(specs)))
+
+
+def get_llm_pool_stats() -> Dict[str, Any]:
+    """Client registry metrics plus scheduler, response-cache and prompt-cache state."""
+    from app.agents.workflows.drafting.scheduler import llm_scheduler
+    from app.agents.workflows.drafting.response_cache import response_cache
+    from app.agents.workflows.drafting.logger import drafting_logger
+    return {
+        "registry": llm_registry.get_stats(),
+        "scheduler": llm_scheduler.get_stats(),
+        "response_cache": response_cache.get_stats(),
+        "prompt_cache": drafting_logger.get_prompt_cache_stats()
+    }
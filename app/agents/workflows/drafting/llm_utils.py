@@ -11,11 +11,82 @@ References:
 
 from typing import List, Dict, Any, Optional
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
+import asyncio
 import os
+import time
 
 from app.agents.workflows.drafting.resilience import call_with_retry, LLMError
+from app.agents.workflows.drafting.scheduler import llm_scheduler, Priority
+from app.agents.workflows.drafting.llm_pool import llm_registry
+from app.agents.workflows.drafting.response_cache import response_cache, make_cache_key
+
+# Rough chars-per-token ratio for English legal text (Claude/GPT tokenizers average ~4)
+CHARS_PER_TOKEN = 4
+
+# Stream opening retries (same schedule as call_with_retry's defaults)
+STREAM_OPEN_RETRIES = 3
+STREAM_RETRY_BASE_DELAY = 1.0
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate. No tokenizer download or network call."""
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def estimate_message_tokens(messages: List[Any]) -> int:
+    """Estimate prompt tokens for LangChain messages or raw provider dicts."""
+    total = 0
+    for msg in messages:
+        content = msg.get("content") if isinstance(msg, dict) else getattr(msg, "content", msg)
+        if isinstance(content, list):
+            for block in content:
+                text = block.get("text", "") if isinstance(block, dict) else str(block)
+                total += estimate_tokens(text)
+        else:
+            total += estimate_tokens(str(content))
+    return total
+
+def extract_cache_usage(response: Any) -> Optional[Dict[str, int]]:
+    """
+    Normalise token usage, including prompt cache reads/writes.
+
+    LangChain reports cache tokens under usage_metadata.input_token_details
+    (with input_tokens already including them); older integrations only
+    expose Anthropic's raw usage (cache_read_input_tokens etc.) in
+    response_metadata, where input_tokens excludes cached tokens.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    raw = (getattr(response, "response_metadata", None) or {}).get("usage") or {}
+    if not isinstance(raw, dict):
+        raw = {}
+    if not usage and not raw:
+        return None
+
+    if usage:
+        cache_read = details.get("cache_read") or raw.get("cache_read_input_tokens") or 0
+        cache_write = details.get("cache_creation") or raw.get("cache_creation_input_tokens") or 0
+        input_tokens = usage.get("input_tokens", 0)
+        if not details:
+            input_tokens = max(input_tokens, (raw.get("input_tokens") or 0) + cache_read + cache_write)
+        output_tokens = usage.get("output_tokens", 0)
+    else:
+        cache_read = raw.get("cache_read_input_tokens") or 0
+        cache_write = raw.get("cache_creation_input_tokens") or 0
+        input_tokens = (raw.get("input_tokens") or 0) + cache_read + cache_write
+        output_tokens = raw.get("output_tokens") or 0
+
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_read_tokens": cache_read,
+        "cache_write_tokens": cache_write
+    }
+
+def _add_usage(total: Dict[str, int], usage: Optional[Dict[str, int]]):
+    if usage:
+        for key, value in usage.items():
+            total[key] = total.get(key, 0) + value
 
 class CachedLLM:
     """
@@ -23,22 +94,171 @@ class CachedLLM:
     1. Automatic retries for transient failures
     2. Connection validation
     3. Type-safe error propagation
+    4. Admission through the process-wide LLM scheduler
+    5. Opt-in response caching for deterministic (temperature 0) agents
     """
-    def __init__(self, client: Any):
+    def __init__(
+        self,
+        client: Any,
+        model: Optional[str] = None,
+        priority: Priority = Priority.DRAFTING,
+        temperature: Optional[float] = None,
+        agent_name: Optional[str] = None
+    ):
         self.client = client
+        self.model = model or getattr(client, "model", None) or getattr(client, "model_name", None) or "default"
+        self.priority = priority
+        self.temperature = temperature if temperature is not None else getattr(client, "temperature", None)
+        self.agent_name = agent_name
+
+    def _log_call(self, agent_name: Optional[str], usage: Optional[Dict[str, int]], duration_ms: int,
+                  workflow_id: Optional[str], section_idx: Optional[int]):
+        """Report the call (and its prompt cache usage) to the drafting logger."""
+        if not usage:
+            return
+        from app.agents.workflows.drafting.logger import drafting_logger
+        drafting_logger.log_llm_call(
+            workflow_id=workflow_id or "unknown",
+            agent_name=agent_name or "unknown",
+            model=self.model,
+            prompt_tokens=usage["input_tokens"],
+            completion_tokens=usage["output_tokens"],
+            total_tokens=usage["input_tokens"] + usage["output_tokens"],
+            cache_read_tokens=usage["cache_read_tokens"],
+            cache_write_tokens=usage["cache_write_tokens"],
+            duration_ms=duration_ms,
+            section_idx=section_idx
+        )
 
-    async def ainvoke(self, messages: List[Any], **kwargs) -> Any:
+    def _response_cache_key(self, messages: List[Any], agent_name: Optional[str], kwargs: Dict[str, Any]) -> Optional[str]:
+        if not response_cache.is_enabled(agent_name, self.temperature):
+            return None
+        return make_cache_key(self.model, messages, {"temperature": self.temperature, **kwargs})
+
+    async def ainvoke(
+        self,
+        messages: List[Any],
+        priority: Optional[Priority] = None,
+        tenant_id: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        workflow_id: Optional[str] = None,
+        section_idx: Optional[int] = None,
+        **kwargs
+    ) -> Any:
         """
         Execute LLM call with built-in retry logic.
+
+        Each attempt waits for a scheduler slot, so retry backoff never holds
+        capacity that other agents could use.
+
+        Args:
+            messages: Prompt messages
+            priority: Override the wrapper's default priority class
+            tenant_id: Tenant (company) for fair queuing across firms
+            agent_name: Override the wrapper's agent name (response cache opt-in is per agent)
+            workflow_id: Drafting workflow, for call logging
+            section_idx: Section being drafted, for call logging
         """
+        from app.agents.workflows.drafting.config import drafting_config
+
+        agent_name = agent_name or self.agent_name
+        cache_key = self._response_cache_key(messages, agent_name, kwargs)
+        if cache_key:
+            cached = await response_cache.get(agent_name, cache_key)
+            if cached is not None:
+                print(f"  ✓ Response cache HIT ({agent_name})")
+                return cached
+
+        estimated_tokens = estimate_message_tokens(messages) + \
+            kwargs.get("max_tokens", drafting_config.LLM_EXPECTED_OUTPUT_TOKENS)
+
         async def _execute():
-            try:
-                return await self.client.ainvoke(messages, **kwargs)
-            except Exception as e:
-                # Wrap in LLMError to trigger retry strategy in call_with_retry
-                raise LLMError(f"LLM Provider Error: {str(e)}") from e
+            async with llm_scheduler.slot(
+                self.model,
+                estimated_tokens,
+                priority if priority is not None else self.priority,
+                tenant_id
+            ) as grant:
+                try:
+                    response = await self.client.ainvoke(messages, **kwargs)
+                except Exception as e:
+                    # Wrap in LLMError to trigger retry strategy in call_with_retry
+                    raise LLMError(f"LLM Provider Error: {str(e)}") from e
+
+                usage = extract_cache_usage(response)
+                if usage:
+                    grant.record_usage(usage["input_tokens"] + usage["output_tokens"])
+                return response
+
+        start_time = time.time()
+        response = await call_with_retry(_execute)
+        self._log_call(agent_name, extract_cache_usage(response), int((time.time() - start_time) * 1000),
+                       workflow_id, section_idx)
+        if cache_key:
+            await response_cache.set(agent_name, cache_key, response)
+        return response
+
+    async def astream(
+        self,
+        messages: List[Any],
+        priority: Optional[Priority] = None,
+        tenant_id: Optional[str] = None,
+        workflow_id: Optional[str] = None,
+        section_idx: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Stream response chunks, holding one scheduler slot for the whole generation.
 
-        return await call_with_retry(_execute)
+        Failures before the first chunk (rate limits, connection errors) are
+        retried with the same backoff as ainvoke, releasing the slot between
+        attempts. Once chunks have been yielded the stream can't be replayed,
+        so later failures are raised. Closing the generator early (aclose)
+        cancels the provider stream and releases the slot.
+        """
+        from app.agents.workflows.drafting.config import drafting_config
+
+        estimated_tokens = estimate_message_tokens(messages) + \
+            kwargs.get("max_tokens", drafting_config.LLM_EXPECTED_OUTPUT_TOKENS)
+
+        for attempt in range(STREAM_OPEN_RETRIES + 1):
+            async with llm_scheduler.slot(
+                self.model,
+                estimated_tokens,
+                priority if priority is not None else self.priority,
+                tenant_id
+            ) as grant:
+                usage: Dict[str, int] = {}
+                start_time = time.time()
+                started = False
+                try:
+                    async for chunk in self.client.astream(messages, **kwargs):
+                        started = True
+                        # Anthropic reports input/cache usage on the first chunk, output on the last
+                        _add_usage(usage, extract_cache_usage(chunk))
+                        yield chunk
+                    return
+                except Exception as e:
+                    if started or attempt == STREAM_OPEN_RETRIES:
+                        raise LLMError(f"LLM Provider Error: {str(e)}") from e
+                    print(f"  ⚠️ Stream failed before first chunk ({str(e)}), "
+                          f"retry {attempt + 1}/{STREAM_OPEN_RETRIES}")
+                finally:
+                    if usage:
+                        grant.record_usage(usage["input_tokens"] + usage["output_tokens"])
+                        self._log_call(self.agent_name, usage, int((time.time() - start_time) * 1000),
+                                       workflow_id, section_idx)
+            await asyncio.sleep(STREAM_RETRY_BASE_DELAY * (2 ** attempt))
+
+    def bind_tools(self, tools: List[Any], **kwargs) -> "CachedLLM":
+        """Bind tools while keeping retries and scheduling on the bound runnable."""
+        return CachedLLM(
+            self.client.bind_tools(tools, **kwargs),
+            model=self.model,
+            priority=self.priority,
+            temperature=self.temperature,
+            agent_name=self.agent_name
+        )
     
     def __getattr__(self, name):
         """Delegate other method calls to underlying client (e.g. stream, invoke)"""
@@ -48,15 +268,24 @@ class CachedLLM:
 def create_cached_llm(
     model: Optional[str] = None,
     temperature: float = 0,
-    provider: str = "anthropic"
+    provider: str = "anthropic",
+    priority: Priority = Priority.DRAFTING,
+    tools: Optional[List[Any]] = None,
+    agent_name: Optional[str] = None
 ) -> Any:
     """
     Create an LLM client with prompt caching enabled.
 
+    The underlying chat model comes from the shared client registry, so this
+    is cheap to call per agent or per request.
+
     Args:
         model: Model name (e.g., "claude-3-5-sonnet-20241022", "gpt-4o")
         temperature: Sampling temperature
         provider: "anthropic" or "openai"
+        priority: Scheduler priority class for calls made through this client
+        tools: Optional tools to bind (the bound client is cached as well)
+        agent_name: Agent identity for response-cache opt-in and hit-rate stats
 
     Returns:
         Configured LLM client
@@ -69,27 +298,10 @@ def create_cached_llm(
     if not model:
         model = settings.LLM_MODEL
     
-    client = None
-    if provider == "anthropic":
-        client = ChatAnthropic(
-            model=model,
-            api_key=settings.ANTHROPIC_API_KEY,
-            temperature=temperature,
-            # Anthropic-specific: Enable prompt caching
-            model_kwargs={
-                "extra_headers": {
-                    "anthropic-beta": "prompt-caching-2024-07-31"
-                }
-            }
-        )
-    else:  # OpenAI
-        client = ChatOpenAI(
-            model=model,
-            api_key=settings.OPENAI_API_KEY,
-            temperature=temperature
-        )
+    # Clients (and their HTTP pools) are shared process-wide, see llm_pool.py
+    client = llm_registry.get_client(provider, model, temperature, tools=tools)
 
-    return CachedLLM(client)
+    return CachedLLM(client, model=model, priority=priority, temperature=temperature, agent_name=agent_name)
 
 def create_cached_system_message(content: str, cache: bool = True) -> SystemMessage:
     """
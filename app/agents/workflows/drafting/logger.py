@@ -1,11 +1,20 @@
 import logging
 import json
+import threading
 import time
+from collections import defaultdict
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Per-agent prompt cache counters, fed by log_llm_call
+_cache_stats_lock = threading.Lock()
+_cache_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {
+    "calls": 0, "cache_hits": 0, "prompt_tokens": 0,
+    "cache_read_tokens": 0, "cache_write_tokens": 0
+})
+
 class DraftingLogger:
     """Comprehensive structured logging for all drafting workflow agents"""
 
@@ -38,6 +47,20 @@ class DraftingLogger:
                     prompt_tokens: int, completion_tokens: int, total_tokens: int,
                     duration_ms: int, cache_read_tokens: int = 0, cache_write_tokens: int = 0,
                     section_idx: Optional[int] = None):
+        """
+        Args:
+            prompt_tokens: All input tokens, including cache reads and writes
+            cache_read_tokens: Anthropic cache_read_input_tokens
+            cache_write_tokens: Anthropic cache_creation_input_tokens
+        """
+        with _cache_stats_lock:
+            stats = _cache_stats[agent_name]
+            stats["calls"] += 1
+            stats["cache_hits"] += 1 if cache_read_tokens > 0 else 0
+            stats["prompt_tokens"] += prompt_tokens
+            stats["cache_read_tokens"] += cache_read_tokens
+            stats["cache_write_tokens"] += cache_write_tokens
+
         logger.info("LLM API call", extra={
             "workflow_id": workflow_id, "agent_name": agent_name, "model": model,
             "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
@@ -48,6 +71,30 @@ class DraftingLogger:
             "timestamp": datetime.utcnow().isoformat()
         })
 
+    @staticmethod
+    def get_prompt_cache_stats() -> Dict[str, Dict[str, Any]]:
+        """Prompt cache hit rates per agent (by call and by input token)."""
+        with _cache_stats_lock:
+            return {
+                agent: {
+                    **stats,
+                    "call_hit_rate_percent": round(stats["cache_hits"] / stats["calls"] * 100, 1) if stats["calls"] else 0,
+                    "token_hit_rate_percent": round(stats["cache_read_tokens"] / stats["prompt_tokens"] * 100, 1) if stats["prompt_tokens"] else 0
+                }
+                for agent, stats in _cache_stats.items()
+            }
+
+    @staticmethod
+    def log_prompt_segments(workflow_id: str, agent_name: str, segment_tokens: Dict[str, int],
+                           breakpoints: Optional[List[Dict[str, Any]]] = None,
+                           section_idx: Optional[int] = None):
+        logger.info("Prompt assembled", extra={
+            "workflow_id": workflow_id, "agent_name": agent_name,
+            "segment_tokens": segment_tokens, "cache_breakpoints": breakpoints or [],
+            "section_idx": section_idx,
+            "event": "prompt_segments", "timestamp": datetime.utcnow().isoformat()
+        })
+
     @staticmethod
     def log_planner_output(workflow_id: str, sections_count: int, total_word_estimate: int,
                           required_facts: List[str], required_laws: List[str]):
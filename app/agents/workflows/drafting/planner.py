@@ -7,12 +7,24 @@ from app.agents.workflows.drafting.llm_utils import (
     create_cached_messages_with_context
 )
 from app.agents.workflows.drafting.logger import drafting_logger
+from app.agents.workflows.drafting.config import drafting_config
+from app.agents.workflows.drafting.template_compiler import compile_template
+from datetime import datetime
+import asyncio
+import hashlib
 import uuid
 import re
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 
+# Bump when the planning request built in _parse_template_with_llm changes,
+# so plans cached on template records are re-parsed
+PLANNER_PROMPT_VERSION = 2
+
+# Section fields that depend only on the template (ids and status are per run)
+PLAN_CACHE_FIELDS = {"title", "template_text", "required_facts", "required_laws", "dependencies", "order_index"}
+
 class DraftMasterPlanner:
     def __init__(self, llm=None):
         self.llm = llm  # Lazy init
@@ -22,7 +34,8 @@ class DraftMasterPlanner:
         if not self.llm:
             from app.agents.workflows.drafting.llm_utils import create_cached_llm
             self.llm = create_cached_llm(
-                temperature=0.4
+                temperature=0.4,
+                agent_name="planner"
             )
         return self.llm
 
@@ -67,15 +80,29 @@ class DraftMasterPlanner:
             # Create a basic fallback plan
             sections = self._create_fallback_plan(state)
         else:
-            # Try LLM-based intelligent parsing first (better quality)
-            print("  Using LLM for intelligent template analysis...")
-            try:
-                sections = await self._parse_template_with_llm(template_content, template_data, state)
-                print(f"  ✓ LLM parsing successful: {len(sections)} sections identified")
-            except Exception as e:
-                print(f"  Warning: LLM parsing failed ({str(e)}), falling back to regex")
-                # Fallback to regex-based parsing
-                sections = self._parse_template_sections(template_content, template_data)
+            # Known templates are planned from the structure cached on the template record
+            template_id = state.get("template_id")
+            cacheable = bool(template_id and state.get("company_id") and drafting_config.PLAN_CACHE_ENABLED)
+            plan_key = self._plan_cache_key(template_content) if cacheable else None
+            sections = await self._load_cached_plan(state, plan_key) if plan_key else None
+
+            if sections:
+                print(f"  ♻️ Reusing cached plan for template {template_id}: {len(sections)} sections")
+            else:
+                # Try LLM-based intelligent parsing first (better quality)
+                print("  Using LLM for intelligent template analysis...")
+                try:
+                    # A cached plan is reused across cases, so it is built from the template alone
+                    sections = await self._parse_template_with_llm(
+                        template_content, template_data, state, include_case_context=not plan_key
+                    )
+                    print(f"  ✓ LLM parsing successful: {len(sections)} sections identified")
+                    if plan_key and sections:
+                        await self._save_cached_plan(state, plan_key, sections)
+                except Exception as e:
+                    print(f"  Warning: LLM parsing failed ({str(e)}), falling back to regex")
+                    # Fallback to regex-based parsing
+                    sections = self._parse_template_sections(template_content, template_data)
 
         # Create the plan
         plan = DraftingPlan(
@@ -94,10 +121,69 @@ class DraftMasterPlanner:
             "max_iterations": 3
         }
 
-    async def _parse_template_with_llm(self, template_content: str, template_data: Dict, state: DraftState) -> List[Section]:
+    def _plan_cache_key(self, template_content: str) -> str:
+        """Template content hash + planner prompt version (entries live on the template record)."""
+        content_hash = compile_template(template_content).content_hash
+        prompt = f"{PLANNER_PROMPT_VERSION}\x00{load_drafting_prompt('planner')}"
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return f"{content_hash[:32]}:{prompt_hash[:12]}"
+
+    def _plan_cache_record(self, state: DraftState) -> tuple:
+        """(company_id, template_id, document_type_id) identifying the template record."""
+        template_data = state.get("template_data") or {}
+        return state.get("company_id"), state.get("template_id"), template_data.get("documentTypeId")
+
+    async def _load_cached_plan(self, state: DraftState, plan_key: str) -> Optional[List[Section]]:
+        from app.services.core.template_service import TemplateService
+        company_id, template_id, document_type_id = self._plan_cache_record(state)
+        try:
+            plan_cache = await asyncio.to_thread(
+                TemplateService().get_plan_cache, company_id, template_id, document_type_id
+            )
+        except Exception as e:
+            print(f"  Warning: plan cache lookup failed ({str(e)})")
+            return None
+
+        entry = plan_cache.get(plan_key)
+        if not entry:
+            return None
+        return [
+            Section(
+                id=str(uuid.uuid4()),
+                title=section_data["title"],
+                template_text=section_data.get("template_text", ""),
+                required_facts=list(section_data.get("required_facts", [])),
+                required_laws=list(section_data.get("required_laws", [])),
+                dependencies=list(section_data.get("dependencies", [])),
+                status=SectionStatus.PENDING,
+                order_index=int(section_data.get("order_index", idx))  # DynamoDB returns Decimal
+            )
+            for idx, section_data in enumerate(entry.get("sections", []))
+        ]
+
+    async def _save_cached_plan(self, state: DraftState, plan_key: str, sections: List[Section]):
+        from app.services.core.template_service import TemplateService
+        company_id, template_id, document_type_id = self._plan_cache_record(state)
+        entry = {
+            "sections": [section.model_dump(include=PLAN_CACHE_FIELDS) for section in sections],
+            "createdAt": datetime.utcnow().isoformat()
+        }
+        try:
+            await asyncio.to_thread(
+                TemplateService().save_plan_cache_entry, company_id, template_id, plan_key, entry,
+                drafting_config.PLAN_CACHE_MAX_ENTRIES, document_type_id
+            )
+        except Exception as e:
+            print(f"  Warning: failed to cache plan for template {template_id} ({str(e)})")
+
+    async def _parse_template_with_llm(self, template_content: str, template_data: Dict, state: DraftState,
+                                       include_case_context: bool = True) -> List[Section]:
         """
         Use LLM to intelligently parse template into sections.
 
+        With include_case_context=False only the template and its metadata are
+        sent, so the plan can be cached on the template and reused for other cases.
+
         Advantages over regex:
         - Understands semantic section boundaries
         - Identifies implicit requirements
@@ -108,12 +194,13 @@ class DraftMasterPlanner:
         system_prompt = load_drafting_prompt("planner")
 
         # Prepare context for caching (static per case)
-        cache_context = {
-            "case_data": state.get("case_data", {}),
-            "case_type": state.get("case_type", "unknown"),
-            "template_metadata": template_data,
-            "document_count": len(state.get("documents", []))
-        }
+        cache_context = {"template_metadata": template_data}
+        if include_case_context:
+            cache_context.update({
+                "case_data": state.get("case_data", {}),
+                "case_type": state.get("case_type", "unknown"),
+                "document_count": len(state.get("documents", []))
+            })
 
         # Create parsing query (NOT cached - changes per template)
         user_message = f"""Analyze the following legal document template and create a detailed drafting plan.
@@ -171,7 +258,8 @@ Provide detailed analysis for high-quality drafting."""
         )
 
         # Invoke LLM
-        response = await self.llm.ainvoke(messages)
+        llm = await self._get_llm()
+        response = await llm.ainvoke(messages, tenant_id=state.get("company_id"))
         llm_analysis = response.content if hasattr(response, 'content') else str(response)
 
         # Log cache performance
@@ -218,49 +306,11 @@ Provide detailed analysis for high-quality drafting."""
         2. Extract placeholders from each section
         3. Identify required facts and dependencies
         """
-        sections = []
-
-        # Try to split by markdown headings (##) or HTML headings (<h2>)
-        # This is a simple heuristic - more sophisticated parsing could use LLM
-
-        # Pattern 1: Markdown headings
-        section_parts = re.split(r'\n#{1,2}\s+(.+?)\n', template_content)
-
-        if len(section_parts) < 3:
-            # Pattern 2: HTML headings
-            section_parts = re.split(r'<h[12][^>]*>(.+?)</h[12]>', template_content, flags=re.IGNORECASE)
-
-        if len(section_parts) < 3:
-            # Pattern 3: Uppercase lines (common in legal templates)
-            section_parts = re.split(r'\n([A-Z][A-Z\s]{5,})\n', template_content)
-
-        if len(section_parts) < 3:
-            # Fallback: Treat entire template as one section
-            sections.append(self._create_section(
-                title="Main Document",
-                template_text=template_content,
-                order_index=0
-            ))
-            return sections
-
-        # Process matched sections
-        current_title = None
-        for i, part in enumerate(section_parts):
-            part = part.strip()
-            if not part:
-                continue
-
-            # Odd indices are titles (from split pattern)
-            if i % 2 == 1:
-                current_title = part
-            elif current_title:
-                # Even indices are content
-                sections.append(self._create_section(
-                    title=current_title,
-                    template_text=part,
-                    order_index=len(sections)
-                ))
-                current_title = None
+        # Headings (markdown, HTML, upper-case lines) from the compiled template
+        sections = [
+            self._create_section(title=section.title, template_text=section.text, order_index=index)
+            for index, section in enumerate(compile_template(template_content).sections)
+        ]
 
         # If no sections found, create one section
         if not sections:
@@ -276,9 +326,8 @@ Provide detailed analysis for high-quality drafting."""
         """
         Create a Section object from title and template text.
         """
-        # Extract placeholders (variables in {braces})
-        placeholders = re.findall(r'\{(\w+)\}', template_text)
-        required_facts = list(set(placeholders))  # Unique placeholders
+        # Placeholders and condition keys, from the compiled (cached) template
+        required_facts = list(compile_template(template_text).fact_keys)
 
         # Identify if legal references are needed (heuristic)
         required_laws = []
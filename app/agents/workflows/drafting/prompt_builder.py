@@ -0,0 +1,165 @@
+"""
+Prompt assembly for drafting agents.
+
+Each artefact (case data, document summaries, template, facts, feedback) is
+rendered exactly once and placed in a single segment. Segments are emitted in
+prefix order, most stable first, so that content which changes often never
+invalidates the cached prefix in front of it:
+
+1. SYSTEM   - agent instructions (stable across all calls)
+2. TEMPLATE - template content and guidance (stable per template)
+3. CASE     - case data (stable per workflow)
+4. SECTION  - section template and facts, documents, previous sections (stable across redrafts)
+5. DYNAMIC  - reviewer/human feedback and the task (changes every call)
+
+Anthropic allows up to four cache breakpoints; one is placed at the end of
+each of the first four segments once the prefix is long enough to be cached.
+Adding the same artefact twice is a no-op, so callers can't accidentally
+resend the case payload in several places.
+"""
+
+import hashlib
+import json
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.agents.workflows.drafting.llm_utils import estimate_tokens
+
+# Anthropic ignores breakpoints on prefixes shorter than this (Sonnet/Opus)
+MIN_CACHEABLE_TOKENS = 1024
+MAX_CACHE_BREAKPOINTS = 4
+
+
+class PromptSegment(str, Enum):
+    """Prompt segments in prefix order (definition order is emission order)."""
+    SYSTEM = "system"
+    TEMPLATE = "template"
+    CASE = "case"
+    SECTION = "section"
+    DYNAMIC = "dynamic"
+
+
+CACHED_SEGMENTS = (PromptSegment.SYSTEM, PromptSegment.TEMPLATE, PromptSegment.CASE, PromptSegment.SECTION)
+
+
+def render_json(data: Any) -> str:
+    """Stable JSON rendering used for every structured artefact."""
+    return json.dumps(data, indent=2, default=str, ensure_ascii=False, sort_keys=True)
+
+
+class PromptBuilder:
+    """
+    Builds a prefix-ordered message list from named artefacts.
+
+    Usage:
+        builder = PromptBuilder("writer")
+        builder.add(PromptSegment.SYSTEM, "instructions", WRITER_INSTRUCTIONS)
+        builder.add(PromptSegment.CASE, "case_data", render_json(case), heading="CASE DATA")
+        builder.add(PromptSegment.DYNAMIC, "task", task_text)
+        messages = builder.build()
+    """
+
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        self._segments: Dict[PromptSegment, List[Tuple[str, str]]] = {s: [] for s in PromptSegment}
+        self._owner: Dict[str, PromptSegment] = {}
+        self.breakpoints: List[Dict[str, Any]] = []
+
+    def add(self, segment: PromptSegment, name: str, text: Optional[str],
+            heading: Optional[str] = None) -> bool:
+        """
+        Add an artefact to a segment.
+
+        Returns:
+            False if the artefact is empty or was already added
+        """
+        if not text or not str(text).strip():
+            return False
+        if name in self._owner:
+            print(f"  ⚠️ PromptBuilder[{self.agent_name}]: '{name}' already in {self._owner[name].value} segment, skipped")
+            return False
+
+        body = f"## {heading}\n\n{text}" if heading else str(text)
+        self._segments[segment].append((name, body))
+        self._owner[name] = segment
+        return True
+
+    def has(self, name: str) -> bool:
+        return name in self._owner
+
+    def segment_text(self, segment: PromptSegment) -> str:
+        return "\n\n".join(body for _, body in self._segments[segment])
+
+    def token_counts(self) -> Dict[str, int]:
+        """Estimated input tokens per segment plus total."""
+        counts = {s.value: estimate_tokens(self.segment_text(s)) for s in PromptSegment}
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def artefact_token_counts(self) -> Dict[str, int]:
+        """Estimated tokens per artefact, useful for spotting oversized inputs."""
+        return {
+            name: estimate_tokens(body)
+            for segment in PromptSegment
+            for name, body in self._segments[segment]
+        }
+
+    def _plan_breakpoints(self) -> List[PromptSegment]:
+        """Cached segments that end a prefix long enough to be cached."""
+        planned, prefix_tokens = [], 0
+        for segment in CACHED_SEGMENTS:
+            text = self.segment_text(segment)
+            if not text:
+                continue
+            prefix_tokens += estimate_tokens(text)
+            if prefix_tokens >= MIN_CACHEABLE_TOKENS and len(planned) < MAX_CACHE_BREAKPOINTS:
+                planned.append(segment)
+        return planned
+
+    def build(self, provider: str = "anthropic", cache: bool = True) -> List[Any]:
+        """
+        Assemble segments into [SystemMessage, HumanMessage].
+
+        For Anthropic the human turn is a list of text blocks, one per segment,
+        with cache_control on the blocks that end a breakpoint. Other providers
+        get plain strings; their automatic prefix caching still benefits from
+        the stable ordering.
+        """
+        breakpoints = self._plan_breakpoints() if cache and provider == "anthropic" else []
+        self.breakpoints = []
+        hasher = hashlib.sha256()
+        prefix_tokens = 0
+
+        system_blocks: List[Dict[str, Any]] = []
+        human_blocks: List[Dict[str, Any]] = []
+        for segment in PromptSegment:
+            text = self.segment_text(segment)
+            if not text:
+                continue
+            hasher.update(text.encode("utf-8"))
+            prefix_tokens += estimate_tokens(text)
+
+            block: Dict[str, Any] = {"type": "text", "text": text}
+            if segment in breakpoints:
+                block["cache_control"] = {"type": "ephemeral"}
+                # Fingerprint of everything up to the breakpoint: a change between
+                # two calls means the cached prefix was invalidated
+                self.breakpoints.append({
+                    "segment": segment.value,
+                    "prefix_tokens": prefix_tokens,
+                    "fingerprint": hasher.copy().hexdigest()[:12]
+                })
+            (system_blocks if segment == PromptSegment.SYSTEM else human_blocks).append(block)
+
+        if provider != "anthropic":
+            return [
+                SystemMessage(content="\n\n".join(b["text"] for b in system_blocks)),
+                HumanMessage(content="\n\n".join(b["text"] for b in human_blocks))
+            ]
+        return [SystemMessage(content=system_blocks), HumanMessage(content=human_blocks)]
+
+    def layout(self) -> Dict[str, Any]:
+        """Segment sizes and breakpoints of the last build(), for logging."""
+        return {"segment_tokens": self.token_counts(), "breakpoints": self.breakpoints}
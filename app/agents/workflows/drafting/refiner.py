@@ -15,7 +15,8 @@ class DraftRefiner:
         # Use cached LLM with Anthropic prompt caching enabled
         self.llm = llm or create_cached_llm(
             model=settings.LLM_MODEL,
-            provider=settings.LLM_PROVIDER
+            provider=settings.LLM_PROVIDER,
+            agent_name="refiner"
         )
 
     async def refine_plan(self, state: DraftState) -> dict:
@@ -161,7 +162,7 @@ Provide comprehensive final validation."""
 
         # Invoke LLM
         print("  Performing final document validation...")
-        response = await self.llm.ainvoke(messages)
+        response = await self.llm.ainvoke(messages, tenant_id=state.get("company_id"))
 
         # Extract validation results
         validation_analysis = response.content if hasattr(response, 'content') else str(response)
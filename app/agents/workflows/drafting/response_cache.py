@@ -0,0 +1,174 @@
+"""
+Response cache for deterministic LLM calls.
+
+Temperature-0 calls with identical inputs (reviewer re-validating an unchanged
+draft, document router on a re-uploaded file, fact extraction on repeated
+feedback) return the stored response instead of calling the provider.
+
+Implements:
+1. Canonical hash of model + messages + params as the cache key
+2. Two tiers: bounded in-process TTL cache, then a durable DynamoDB table
+   (boto3 calls run in a worker thread; the tier is switched off if the
+   table is missing or not accessible)
+3. Opt-in per agent (drafting_config.RESPONSE_CACHE_AGENTS)
+4. Per-agent hit/miss statistics
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from botocore.exceptions import ClientError, NoCredentialsError
+from langchain_core.messages import AIMessage
+
+from app.agents.workflows.drafting.cache import Cache
+from app.agents.workflows.drafting.config import drafting_config
+
+# Bump when the stored payload format changes
+CACHE_FORMAT_VERSION = 1
+
+# DynamoDB errors that won't go away by retrying: stop using the durable tier
+# ("NoCredentials" stands for botocore's NoCredentialsError, which isn't a ClientError)
+_DURABLE_FATAL_CODES = {"ResourceNotFoundException", "AccessDeniedException", "AccessDenied",
+                        "UnrecognizedClientException", "NoCredentials"}
+
+
+def _canonical_message(msg: Any) -> Any:
+    """Reduce a message to the parts that affect the completion."""
+    if isinstance(msg, dict):
+        content = msg.get("content")
+        role = msg.get("role")
+        extra = {}
+    else:
+        content = getattr(msg, "content", str(msg))
+        role = getattr(msg, "type", type(msg).__name__)
+        # cache_control only affects provider-side prompt caching, not output
+        extra = {
+            k: v for k, v in (getattr(msg, "additional_kwargs", None) or {}).items()
+            if k != "cache_control"
+        }
+
+    if isinstance(content, list):
+        content = [
+            {k: v for k, v in block.items() if k != "cache_control"} if isinstance(block, dict) else block
+            for block in content
+        ]
+    return {"role": role, "content": content, "extra": extra}
+
+
+def make_cache_key(model: str, messages: List[Any], params: Optional[Dict[str, Any]] = None) -> str:
+    """Canonical SHA-256 over model, messages and call parameters."""
+    payload = {
+        "v": CACHE_FORMAT_VERSION,
+        "model": model,
+        "messages": [_canonical_message(m) for m in messages],
+        "params": params or {}
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory + DynamoDB) cache of LLM responses."""
+
+    def __init__(self):
+        self._memory = Cache(max_entries=drafting_config.RESPONSE_CACHE_MEMORY_ENTRIES)
+        self._repo = None
+        self._durable_disabled = not drafting_config.RESPONSE_CACHE_DURABLE
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "durable_hits": 0})
+
+    def is_enabled(self, agent_name: Optional[str], temperature: Optional[float]) -> bool:
+        """Only opted-in agents running at temperature 0 are cached."""
+        return bool(agent_name) and agent_name in drafting_config.RESPONSE_CACHE_AGENTS \
+            and temperature is not None and float(temperature) == 0.0
+
+    def _get_repo(self):
+        if self._repo is None and not self._durable_disabled:
+            try:
+                from app.repositories.llm_cache_repository import LLMResponseCacheRepository
+                self._repo = LLMResponseCacheRepository()
+            except Exception as e:
+                print(f"  ⚠️ Response cache: durable backend unavailable ({e}), using memory only")
+                self._durable_disabled = True
+        return self._repo
+
+    def _durable_failed(self, operation: str, error: Exception):
+        if isinstance(error, NoCredentialsError):
+            code = "NoCredentials"
+        else:
+            code = error.response.get("Error", {}).get("Code") if isinstance(error, ClientError) else None
+        if code in _DURABLE_FATAL_CODES:
+            print(f"  ⚠️ Response cache: durable backend unavailable ({code}), using memory only")
+            self._durable_disabled = True
+            self._repo = None
+        else:
+            print(f"  ⚠️ Response cache {operation} failed: {error}")
+
+    async def get(self, agent_name: str, key: str) -> Optional[AIMessage]:
+        payload = self._memory.get(key)
+
+        if payload is None:
+            repo = self._get_repo()
+            if repo:
+                try:
+                    item = await asyncio.to_thread(repo.get_by_key, key)
+                    if item and int(item.get("expiresAt", 0)) > time.time():
+                        payload = json.loads(item["payload"])
+                        self._memory.set(key, payload, ttl=drafting_config.CACHE_TTL_SECONDS)
+                        self._stats[agent_name]["durable_hits"] += 1
+                except Exception as e:
+                    self._durable_failed("read", e)
+
+        if payload is None:
+            self._stats[agent_name]["misses"] += 1
+            return None
+
+        self._stats[agent_name]["hits"] += 1
+        return AIMessage(
+            content=payload["content"],
+            response_metadata={"response_cache": "hit", "agent_name": agent_name},
+            usage_metadata={"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+        )
+
+    async def set(self, agent_name: str, key: str, response: Any):
+        # Tool calls trigger side effects downstream; never replay them
+        if getattr(response, "tool_calls", None):
+            return
+        content = getattr(response, "content", None)
+        if content is None:
+            return
+
+        payload = {"content": content}
+        self._memory.set(key, payload, ttl=drafting_config.CACHE_TTL_SECONDS)
+
+        repo = self._get_repo()
+        if repo:
+            try:
+                now = int(time.time())
+                await asyncio.to_thread(repo.put, {
+                    "cacheKey": key,
+                    "agentName": agent_name,
+                    "payload": json.dumps(payload, ensure_ascii=False),
+                    "createdAt": now,
+                    "expiresAt": now + drafting_config.RESPONSE_CACHE_TTL_SECONDS
+                })
+            except Exception as e:
+                self._durable_failed("write", e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rates per agent."""
+        stats = {}
+        for agent, counts in self._stats.items():
+            total = counts["hits"] + counts["misses"]
+            stats[agent] = {
+                **counts,
+                "hit_rate_percent": round(counts["hits"] / total * 100, 2) if total else 0
+            }
+        return stats
+
+
+# Global instance
+response_cache = ResponseCache()
@@ -2,8 +2,10 @@ from app.agents.workflows.drafting.state import DraftState
 from app.agents.workflows.drafting.schema import QAReport, QAStatus, Issue
 from app.agents.workflows.drafting.llm_utils import (
     create_cached_llm,
-    create_cached_messages_with_context
+    extract_cache_usage,
+    format_context_for_caching
 )
+from app.agents.workflows.drafting.prompt_builder import PromptBuilder, PromptSegment, render_json
 import re
 import os
 import json
@@ -18,7 +20,8 @@ class DraftReviewer:
         from app.core.config import settings
         self.llm = llm or create_cached_llm(
             model=settings.LLM_MODEL,
-            provider=settings.LLM_PROVIDER
+            provider=settings.LLM_PROVIDER,
+            agent_name="reviewer"  # Opted into the response cache (re-review of unchanged drafts)
         )
 
     async def review_section(self, state: DraftState) -> dict:
@@ -44,8 +47,13 @@ class DraftReviewer:
         print(f"  Reviewing section: {current_section.title if current_section else 'Unknown'}")
         print(f"  [DEBUG] Reviewing content (first 100 chars): {draft.content[:100].replace(chr(10), ' ')}...")
 
-        # Perform comprehensive LLM validation
-        issues = await self._validate_with_llm(draft, current_section, fact_registry, section_memory, state)
+        # Boilerplate rendered from the template and registry has nothing for the LLM to check
+        if getattr(draft, "prefilled", False):
+            print("  ✓ Prefilled section: all placeholders filled from the fact registry, skipping LLM review")
+            issues = []
+        else:
+            # Perform comprehensive LLM validation
+            issues = await self._validate_with_llm(draft, current_section, fact_registry, section_memory, state)
 
         # Determine status based on issues
         critical_issues = [i for i in issues if i.severity == "Critical"]
@@ -439,24 +447,34 @@ Provide your analysis as JSON with HUMAN-READABLE descriptions:
 
 Now perform the comprehensive validation."""
 
-        # Create messages with optimal caching structure
-        messages = create_cached_messages_with_context(
-            system_prompt=system_prompt,
-            user_message=user_message,
-            context=cache_context,
-            cache_system=True,  # Cache the system prompt
-            cache_context=True  # Cache the case/section context
-        )
+        # Prefix-ordered prompt: case and section context stay cached across
+        # re-reviews; only the draft and feedback (last) change
+        from app.core.config import settings
+        builder = PromptBuilder("reviewer")
+        builder.add(PromptSegment.SYSTEM, "instructions", system_prompt)
+        builder.add(PromptSegment.CASE, "case_data",
+                    format_context_for_caching({"case_data": cache_context["case_data"]}))
+        if cache_context["fact_registry"]:
+            builder.add(PromptSegment.CASE, "fact_registry",
+                        render_json(cache_context["fact_registry"]), heading="FACT REGISTRY")
+        builder.add(PromptSegment.SECTION, "section", format_context_for_caching({
+            "template": cache_context["template"],
+            "required_facts": cache_context["required_facts"]
+        }))
+        builder.add(PromptSegment.DYNAMIC, "validation_request", user_message)
+        messages = builder.build(provider=settings.LLM_PROVIDER)
 
         try:
             # Invoke LLM
-            response = await self.llm.ainvoke(messages)
+            response = await self.llm.ainvoke(messages, tenant_id=state.get("company_id"),
+                                              workflow_id=state.get("workflow_id"),
+                                              section_idx=state.get("current_section_idx"))
             llm_analysis = response.content if hasattr(response, 'content') else str(response)
 
             # Log cache performance
-            if hasattr(response, 'usage_metadata'):
-                usage = response.usage_metadata
-                cache_read = usage.get('cache_read_input_tokens', 0)
+            usage = extract_cache_usage(response)
+            if usage:
+                cache_read = usage["cache_read_tokens"]
                 if cache_read > 0:
                     print(f"    ✓ Cache HIT: {cache_read} tokens from cache")
 
@@ -0,0 +1,261 @@
+"""
+Process-wide LLM request scheduler.
+
+Every CachedLLM call goes through a single scheduler so agents share one view
+of provider capacity. Implements:
+1. Per-model concurrency limits
+2. Token-per-minute budgeting, corrected with real usage_metadata
+3. Priority classes (interactive concierge > drafting > background summarization)
+4. Round-robin fairness across tenants within a priority class
+
+Requests wait in the queue instead of hitting provider 429s and retrying after
+the fact.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT = "default"
+BUDGET_WINDOW_SECONDS = 60.0
+
+
+class Priority(IntEnum):
+    """Priority classes. Lower value is served first."""
+    INTERACTIVE = 0  # Concierge chat, anything a user is actively waiting on
+    DRAFTING = 1     # Drafting workflow agents
+    BACKGROUND = 2   # Document summarization, bulk ingestion
+
+
+class _Waiter:
+    __slots__ = ("future", "tokens", "tenant", "enqueued_at")
+
+    def __init__(self, future: asyncio.Future, tokens: int, tenant: str):
+        self.future = future
+        self.tokens = tokens
+        self.tenant = tenant
+        self.enqueued_at = time.monotonic()
+
+
+class _Grant:
+    """Handle for an acquired slot. Callers report real usage through it."""
+    __slots__ = ("entry", "actual_tokens")
+
+    def __init__(self, entry: List[float]):
+        self.entry = entry  # [timestamp, tokens] in the lane's usage window
+        self.actual_tokens: Optional[int] = None
+
+    def record_usage(self, tokens: int):
+        self.actual_tokens = tokens
+
+
+class _ModelLane:
+    """Scheduling state for a single model."""
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.tokens_per_minute = tokens_per_minute
+        self.in_flight = 0
+        self.usage: Deque[List[float]] = deque()
+        # priority -> tenant -> FIFO of waiters. OrderedDict order is the round-robin order.
+        self.queues: Dict[Priority, "OrderedDict[str, Deque[_Waiter]]"] = {
+            p: OrderedDict() for p in Priority
+        }
+        self.wakeup: Optional[asyncio.TimerHandle] = None
+        self.stats = {"granted": 0, "queued": 0, "budget_waits": 0, "wait_ms_total": 0}
+
+    def window_tokens(self, now: float) -> int:
+        while self.usage and self.usage[0][0] < now - BUDGET_WINDOW_SECONDS:
+            self.usage.popleft()
+        return int(sum(entry[1] for entry in self.usage))
+
+    def next_waiter(self, pop: bool = False) -> Optional[_Waiter]:
+        """Highest priority first, round-robin across tenants inside a priority."""
+        for priority in Priority:
+            tenants = self.queues[priority]
+            while tenants:
+                tenant, waiters = next(iter(tenants.items()))
+                # Drop waiters whose caller already gave up
+                while waiters and waiters[0].future.done():
+                    waiters.popleft()
+                if not waiters:
+                    del tenants[tenant]
+                    continue
+                if not pop:
+                    return waiters[0]
+                waiter = waiters.popleft()
+                # Rotate tenant to the back so the next grant goes to someone else
+                del tenants[tenant]
+                if waiters:
+                    tenants[tenant] = waiters
+                return waiter
+        return None
+
+    def queued_count(self) -> Dict[str, int]:
+        return {
+            p.name.lower(): sum(len(w) for w in self.queues[p].values())
+            for p in Priority
+        }
+
+
+class LLMScheduler:
+    """
+    Admission control for LLM calls.
+
+    Usage:
+        async with llm_scheduler.slot(model, estimated_tokens, Priority.DRAFTING, tenant) as grant:
+            response = await client.ainvoke(messages)
+            grant.record_usage(total_tokens)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        tokens_per_minute: int = 0,
+        model_concurrency: Optional[Dict[str, int]] = None,
+        model_tokens_per_minute: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            max_concurrency: Default in-flight limit per model
+            tokens_per_minute: Default token budget per model (0 = unlimited)
+            model_concurrency: Per-model overrides for max_concurrency
+            model_tokens_per_minute: Per-model overrides for tokens_per_minute
+        """
+        self.max_concurrency = max_concurrency
+        self.tokens_per_minute = tokens_per_minute
+        self.model_concurrency = model_concurrency or {}
+        self.model_tokens_per_minute = model_tokens_per_minute or {}
+        self._lanes: Dict[str, _ModelLane] = {}
+
+    def _lane(self, model: str) -> _ModelLane:
+        lane = self._lanes.get(model)
+        if lane is None:
+            lane = _ModelLane(
+                self.model_concurrency.get(model, self.max_concurrency),
+                self.model_tokens_per_minute.get(model, self.tokens_per_minute)
+            )
+            self._lanes[model] = lane
+        return lane
+
+    async def acquire(
+        self,
+        model: str,
+        estimated_tokens: int = 0,
+        priority: Priority = Priority.DRAFTING,
+        tenant: Optional[str] = None
+    ) -> _Grant:
+        """Wait for a slot on `model`. Must be paired with release()."""
+        lane = self._lane(model)
+        tenant = tenant or DEFAULT_TENANT
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), estimated_tokens, tenant)
+        lane.queues[Priority(priority)].setdefault(tenant, deque()).append(waiter)
+        self._dispatch(lane)
+
+        if not waiter.future.done():
+            lane.stats["queued"] += 1
+
+        try:
+            entry = await waiter.future
+        except asyncio.CancelledError:
+            # Granted between cancellation and wakeup: hand the slot back
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(model, _Grant(waiter.future.result()))
+            raise
+
+        lane.stats["wait_ms_total"] += int((time.monotonic() - waiter.enqueued_at) * 1000)
+        return _Grant(entry)
+
+    def release(self, model: str, grant: _Grant):
+        """Return a slot and reconcile the token estimate with real usage."""
+        lane = self._lane(model)
+        lane.in_flight = max(0, lane.in_flight - 1)
+        if grant.actual_tokens is not None:
+            grant.entry[1] = grant.actual_tokens
+        self._dispatch(lane)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        model: str,
+        estimated_tokens: int = 0,
+        priority: Priority = Priority.DRAFTING,
+        tenant: Optional[str] = None
+    ):
+        grant = await self.acquire(model, estimated_tokens, priority, tenant)
+        try:
+            yield grant
+        finally:
+            self.release(model, grant)
+
+    def _dispatch(self, lane: _ModelLane):
+        """Grant slots to waiting callers while concurrency and budget allow."""
+        while lane.in_flight < lane.max_concurrency:
+            waiter = lane.next_waiter()
+            if waiter is None:
+                return
+
+            now = time.monotonic()
+            if lane.tokens_per_minute:
+                used = lane.window_tokens(now)
+                # An empty window always admits one request so oversized prompts can't deadlock
+                if used and used + waiter.tokens > lane.tokens_per_minute:
+                    lane.stats["budget_waits"] += 1
+                    self._schedule_wakeup(lane, now)
+                    return
+
+            lane.next_waiter(pop=True)
+            entry = [now, waiter.tokens]
+            lane.usage.append(entry)
+            lane.in_flight += 1
+            lane.stats["granted"] += 1
+            waiter.future.set_result(entry)
+
+    def _schedule_wakeup(self, lane: _ModelLane, now: float):
+        """Re-run dispatch once the oldest usage entry leaves the budget window."""
+        if lane.wakeup is not None and not lane.wakeup.cancelled():
+            return
+        delay = max(0.05, lane.usage[0][0] + BUDGET_WINDOW_SECONDS - now) if lane.usage else 0.05
+
+        def _wake():
+            lane.wakeup = None
+            self._dispatch(lane)
+
+        try:
+            lane.wakeup = asyncio.get_running_loop().call_later(delay, _wake)
+        except RuntimeError:
+            lane.wakeup = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-model scheduler statistics."""
+        now = time.monotonic()
+        return {
+            model: {
+                "in_flight": lane.in_flight,
+                "max_concurrency": lane.max_concurrency,
+                "tokens_last_minute": lane.window_tokens(now),
+                "tokens_per_minute": lane.tokens_per_minute,
+                "queued": lane.queued_count(),
+                **lane.stats
+            }
+            for model, lane in self._lanes.items()
+        }
+
+
+def _build_scheduler() -> LLMScheduler:
+    from app.agents.workflows.drafting.config import drafting_config
+    return LLMScheduler(
+        max_concurrency=drafting_config.LLM_MAX_CONCURRENCY,
+        tokens_per_minute=drafting_config.LLM_TOKENS_PER_MINUTE,
+        model_concurrency=drafting_config.LLM_MODEL_CONCURRENCY,
+        model_tokens_per_minute=drafting_config.LLM_MODEL_TOKENS_PER_MINUTE
+    )
+
+# Global scheduler instance (one per process)
+llm_scheduler = _build_scheduler()
@@ -67,6 +67,7 @@ class DraftedSection(BaseModel):
     citations_used: List[Citation]
     placeholders_filled: Dict[str, str]
     word_count: int
+    prefilled: bool = False # Rendered from the template and fact registry without the LLM
 
 class Issue(BaseModel):
     type: str  # "missing_fact", "inconsistency", "legal_error", "style"
@@ -83,6 +84,8 @@ class FactResolution(BaseModel):
     source: str # e.g., "inference_from_docs", "inference_from_case_data"
     reasoning: str # Why the AI believes this is the value
     is_resolved: bool # True if confidence >= threshold (e.g. 0.8)
+    source_document: Optional[str] = None # Filename of the excerpt the value came from
+    source_page: Optional[int] = None # Page of that excerpt, when known
 
 class ResolutionResult(BaseModel):
     """Output of the Smart Resolution Engine."""
@@ -0,0 +1,317 @@
+"""
+Template compiler.
+
+Templates are parsed once into a small AST and cached by content hash, so
+every agent (planner, context manager, writer, reviewer) reads the same
+placeholder set and fills placeholders the same way instead of re-running
+its own regex.
+
+Grammar:
+    {key} or {{ key }}                      placeholder
+    {{#if key}} ... {{else}} ... {{/if}}    conditional block (else optional)
+    {{#unless key}} ... {{/unless}}         negated conditional block
+    [CITE: ...] / [NARRATIVE_SECTION]       marker: content the writer must author
+
+Unbalanced block tags are kept as literal text, since templates are authored by
+users and a stray tag should not make a template unusable.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+
+# Compiled templates kept per process (sections of all active templates)
+CACHE_SIZE = 512
+
+MISSING_FILL = "[MISSING]"
+
+_TOKEN_PATTERN = re.compile(
+    r'\{\{\s*#(?P<open>if|unless)\s+(?P<cond>\w+)\s*\}\}'
+    r'|\{\{\s*(?P<else>else)\s*\}\}'
+    r'|\{\{\s*/(?P<close>if|unless)\s*\}\}'
+    r'|\{\{\s*(?P<double>\w+)\s*\}\}'
+    r'|\{(?P<single>\w+)\}'
+    r'|\[(?P<marker>CITE:[^\]\n]*|[A-Z][A-Z0-9_]{2,})\]'
+)
+
+# Section headings, tried in order (markdown, HTML, upper-case lines)
+_SECTION_PATTERNS = (
+    re.compile(r'\n#{1,2}\s+(.+?)\n'),
+    re.compile(r'<h[12][^>]*>(.+?)</h[12]>', re.IGNORECASE),
+    re.compile(r'\n([A-Z][A-Z\s]{5,})\n'),
+)
+
+
+@dataclass(frozen=True)
+class Text:
+    text: str
+
+
+@dataclass(frozen=True)
+class Placeholder:
+    key: str
+    raw: str
+
+
+@dataclass(frozen=True)
+class Marker:
+    raw: str
+
+
+@dataclass(frozen=True)
+class Conditional:
+    key: str
+    negate: bool
+    body: Tuple["Node", ...]
+    orelse: Tuple["Node", ...] = ()
+    # Tags as written, to re-emit blocks whose condition is unresolved
+    open_tag: str = ""
+    else_tag: str = ""
+    close_tag: str = ""
+
+
+Node = Union[Text, Placeholder, Marker, Conditional]
+
+
+@dataclass(frozen=True)
+class TemplateSection:
+    title: str
+    text: str
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Parsed template with precomputed placeholder, condition and marker sets."""
+    content_hash: str
+    source: str = field(repr=False)
+    nodes: Tuple[Node, ...] = field(repr=False)
+    placeholder_order: Tuple[str, ...]  # First appearance order
+    placeholders: FrozenSet[str]
+    conditions: FrozenSet[str]
+    markers: Tuple[str, ...]
+
+    @property
+    def fact_keys(self) -> Tuple[str, ...]:
+        """Facts the template reads: placeholders, then condition keys."""
+        return self.placeholder_order + tuple(sorted(self.conditions - self.placeholders))
+
+    @property
+    def is_deterministic(self) -> bool:
+        """No markers: the template is fully rendered by filling placeholders."""
+        return not self.markers
+
+    def missing(self, values: Mapping[str, Any]) -> List[str]:
+        """Placeholders (in order) that have no value."""
+        return [key for key in self.placeholder_order if not _has_value(values, key)]
+
+    def fill_map(self, values: Mapping[str, Any]) -> Dict[str, str]:
+        """Value used for each placeholder, MISSING_FILL when there is none."""
+        return {
+            key: str(values[key]) if _has_value(values, key) else MISSING_FILL
+            for key in self.placeholder_order
+        }
+
+    def render(self, values: Mapping[str, Any], missing: Optional[str] = "[MISSING: {key}]") -> str:
+        """
+        Resolve conditionals and fill placeholders.
+
+        Args:
+            missing: Format for placeholders without a value ("{key}" is the
+                placeholder name); None keeps the placeholder as written, and
+                also keeps conditional blocks whose key has no value (tags
+                included) so the writer can still decide them
+        """
+        parts: List[str] = []
+        _render(self.nodes, values, missing, parts)
+        return "".join(parts)
+
+    @property
+    def sections(self) -> Tuple[TemplateSection, ...]:
+        """Heading-delimited sections (empty when the template has no headings)."""
+        return _split_sections(self.source)
+
+
+def _has_value(values: Mapping[str, Any], key: str) -> bool:
+    value = values.get(key)
+    return value is not None and value != ""
+
+
+def _render(nodes: Tuple[Node, ...], values: Mapping[str, Any], missing: Optional[str], parts: List[str]):
+    for node in nodes:
+        if isinstance(node, Text):
+            parts.append(node.text)
+        elif isinstance(node, Placeholder):
+            if _has_value(values, node.key):
+                parts.append(str(values[node.key]))
+            else:
+                parts.append(node.raw if missing is None else missing.format(key=node.key))
+        elif isinstance(node, Marker):
+            parts.append(node.raw)
+        elif missing is None and values.get(node.key) is None:
+            parts.append(node.open_tag)
+            _render(node.body, values, missing, parts)
+            if node.else_tag:
+                parts.append(node.else_tag)
+                _render(node.orelse, values, missing, parts)
+            parts.append(node.close_tag)
+        else:
+            truthy = bool(values.get(node.key))
+            _render(node.body if truthy != node.negate else node.orelse, values, missing, parts)
+
+
+def _parse(source: str) -> Tuple[Node, ...]:
+    # Each frame: (open tag match, body nodes, else nodes or None, else tag)
+    root: List[Node] = []
+    stack: List[Tuple[Any, List[Node], Optional[List[Node]], str]] = []
+
+    def current() -> List[Node]:
+        if not stack:
+            return root
+        _, body, orelse, _ = stack[-1]
+        return orelse if orelse is not None else body
+
+    def add_text(text: str):
+        if not text:
+            return
+        nodes = current()
+        if nodes and isinstance(nodes[-1], Text):
+            nodes[-1] = Text(nodes[-1].text + text)
+        else:
+            nodes.append(Text(text))
+
+    position = 0
+    for match in _TOKEN_PATTERN.finditer(source):
+        add_text(source[position:match.start()])
+        position = match.end()
+        raw = match.group(0)
+
+        if match.group("open"):
+            stack.append((match, [], None, ""))
+        elif match.group("else"):
+            if stack and stack[-1][2] is None:
+                stack[-1] = (stack[-1][0], stack[-1][1], [], raw)
+            else:
+                add_text(raw)
+        elif match.group("close"):
+            if stack and stack[-1][0].group("open") == match.group("close"):
+                opening, body, orelse, else_tag = stack.pop()
+                current().append(Conditional(
+                    key=opening.group("cond"),
+                    negate=opening.group("open") == "unless",
+                    body=tuple(body),
+                    orelse=tuple(orelse or ()),
+                    open_tag=opening.group(0),
+                    else_tag=else_tag,
+                    close_tag=raw
+                ))
+            else:
+                add_text(raw)
+        elif match.group("marker"):
+            current().append(Marker(raw))
+        else:
+            current().append(Placeholder(match.group("double") or match.group("single"), raw))
+    add_text(source[position:])
+
+    # Unclosed blocks: keep their tags as text and their contents inline
+    while stack:
+        opening, body, orelse, else_tag = stack.pop()
+        inline: List[Node] = [Text(opening.group(0))] + body
+        if orelse is not None:
+            inline += [Text(else_tag)] + orelse
+        for node in inline:
+            if isinstance(node, Text):
+                add_text(node.text)
+            else:
+                current().append(node)
+    return tuple(root)
+
+
+def _collect(nodes: Tuple[Node, ...], placeholders: List[str], conditions: List[str], markers: List[str]):
+    for node in nodes:
+        if isinstance(node, Placeholder):
+            if node.key not in placeholders:
+                placeholders.append(node.key)
+        elif isinstance(node, Marker):
+            markers.append(node.raw)
+        elif isinstance(node, Conditional):
+            if node.key not in conditions:
+                conditions.append(node.key)
+            _collect(node.body, placeholders, conditions, markers)
+            _collect(node.orelse, placeholders, conditions, markers)
+
+
+def _split_sections(source: str) -> Tuple[TemplateSection, ...]:
+    for pattern in _SECTION_PATTERNS:
+        parts = pattern.split(source)
+        if len(parts) >= 3:
+            break
+    else:
+        return ()
+
+    sections: List[TemplateSection] = []
+    title = None
+    # Odd indices are titles (from the split pattern), even indices are content
+    for i, part in enumerate(parts):
+        part = part.strip()
+        if not part:
+            continue
+        if i % 2 == 1:
+            title = part
+        elif title:
+            sections.append(TemplateSection(title, part))
+            title = None
+    return tuple(sections)
+
+
+def content_hash(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+class TemplateCompiler:
+    """Compiles templates, caching the result by content hash (LRU, thread-safe)."""
+
+    def __init__(self, max_entries: int = CACHE_SIZE):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, CompiledTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def compile(self, source: str) -> CompiledTemplate:
+        source = source or ""
+        digest = content_hash(source)
+        with self._lock:
+            compiled = self._cache.get(digest)
+            if compiled is not None:
+                self._cache.move_to_end(digest)
+                return compiled
+
+        nodes = _parse(source)
+        placeholders: List[str] = []
+        conditions: List[str] = []
+        markers: List[str] = []
+        _collect(nodes, placeholders, conditions, markers)
+        compiled = CompiledTemplate(
+            content_hash=digest,
+            source=source,
+            nodes=nodes,
+            placeholder_order=tuple(placeholders),
+            placeholders=frozenset(placeholders),
+            conditions=frozenset(conditions),
+            markers=tuple(markers)
+        )
+
+        with self._lock:
+            self._cache[digest] = compiled
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return compiled
+
+
+# Global compiler (one cache per process)
+template_compiler = TemplateCompiler()
+
+
+def compile_template(source: str) -> CompiledTemplate:
+    return template_compiler.compile(source)
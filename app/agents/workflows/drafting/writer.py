@@ -2,19 +2,90 @@ from app.agents.workflows.drafting.state import DraftState
 from app.agents.workflows.drafting.schema import DraftedSection, SectionStatus, Citation
 from app.agents.workflows.drafting.context_manager import context_manager
 from app.agents.workflows.drafting.citation_agent import get_citation_agent
-from app.agents.workflows.drafting.llm_utils import (
-    create_cached_llm,
-    create_cached_messages_with_context
-)
+from app.agents.workflows.drafting.llm_utils import create_cached_llm, extract_cache_usage
+from app.agents.workflows.drafting.prompt_builder import PromptBuilder, PromptSegment, render_json
+from app.services.lib.document_index import format_passage_source
 from app.agents.workflows.drafting.logger import drafting_logger
+from app.agents.workflows.drafting.config import drafting_config
+from app.agents.workflows.drafting.cache import session_cache
+from app.agents.workflows.drafting.template_compiler import compile_template
+from app.agents.workflows.drafting.context_packer import ContextItem, pack_for_agent, extract_terms, relevance_score
 import uuid
 import re
 import os
 import json
 import time  # Added missing import
-from typing import Dict, List, Any
+import functools
+import operator
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
+from typing import Dict, List, Any, Optional
 from functools import lru_cache
 
+# Structural markers checked while the section streams in
+UNFILLED_PLACEHOLDER_PATTERN = re.compile(r'\{\{?\s*(\w+)\s*\}?\}')
+MISSING_MARKER_PATTERN = re.compile(r'\[MISSING:\s*([^\]]+)\]')
+
+WRITER_INSTRUCTIONS = """You are an expert legal drafter specializing in Indian legal documents.
+
+TASK: Draft a legal document section based on the provided context.
+The user has selected a specific template; follow its structure and guidance."""
+
+DRAFT_TASK_INSTRUCTIONS = """1. Placeholders with a fact registry value are already filled in the section template. Using the Complete Case Information, fill ALL remaining {variable} placeholders listed as open for the section
+2. Map case data intelligently:
+   - {court_state} → Extract state from jurisdiction/location data
+   - {court_location} → Use court name + jurisdiction
+   - {case_number} → Use the case number from case data
+   - {case_year} → Extract year from filing date
+   - {petitioner_name} → Use client name
+   - {respondent_name} → Use opposing party name
+3. Do NOT leave any placeholders unfilled - use the case data to determine appropriate values
+4. Address all reviewer and human feedback provided at the end of the prompt
+5. Use formal Indian legal language appropriate for matrimonial disputes
+6. Integrate any citations naturally if provided
+7. Ensure content is legally accurate and complete
+8. When relying on a document excerpt, refer to the document and page shown in its label (e.g. "at page 12 of the Petition")"""
+
+def get_live_preview(thread_id: str) -> Optional[Dict[str, Any]]:
+    """Latest streamed preview for a workflow thread (None when not drafting)."""
+    return session_cache.get(f"draft_preview:{thread_id}")
+
+class StreamingStructureMonitor:
+    """
+    Cheap structural checks run on a streaming draft.
+
+    Only the newly arrived tail is rescanned, so cost stays linear in the
+    output length. Echoed {placeholders} are a certain critical defect (the
+    reviewer always fails them), so they can justify cancelling early.
+    [MISSING: key] markers are expected output and are only collected.
+    """
+    LOOKBEHIND = 64  # Longest marker that can straddle a chunk boundary
+
+    def __init__(self, cancel_threshold: int = 0):
+        self.cancel_threshold = cancel_threshold
+        self.unfilled_placeholders: List[str] = []
+        self.missing_keys: List[str] = []
+        self._scanned_upto = 0
+
+    def feed(self, text: str):
+        start = max(0, self._scanned_upto - self.LOOKBEHIND)
+        for pattern, found in (
+            (UNFILLED_PLACEHOLDER_PATTERN, self.unfilled_placeholders),
+            (MISSING_MARKER_PATTERN, self.missing_keys)
+        ):
+            for match in pattern.finditer(text, start):
+                # Matches ending before the previous scan point were already counted
+                if match.end() <= self._scanned_upto:
+                    continue
+                key = match.group(1).strip()
+                if key not in found:
+                    found.append(key)
+        self._scanned_upto = len(text)
+
+    @property
+    def should_cancel(self) -> bool:
+        return bool(self.cancel_threshold) and len(self.unfilled_placeholders) >= self.cancel_threshold
+
 class DraftWriter:
     def __init__(self, llm=None):
         # Use cached LLM with Anthropic prompt caching enabled
@@ -22,10 +93,11 @@ class DraftWriter:
         from app.core.config import settings
         self.llm = llm or create_cached_llm(
             model=settings.LLM_MODEL,
-            provider=settings.LLM_PROVIDER
+            provider=settings.LLM_PROVIDER,
+            agent_name="writer"
         )
 
-    async def write_section(self, state: DraftState) -> dict:
+    async def write_section(self, state: DraftState, thread_id: Optional[str] = None) -> dict:
         """
         Agent Node: Draft the current section.
 
@@ -82,9 +154,17 @@ class DraftWriter:
         else:
             print("  [2/3] No legal references needed, skipping Citation Agent")
 
-        # Step 3: Generate draft content with LLM (using API-level prompt caching)
-        print("  [3/3] Generating draft content with cached LLM...")
-        draft_content = await self._generate_draft(section, section_context, citations, state)
+        # Step 3: Generate draft content with LLM (using API-level prompt caching),
+        # unless the section is boilerplate that the fact registry fills completely
+        compiled = compile_template(section.template_text)
+        fact_values = {key: fact["value"] for key, fact in section_context["required_facts"].items()}
+        prefilled = self._is_boilerplate(section, compiled, fact_values, state)
+        if prefilled:
+            print("  [3/3] Boilerplate section: rendered from template and fact registry, skipping LLM")
+            draft_content = compiled.render(fact_values)
+        else:
+            print("  [3/3] Generating draft content with cached LLM...")
+            draft_content = await self._generate_draft(section, section_context, citations, state, thread_id)
 
         # Fill placeholders in the template
         filled_placeholders = self._fill_placeholders(section.template_text, section_context["required_facts"])
@@ -96,7 +176,8 @@ class DraftWriter:
             facts_used=list(section_context["required_facts"].keys()),
             citations_used=citations,
             placeholders_filled=filled_placeholders,
-            word_count=len(draft_content.split())
+            word_count=len(draft_content.split()),
+            prefilled=prefilled
         )
 
         print(f"✓ Drafted {draft.word_count} words, used {len(draft.facts_used)} facts")
@@ -120,31 +201,145 @@ class DraftWriter:
             "current_section": section
         }
 
-    async def _generate_draft(self, section: Any, context: Dict, citations: List[Citation], state: DraftState) -> str:
+    async def _generate_draft(self, section: Any, context: Dict, citations: List[Citation], state: DraftState,
+                              thread_id: Optional[str] = None) -> str:
         """
         Generate the actual draft content using LLM with API-level prompt caching.
 
-        Uses Anthropic's prompt caching to cache:
-        1. System prompt (writer instructions) - 90% cost reduction
-        2. Case data, documents, template - 90% cost reduction
-        3. Dynamic query (section-specific) - NOT cached
+        Uses Anthropic's prompt caching with a prefix ordered from most to
+        least stable (instructions, template, case, section, feedback), so
+        redrafts reuse everything up to the feedback block.
 
         This structure provides 48-66% overall cost savings on multi-section documents.
+        See _build_prompt for how each artefact is placed.
         """
-        # Load system prompt (will be cached at API level)
-        # system_prompt = load_drafting_prompt("writer") # Original system prompt
+        from app.core.config import settings
 
-        # Add Template Context
-        if state.get("template_id"):
-            # We need to fetch the template details here or trust they are in state
-            # For simplicity, assuming the state might key template details or we fetch
-            # Ideally, the `orchestrator` or `context_manager` fetched it.
-            pass
+        workflow_id = state.get("workflow_id", "unknown")
+        section_idx = state.get("current_section_idx", 0)
+        builder = self._build_prompt(section, context, citations, state)
+        messages = builder.build(provider=settings.LLM_PROVIDER)
 
-        template_content = state.get("template_content", "")
-        template_description = state.get("template_description", "")
+        layout = builder.layout()
+        drafting_logger.log_prompt_segments(
+            workflow_id=workflow_id,
+            agent_name="writer",
+            segment_tokens=layout["segment_tokens"],
+            breakpoints=layout["breakpoints"],
+            section_idx=section_idx
+        )
+        print(f"  🧱 Prompt segments (est. tokens): " + ", ".join(
+            f"{name}={tokens}" for name, tokens in layout["segment_tokens"].items()
+        ) + f" | cache breakpoints: {[bp['segment'] for bp in layout['breakpoints']]}")
+
+        # Invoke LLM (will use cached content if available within 5-minute window)
+        start_time = time.time()
+        if drafting_config.WRITER_STREAMING and hasattr(self.llm, "astream"):
+            response = await self._stream_draft(messages, section, state, thread_id)
+        else:
+            response = await self.llm.ainvoke(messages, tenant_id=state.get("company_id"),
+                                              workflow_id=workflow_id, section_idx=section_idx)
+        duration_ms = int((time.time() - start_time) * 1000)
+
+        # Extract draft content
+        draft_content = response.content if hasattr(response, 'content') else str(response)
+
+        # The call itself is logged (with cache usage) by CachedLLM
+        usage = extract_cache_usage(response)
+        if usage:
+            cache_read = usage["cache_read_tokens"]
+            cache_create = usage["cache_write_tokens"]
+            input_tokens = usage["input_tokens"]
+            output_tokens = usage["output_tokens"]
+
+            if cache_read > 0:
+                print(f"  ✓ Cache HIT: {cache_read} tokens read from cache (90% savings)")
+            elif cache_create > 0:
+                print(f"  ⚡ Cache MISS: {cache_create} tokens written to cache (available for 5 minutes)")
+
+            print(f"  📊 Tokens: {input_tokens} input, {output_tokens} output ({duration_ms}ms)")
+
+        return draft_content
+
+    def _build_prompt(self, section: Any, context: Dict[str, Any], citations: List[Citation],
+                      state: DraftState) -> PromptBuilder:
+        """
+        Assemble the writer prompt, sending every artefact exactly once.
+
+        - SYSTEM: writer instructions
+        - TEMPLATE: template guidance, usage instructions, full template
+        - CASE: case data
+        - SECTION: section template, section facts, document summaries and excerpts,
+          previous sections, missing facts, citations
+        - DYNAMIC: reviewer and human feedback (last, so redrafts keep the cached prefix)
+        """
+        builder = PromptBuilder("writer")
+        template_data = state.get("template_data", {}) or {}
+
+        builder.add(PromptSegment.SYSTEM, "instructions", WRITER_INSTRUCTIONS)
+        builder.add(PromptSegment.SYSTEM, "task", DRAFT_TASK_INSTRUCTIONS, heading="INSTRUCTIONS")
+
+        builder.add(PromptSegment.TEMPLATE, "template_description",
+                    state.get("template_description", ""), heading="TEMPLATE GUIDANCE")
+        builder.add(PromptSegment.TEMPLATE, "usage_instructions",
+                    template_data.get("usageInstructions"), heading="TEMPLATE USAGE INSTRUCTIONS")
+        builder.add(PromptSegment.TEMPLATE, "template_content",
+                    state.get("template_content", ""), heading="FULL TEMPLATE")
+
+        # Case-level material: identical for every section of the draft
+        builder.add(PromptSegment.CASE, "case_data",
+                    render_json(state.get("case_data", {})), heading="COMPLETE CASE INFORMATION")
+        fact_values = {key: fact["value"] for key, fact in context.get("required_facts", {}).items()}
+
+        # Section-specific request: stable across redrafts of the same section.
+        # Registry facts are substituted and conditional blocks resolved here, so
+        # the writer only sees the genuinely open placeholders.
+        compiled = compile_template(section.template_text)
+        values = fact_values if drafting_config.WRITER_PREFILL_PLACEHOLDERS else {}
+        section_request = f"Title: {section.title}\nTemplate: {compiled.render(values, missing=None)}"
+        open_placeholders = compiled.missing(values)
+        if open_placeholders:
+            section_request += "\nOpen placeholders: " + ", ".join(open_placeholders)
+        builder.add(PromptSegment.SECTION, "section", section_request, heading="SECTION TO DRAFT")
+
+        section_facts = self._pack_section_facts(section, context.get("required_facts", {}))
+        if section_facts:
+            builder.add(PromptSegment.SECTION, "section_facts",
+                        render_json(section_facts), heading="SECTION FACTS")
+
+        # Documents are selected per section (relevance + token budget), so they
+        # sit after the cached case prefix
+        related_documents = [
+            {k: v for k, v in doc.items() if k != "url"}
+            for doc in context.get("related_documents", [])
+        ]
+        if related_documents:
+            builder.add(PromptSegment.SECTION, "document_summaries",
+                        render_json(related_documents), heading="DOCUMENT SUMMARIES")
+
+        if context.get("related_passages"):
+            builder.add(PromptSegment.SECTION, "document_passages", "\n\n".join(
+                f"[{format_passage_source(p)}]\n{p['text']}"
+                for p in context["related_passages"]
+            ), heading="RELEVANT DOCUMENT EXCERPTS")
+
+        if context.get("previous_sections"):
+            builder.add(PromptSegment.SECTION, "previous_sections", "\n".join(
+                f"- {sec.get('title', 'Unknown')}: {sec.get('content_excerpt', '')}"
+                for sec in context["previous_sections"]
+            ), heading="PREVIOUSLY DRAFTED SECTIONS")
+
+        if context.get("missing_facts"):
+            builder.add(PromptSegment.SECTION, "missing_facts", "\n".join(
+                f"- {fact['key']}: {fact.get('suggestion', '')}"
+                for fact in context["missing_facts"]
+            ), heading="MISSING FACTS (mark as [MISSING: key])")
+
+        if citations:
+            builder.add(PromptSegment.SECTION, "citations", "\n".join(
+                f"- {cit.text} ({cit.source})" for cit in citations
+            ), heading="AVAILABLE CITATIONS")
 
-        # Enhanced feedback inclusion for redrafts
         human_feedback = state.get("human_feedback")
         reviewer_feedback = state.get("human_readable_feedback")
 
@@ -152,191 +347,149 @@ class DraftWriter:
         print(f"     - Human feedback: {human_feedback[:100] if human_feedback else 'None'}...")
         print(f"     - Reviewer feedback: {reviewer_feedback[:100] if reviewer_feedback else 'None'}...")
 
-        # Build comprehensive feedback section
-        feedback_section = ""
         if reviewer_feedback:
-            feedback_section = f"""
-
-**🔴 CRITICAL REVIEWER FEEDBACK - MUST ADDRESS ALL POINTS:**
-{reviewer_feedback}
+            builder.add(PromptSegment.DYNAMIC, "reviewer_feedback", f"""{reviewer_feedback}
 
 **REDRAFT INSTRUCTIONS:**
 - Carefully read all reviewer feedback above
 - Address every issue and requirement mentioned
 - Fill ALL missing placeholders using the case data
 - Fix any content quality or legal compliance issues
-- Ensure the draft meets all specified standards
-"""
+- Ensure the draft meets all specified standards""", heading="🔴 CRITICAL REVIEWER FEEDBACK - MUST ADDRESS ALL POINTS")
 
         if human_feedback:
-            feedback_section += f"""
-
-**👤 HUMAN FEEDBACK - HIGHEST PRIORITY:**
-{human_feedback}
-"""
-
-        system_prompt = f"""You are an expert legal drafter specializing in Indian legal documents.
+            builder.add(PromptSegment.DYNAMIC, "human_feedback", f"""{human_feedback}
 
-TASK: Draft a legal document section based on the provided context.
+If human provided values above, use them INSTEAD OF registry values.
+Example: If human says "Court name - Delhi High Court", use "Delhi High Court" even if registry has different value.""",
+                        heading="👤 HUMAN FEEDBACK - HIGHEST PRIORITY")
 
-TEMPLATE CONTEXT:
-The user has selected a specific template.
-Template Content:
-{template_content}
+        builder.add(PromptSegment.DYNAMIC, "request", "Draft this section now:")
 
-Template Guidance (Description):
-{template_description}
+        return builder
 
-{feedback_section}
+    async def _stream_draft(self, messages: List[Any], section: Any, state: DraftState,
+                            thread_id: Optional[str] = None) -> Any:
         """
+        Consume the provider token stream.
 
-        # Prepare context for caching (static per case)
-        cache_context = {
-            "template": section.template_text,
-            "case_data": state.get("case_data", {}),
-            "template_data": state.get("template_data", {}), # Contains usageInstructions
-            "documents": state.get("documents", []),
-            "previous_sections": context["previous_sections"],
-            "required_facts": context["required_facts"],
-            "full_fact_registry": state.get("fact_registry", {})  # ADD THIS for context awareness
-        }
-
-        # Create section-specific query (NOT cached - changes per section)
-        citations_text = ""
-        if citations:
-            citations_text = "\n\nAvailable Citations:\n" + "\n".join([
-                f"- {cit.text} ({cit.source})"
-                for cit in citations
-            ])
-
-        missing_facts_text = ""
-        if context["missing_facts"]:
-            missing_facts_text = "\n\nMissing Facts (mark as [MISSING: key]):\n" + "\n".join([
-                f"- {fact['key']}: {fact.get('suggestion', '')}"
-                for fact in context["missing_facts"]
-            ])
-
-        feedback_text = ""
-        human_feedback = state.get("human_feedback")
-        reviewer_feedback = state.get("human_readable_feedback")
-
-        if human_feedback:
-             feedback_text += f"\n\n**CRITICAL INSTRUCTION FROM HUMAN (MUST FOLLOW)**:\n{human_feedback}\n"
-             # Explicit override instruction
-             feedback_text += "**HUMAN FEEDBACK PRIORITY**: If human provided values above, use them INSTEAD OF registry values.\n"
-             feedback_text += 'Example: If human says "Court name - Delhi High Court", use "Delhi High Court" even if registry has different value.\n'
-        
-        if reviewer_feedback and not human_feedback:
-             # Only show reviewer feedback if no direct human override, or show both? 
-             # Usually human feedback is "Fix X", which implies they saw the review.
-             # Let's show both contextually.
-             feedback_text += f"\n\n**Previous Reviewer Feedback**:\n{reviewer_feedback}\n"
-             
-        # Template Usage Instructions
-        template_data = state.get("template_data", {})
-        usage_instructions = template_data.get("usageInstructions")
-        if usage_instructions:
-            feedback_text += f"\n\n**TEMPLATE USAGE INSTRUCTIONS**:\n{usage_instructions}\n"
-
-        # Prepare available facts JSON for prompt
-        full_registry = state.get("fact_registry", {})
-        # Convert to simple dict of values
-        fact_values = {k: v.value if hasattr(v, 'value') else v for k, v in full_registry.items()}
-        
-        user_message = f"""**Complete Case Information:**
-{json.dumps(state.get("case_data", {}), indent=2)}
-
-**Document Summaries:**
-{json.dumps(state.get("document_summaries", {}), indent=2)}
-
-{feedback_section}
-
-**Section to Draft:**
-Title: {section.title}
-Template: {section.template_text}
-
-**Instructions:**
-1. Using the Complete Case Information above, fill ALL placeholders ({{variable}}, äävariableåå, etc.) in the section template
-2. Map case data intelligently:
-   - {{court_state}} → Extract state from jurisdiction/location data
-   - {{court_location}} → Use court name + jurisdiction
-   - {{case_number}} → Use the case number from case data
-   - {{case_year}} → Extract year from filing date
-   - {{petitioner_name}} → Use client name
-   - {{respondent_name}} → Use opposing party name
-3. Do NOT leave any placeholders unfilled - use the case data to determine appropriate values
-4. Address all reviewer feedback provided above
-5. Use formal Indian legal language appropriate for matrimonial disputes
-6. Integrate any citations naturally if provided
-7. Ensure content is legally accurate and complete
-
-Draft this section now:"""
+        - Publishes incremental previews (read by the workflow status endpoint)
+        - Runs structural checks on each chunk
+        - Cancels the stream once a critical structural defect is certain;
+          the partial draft then goes to the reviewer, which requests a redraft
+        """
+        monitor = StreamingStructureMonitor(drafting_config.WRITER_CANCEL_ON_UNFILLED_PLACEHOLDERS)
+        preview_key = f"draft_preview:{thread_id}" if thread_id else None
+        parts: List[str] = []
+        content_len = 0
+        last_published = 0
+        chunks = []
+
+        stream = self.llm.astream(messages, tenant_id=state.get("company_id"),
+                                  workflow_id=state.get("workflow_id", "unknown"),
+                                  section_idx=state.get("current_section_idx", 0))
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                text = chunk.content if isinstance(chunk.content, str) else "".join(
+                    block.get("text", "") for block in chunk.content if isinstance(block, dict)
+                )
+                if not text:
+                    continue
+                parts.append(text)
+                content_len += len(text)
+
+                if content_len - last_published >= drafting_config.WRITER_PREVIEW_INTERVAL_CHARS:
+                    content = "".join(parts)
+                    parts = [content]
+                    monitor.feed(content)
+                    last_published = content_len
+                    if preview_key:
+                        session_cache.set(preview_key, {
+                            "section_id": section.id,
+                            "section_title": section.title,
+                            "content": content,
+                            "unfilled_placeholders": monitor.unfilled_placeholders,
+                            "missing_keys": monitor.missing_keys,
+                            "complete": False
+                        }, ttl=drafting_config.CACHE_TTL_SECONDS)
+
+                    if monitor.should_cancel:
+                        print(f"  ✂️ Cancelling stream early: unfilled placeholders {monitor.unfilled_placeholders}")
+                        break
+        finally:
+            await stream.aclose()
+
+        content = "".join(parts)
+        monitor.feed(content)
+        if preview_key:
+            session_cache.set(preview_key, {
+                "section_id": section.id,
+                "section_title": section.title,
+                "content": content,
+                "unfilled_placeholders": monitor.unfilled_placeholders,
+                "missing_keys": monitor.missing_keys,
+                "complete": True
+            }, ttl=drafting_config.CACHE_TTL_SECONDS)
+
+        if not chunks:
+            return AIMessage(content="")
+        # Merge once, without content (already joined above), so usage metadata
+        # is combined in linear time; the message-shaped result keeps usage logging unchanged
+        for chunk in chunks:
+            chunk.content = ""
+        aggregate = functools.reduce(operator.add, chunks)
+        aggregate.content = content
+        return aggregate
+
+    def _pack_section_facts(self, section: Any, required_facts: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Values of the section's required facts, packed to the writer_facts budget.
 
-        # Create messages with optimal caching structure
-        messages = create_cached_messages_with_context(
-            system_prompt=system_prompt,
-            user_message=user_message,
-            context=cache_context,
-            cache_system=True,  # Cache the system prompt
-            cache_context=True  # Cache the case/template/docs context
+        Facts copied from case data and per-document specialist analyses are
+        skipped: both are already in the prompt (case data, document summaries).
+        """
+        query_terms = extract_terms(f"{section.title} {section.template_text}")
+        items = []
+        for key, fact in required_facts.items():
+            if (fact.get("source") or "").startswith("case_metadata"):
+                continue
+            if key.startswith("doc_") and key.endswith("_analysis"):
+                continue
+            text = f"{key}: {render_json(fact['value']) if isinstance(fact['value'], (dict, list)) else fact['value']}"
+            items.append(ContextItem(
+                key=key,
+                text=text,
+                score=relevance_score(query_terms, text, prior=0.2),
+                payload=fact["value"]
+            ))
+        packed = pack_for_agent("writer_facts", items)
+        return {item.key: item.payload for item in packed.selected}
+
+    def _is_boilerplate(self, section: Any, compiled: Any, fact_values: Dict[str, Any], state: DraftState) -> bool:
+        """
+        True when the section can be rendered without the LLM: its text is
+        taken verbatim from the template, has no [CITE]/[NARRATIVE] markers
+        or law lookups, and every placeholder and condition has a registry value. Only the
+        first attempt qualifies; redrafts go through the writer.
+        """
+        template_text = section.template_text.strip()
+        return (
+            drafting_config.WRITER_SKIP_BOILERPLATE
+            and state.get("section_redraft_count", 0) == 0
+            and bool(template_text)
+            and template_text in (state.get("template_content") or "")
+            and compiled.is_deterministic
+            and not section.required_laws
+            and not compiled.missing(fact_values)
+            and all(fact_values.get(key) is not None for key in compiled.conditions)
         )
 
-        # Invoke LLM (will use cached content if available within 5-minute window)
-        start_time = time.time()
-        response = await self.llm.ainvoke(messages)
-        duration_ms = int((time.time() - start_time) * 1000)
-
-        # Extract draft content
-        draft_content = response.content if hasattr(response, 'content') else str(response)
-
-        # Log LLM call with performance metrics
-        workflow_id = state.get("workflow_id", "unknown")
-        section_idx = state.get("current_section_idx", 0)
-
-        if hasattr(response, 'usage_metadata'):
-            usage = response.usage_metadata
-            cache_read = usage.get('cache_read_input_tokens', 0)
-            cache_create = usage.get('cache_creation_input_tokens', 0)
-            input_tokens = usage.get('input_tokens', 0)
-            output_tokens = usage.get('output_tokens', 0)
-
-            from app.core.config import settings
-            drafting_logger.log_llm_call(
-                workflow_id=workflow_id,
-                agent_name="writer",
-                model=settings.LLM_MODEL,
-                prompt_tokens=input_tokens,
-                completion_tokens=output_tokens,
-                total_tokens=input_tokens + output_tokens,
-                cache_read_tokens=cache_read,
-                cache_write_tokens=cache_create,
-                duration_ms=duration_ms,
-                section_idx=section_idx
-            )
-
-            if cache_read > 0:
-                print(f"  ✓ Cache HIT: {cache_read} tokens read from cache (90% savings)")
-            elif cache_create > 0:
-                print(f"  ⚡ Cache MISS: {cache_create} tokens written to cache (available for 5 minutes)")
-
-            print(f"  📊 Tokens: {input_tokens} input, {output_tokens} output")
-
-        return draft_content
-
     def _fill_placeholders(self, template: str, facts: Dict[str, Any]) -> Dict[str, str]:
         """
         Track which placeholders were filled with what values.
         """
-        filled = {}
-        placeholders = re.findall(r'\{(\w+)\}', template)
-
-        for placeholder in placeholders:
-            if placeholder in facts:
-                filled[placeholder] = str(facts[placeholder]["value"])
-            else:
-                filled[placeholder] = f"[MISSING]"
-
-        return filled
+        return compile_template(template).fill_map({key: fact["value"] for key, fact in facts.items()})
 
 # Helper with caching
 from app.agents.workflows.drafting.cache import cache_prompt
@@ -355,6 +508,7 @@ def load_drafting_prompt(filename: str) -> str:
 def get_writer_agent():
     return DraftWriter()
 
-async def writer_node(state: DraftState):
+async def writer_node(state: DraftState, config: RunnableConfig):
     agent = get_writer_agent()
-    return await agent.write_section(state)
+    thread_id = (config or {}).get("configurable", {}).get("thread_id")
+    return await agent.write_section(state, thread_id=thread_id)
@@ -0,0 +1,100 @@
+"""
+Document chunking for map-reduce summarization.
+
+Long documents are split at structural boundaries (headings, annexures,
+numbered paragraphs) and the pieces are packed greedily into chunks of at
+most `max_chars`, so each chunk is a coherent run of the document.
+"""
+
+import re
+from typing import List
+
+# Lines that usually start a new logical part of an Indian legal document
+HEADING_PATTERN = re.compile(
+    r"^\s*("
+    r"(ANNEXURE|ANNEX|EXHIBIT|SCHEDULE|APPENDIX|ARTICLE|SECTION|CHAPTER|PART|ORDER|INDEX)\b.*"
+    r"|(Page|PAGE)\s+\d+.*"
+    r"|\d{1,3}[.)]\s+[A-Z].*"
+    r"|[A-Z][A-Z0-9 ,.'&()/-]{6,80}"
+    r")\s*$"
+)
+
+
+def split_into_sections(text: str) -> List[str]:
+    """Split text at heading-like lines (the heading starts the new section)."""
+    sections, current = [], []
+    for line in text.splitlines():
+        if current and HEADING_PATTERN.match(line):
+            sections.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current))
+    return [s for s in sections if s.strip()]
+
+
+def _split_oversized(section: str, max_chars: int) -> List[str]:
+    """Split a section longer than max_chars on line (or hard) boundaries."""
+    pieces, current, size = [], [], 0
+    for line in section.splitlines():
+        while len(line) > max_chars:
+            if current:
+                pieces.append("\n".join(current))
+                current, size = [], 0
+            pieces.append(line[:max_chars])
+            line = line[max_chars:]
+        if size + len(line) + 1 > max_chars and current:
+            pieces.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def chunk_document(text: str, max_chars: int) -> List[str]:
+    """
+    Pack structural sections into chunks of at most max_chars.
+
+    Returns:
+        Ordered list of chunks covering the whole text
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks, current, size = [], [], 0
+    for section in split_into_sections(text):
+        parts = _split_oversized(section, max_chars) if len(section) > max_chars else [section]
+        for part in parts:
+            if size + len(part) + 1 > max_chars and current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            current.append(part)
+            size += len(part) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def document_head(text: str, max_chars: int) -> str:
+    """
+    Opening of the document plus later headings, for classification.
+
+    The first pages usually identify the document type; the heading outline
+    reveals bundles (several annexed documents) that the head alone would miss.
+    """
+    if len(text) <= max_chars:
+        return text
+    head = text[: max_chars * 3 // 4]
+    outline, budget = [], max_chars - len(head)
+    for line in text[len(head):].splitlines():
+        if HEADING_PATTERN.match(line):
+            line = line.strip()[:120]
+            if budget - len(line) - 1 < 0:
+                break
+            outline.append(line)
+            budget -= len(line) + 1
+    if outline:
+        head += "\n\n[... document continues; later headings ...]\n" + "\n".join(outline)
+    return head
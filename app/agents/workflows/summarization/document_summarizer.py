@@ -1,11 +1,19 @@
 from typing import TypedDict, Optional, Literal, Dict, Any
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_anthropic import ChatAnthropic
+from app.agents.workflows.drafting.llm_utils import create_cached_llm
+from app.agents.workflows.drafting.scheduler import Priority
+from app.agents.workflows.summarization.chunking import chunk_document, document_head
 from app.core.config import settings
+from typing import List
+from functools import lru_cache
+import asyncio
+import hashlib
 import json
 import os
 
+MODEL = "claude-sonnet-4-20250514"
+
 # Define Agent State
 class DocumentAnalysisState(TypedDict):
     document_text: str
@@ -16,16 +24,23 @@ class DocumentAnalysisState(TypedDict):
     specialist_analysis: Optional[str] # Output from Specialist
     final_advice: Optional[str] # Output from Strategist
     is_bundle: bool
+    # Stage results from a previous analysis ({stage: {"key", "output"}}); nodes
+    # reuse an entry when its key matches and write back the ones they re-run
+    stages: Dict[str, Any]
 
 # Initialize LLM (Lazy Load helper)
-def get_llm():
+def get_llm(agent_name: Optional[str] = None):
     if not settings.ANTHROPIC_API_KEY:
         print("⚠️ WARNING: ANTHROPIC_API_KEY not found. Agent will fail.")
         return None
-    return ChatAnthropic(
-        model="claude-sonnet-4-20250514", 
+    # Shared client from the registry (built once, reused across nodes and documents).
+    # agent_name drives response-cache opt-in, so re-uploads skip identical calls.
+    return create_cached_llm(
+        model=MODEL,
         temperature=0.0, # Low temp for extraction
-        api_key=settings.ANTHROPIC_API_KEY
+        provider="anthropic",
+        priority=Priority.BACKGROUND,
+        agent_name=agent_name
     )
 
 def load_prompt(filename: str) -> str:
@@ -36,12 +51,118 @@ def load_prompt(filename: str) -> str:
     except FileNotFoundError:
         return f"Error: Prompt {filename} not found."
 
+@lru_cache(maxsize=None)
+def prompt_version(filename: str) -> str:
+    """Short hash of a prompt file, so edited prompts invalidate cached stage results."""
+    return hashlib.sha256(load_prompt(filename).encode("utf-8")).hexdigest()[:16]
+
+def _stage_key(*parts) -> str:
+    from app.services.lib.document_artefacts import stage_key
+    return stage_key(MODEL, *parts)
+
+def _cached_stage(state: DocumentAnalysisState, stage: str, key: str) -> Optional[Dict[str, Any]]:
+    entry = (state.get("stages") or {}).get(stage)
+    return entry["output"] if entry and entry.get("key") == key else None
+
+def _record_stage(state: DocumentAnalysisState, stage: str, key: str, output: Dict[str, Any]) -> Dict[str, Any]:
+    return {**output, "stages": {**(state.get("stages") or {}), stage: {"key": key, "output": output}}}
+
+def _response_text(response) -> str:
+    content = response.content
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return content
+
+def _is_long(document_text: str) -> bool:
+    return len(document_text) > settings.SUMMARIZER_SINGLE_PASS_CHARS
+
+async def _extract_notes(llm, parts: List[str], labels: List[str], specialist_instruction: str) -> List[str]:
+    """Map step: pull report-relevant facts out of each part, in parallel."""
+    map_prompt = load_prompt("chunk_map")
+    # Identical prefix on every call, so the instructions are cached after the first part
+    instructions = f"{map_prompt}\n\nFINAL REPORT INSTRUCTIONS (for relevance only):\n{specialist_instruction}"
+
+    semaphore = asyncio.Semaphore(max(1, settings.SUMMARIZER_MAX_PARALLEL))
+
+    async def _map(index: int) -> str:
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": instructions, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": f"\n\n{labels[index]}:\n\n{parts[index]}"}
+                ]
+            }
+        ]
+        async with semaphore:
+            return _response_text(await llm.ainvoke(messages))
+
+    return list(await asyncio.gather(*(_map(i) for i in range(len(parts)))))
+
+async def _map_reduce_analysis(llm, document_text: str, specialist_instruction: str) -> str:
+    """
+    Specialist analysis for documents too long for one call.
+
+    Map: chunks are summarised into notes concurrently (bounded by a semaphore;
+    the LLM scheduler still applies its own per-model limits).
+    Reduce: notes are condensed in parallel rounds until they fit one call,
+    then the specialist report is written from them.
+    """
+    chunks = chunk_document(document_text, settings.SUMMARIZER_CHUNK_CHARS)
+    total = len(chunks)
+    print(f"🧩 Map-reduce: {len(document_text)} chars in {total} chunks "
+          f"(parallelism {settings.SUMMARIZER_MAX_PARALLEL})")
+
+    notes = await _extract_notes(
+        llm, chunks, [f"Document Part {i + 1} of {total}" for i in range(total)], specialist_instruction
+    )
+    notes = [f"[Part {i + 1}/{total}]\n{note.strip()}" for i, note in enumerate(notes)]
+
+    # Condense rounds (rare: only for very large bundles)
+    for _ in range(3):
+        if len(notes) <= 1 or len("\n\n".join(notes)) <= settings.SUMMARIZER_SINGLE_PASS_CHARS:
+            break
+        groups: List[str] = []
+        for note in notes:
+            if groups and len(groups[-1]) + len(note) + 2 <= settings.SUMMARIZER_CHUNK_CHARS:
+                groups[-1] += "\n\n" + note
+            else:
+                groups.append(note)
+        print(f"🧩 Condensing {len(notes)} notes into {len(groups)} groups")
+        condensed = await _extract_notes(
+            llm, groups, [f"Notes group {i + 1} of {len(groups)}" for i in range(len(groups))], specialist_instruction
+        )
+        notes = [f"[Notes group {i + 1}/{len(groups)}]\n{note.strip()}" for i, note in enumerate(condensed)]
+
+    reduce_prompt = load_prompt("chunk_reduce")
+    messages = [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": "Notes from all parts of the document:\n\n" + "\n\n".join(notes)},
+                {"type": "text", "text": f"\n\n{reduce_prompt}\n\nINSTRUCTIONS:\n{specialist_instruction}"}
+            ]
+        }
+    ]
+    return _response_text(await llm.ainvoke(messages))
+
 # --- NODES ---
 
-def router_node(state: DocumentAnalysisState):
+async def router_node(state: DocumentAnalysisState):
     """Step 1: Classify document"""
+    # Long documents are classified from their opening pages and heading outline
+    document_text = state['document_text']
+    if _is_long(document_text):
+        document_text = document_head(document_text, settings.SUMMARIZER_ROUTER_HEAD_CHARS)
+
+    key = _stage_key("router", prompt_version("router"), document_text)
+    cached = _cached_stage(state, "router", key)
+    if cached:
+        print("♻️ Router: Reusing previous classification")
+        return cached
+
     print("🚦 Router: Classifying document...")
-    llm = get_llm()
+    llm = get_llm("document_router")
     if not llm:
         return {"category": "D", "doc_type": "Error", "scan_quality": "Low"}
         
@@ -58,7 +179,7 @@ def router_node(state: DocumentAnalysisState):
             "content": [
                 {
                     "type": "text",
-                    "text": f"Document Text:\n\n{state['document_text']}",
+                    "text": f"Document Text:\n\n{document_text}",
                     "cache_control": {"type": "ephemeral"}
                 },
                 {
@@ -69,7 +190,7 @@ def router_node(state: DocumentAnalysisState):
         }
     ]
     
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
     content = response.content
     
     # Parse JSON
@@ -81,20 +202,19 @@ def router_node(state: DocumentAnalysisState):
         if category not in ["A", "B", "C", "D"]:
             category = "D"
             
-        return {
+        return _record_stage(state, "router", key, {
             "category": category,
             "doc_type": data.get("doc_type"),
             "scan_quality": data.get("scan_quality"),
             "is_bundle": str(data.get("is_bundle")).lower() == "true"
-        }
+        })
     except Exception as e:
         print(f"Router Parse Error: {e}")
         return {"category": "D", "doc_type": "Unknown", "scan_quality": "Unknown"}
 
-def specialist_node(state: DocumentAnalysisState):
+async def specialist_node(state: DocumentAnalysisState):
     """Step 2: Deep Extraction based on category"""
     category = state.get("category", "D")
-    print(f"🕵️ Specialist {category}: Analyzing...")
     
     prompt_map = {
         "A": "specialist_a",
@@ -104,11 +224,32 @@ def specialist_node(state: DocumentAnalysisState):
     }
     
     prompt_file = prompt_map.get(category, "specialist_d")
+    is_long = _is_long(state['document_text'])
+    if is_long:
+        versions = (prompt_version(prompt_file), prompt_version("chunk_map"), prompt_version("chunk_reduce"),
+                    settings.SUMMARIZER_CHUNK_CHARS)
+    else:
+        versions = (prompt_version(prompt_file),)
+    key = _stage_key("specialist", category, *versions, state['document_text'])
+    cached = _cached_stage(state, "specialist", key)
+    if cached:
+        print(f"♻️ Specialist {category}: Reusing previous analysis")
+        return cached
+
+    print(f"🕵️ Specialist {category}: Analyzing...")
     specialist_instruction = load_prompt(prompt_file)
     
-    llm = get_llm()
+    llm = get_llm("document_specialist")
     if not llm:
         return {"specialist_analysis": "Error: AI not available."}
+
+    if is_long:
+        analysis = await _map_reduce_analysis(llm, state['document_text'], specialist_instruction)
+        print(f"✅ Specialist {category} Finished (map-reduce).")
+        return _record_stage(state, "specialist", key, {
+            "specialist_analysis": analysis,
+            "final_advice": analysis
+        })
         
     # Reuses the exact same Document Block structure as Router to hit Cache
     messages = [
@@ -128,16 +269,17 @@ def specialist_node(state: DocumentAnalysisState):
         }
     ]
     
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
     print(f"✅ Specialist {category} Finished.")
     
     # In merged mode, the Specialist Output IS the Final Advice
-    return {
+    return _record_stage(state, "specialist", key, {
         "specialist_analysis": response.content,
         "final_advice": response.content # Duplicate to satisfy schema
-    }
+    })
 
 # --- GRAPH BUILD ---
+# Nodes are async: run the graph with `await doc_analysis_app.ainvoke(...)`
 
 workflow = StateGraph(DocumentAnalysisState)
 
@@ -0,0 +1,151 @@
+"""
+Template Sample Loader
+Fetches and extracts the sample documents a template is built from.
+
+Samples are downloaded concurrently (boto3 in threads, bounded by
+settings.TEMPLATE_SAMPLE_CONCURRENCY) and parsed in the shared extraction
+process pool. The prompt block is assembled in sample order; once it reaches
+MAX_TOTAL_CHARS the remaining samples are cancelled. Extracted text is kept
+in a small per-process LRU keyed by S3 key, so revision rounds on the same
+samples skip the download and parse.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import urllib.parse
+from collections import OrderedDict
+from typing import List, Optional
+
+from app.core.config import settings
+
+MAX_TOTAL_CHARS = 100000
+
+
+class SampleTextCache:
+    """Bounded LRU of extracted sample text, keyed by S3 key."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, s3_key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(s3_key)
+            if text is not None:
+                self._entries.move_to_end(s3_key)
+            return text
+
+    def put(self, s3_key: str, text: str):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            # Nothing past the prompt budget is ever used
+            self._entries[s3_key] = text[:MAX_TOTAL_CHARS]
+            self._entries.move_to_end(s3_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+sample_text_cache = SampleTextCache(settings.TEMPLATE_SAMPLE_CACHE_SIZE)
+
+
+async def _extract_sample(s3_key: str, filename: str) -> str:
+    """Download one sample to disk and extract its text (placeholder text if unsupported or empty)."""
+    from app.infrastructure.aws.s3_client import S3Client
+    from app.services.lib.document_processor import DocumentProcessor
+    from app.services.lib.document_processor.extraction_pool import get_extraction_pool
+
+    with tempfile.TemporaryDirectory(prefix="sample-") as spool_dir:
+        path = os.path.join(spool_dir, "source" + os.path.splitext(filename)[1])
+        if not await asyncio.to_thread(S3Client().download_to_file, s3_key, path):
+            raise IOError("download failed")
+
+        pool = get_extraction_pool()
+        if pool.enabled:
+            result = await pool.process_document(path, filename)
+        else:
+            result = await asyncio.to_thread(DocumentProcessor().process_document, path, filename)
+
+    format_info = result.get("format", {})
+    print(f"    🔍 {filename}: format {format_info.get('format_type', 'unknown')}, "
+          f"supported {result.get('supported', False)}, scanned {format_info.get('is_scanned', False)}, "
+          f"quality {result.get('quality_score', 0.0)}")
+
+    text = result.get("text", "")
+    if result.get("supported", False):
+        print(f"    ✓ Extracted {len(text)} chars from {filename}")
+    else:
+        print(f"    ⚠️ Format not fully supported: {result.get('error_message', 'Unknown error')}")
+        if not text.strip():
+            text = f"[Unsupported format: {format_info.get('format_type', 'unknown')} - {result.get('error_message', '')}]"
+
+    if not text.strip():
+        print(f"    ⚠️ Warning: Extracted text is empty ({filename})")
+        text = "[Empty Document]"
+    return text
+
+
+async def _load_sample(s3_key: str, filename: str, semaphore: asyncio.Semaphore) -> str:
+    cached = sample_text_cache.get(s3_key)
+    if cached is not None:
+        print(f"  ♻️ Sample text cached: {s3_key}")
+        return cached
+
+    async with semaphore:
+        print(f"  📥 Processing sample: {s3_key}")
+        try:
+            text = await _extract_sample(s3_key, filename)
+        except Exception as e:
+            print(f"    ❌ Error reading file {s3_key}: {e}")
+            # Errors are not cached, so the next revision retries
+            return f"[Error reading file (Key: {s3_key}): {str(e)}]"
+
+    sample_text_cache.put(s3_key, text)
+    return text
+
+
+async def build_samples_block(sample_docs: List[str], max_chars: int = MAX_TOTAL_CHARS) -> str:
+    """
+    The "Analyze these uploaded sample documents" prompt block.
+
+    Samples are fetched concurrently but appended in their original order,
+    truncating at max_chars; samples past the budget are cancelled.
+    """
+    samples = []
+    for i, raw_s3_key in enumerate(sample_docs, 1):
+        if raw_s3_key:
+            # Handle potential encoding issues
+            s3_key = urllib.parse.unquote(raw_s3_key)
+            samples.append((i, s3_key, s3_key.split('/')[-1].lower()))
+
+    semaphore = asyncio.Semaphore(max(1, settings.TEMPLATE_SAMPLE_CONCURRENCY))
+    tasks = [asyncio.create_task(_load_sample(s3_key, filename, semaphore)) for _, s3_key, filename in samples]
+
+    samples_block = "Analyze these uploaded sample documents:\n\n"
+    current_chars = 0
+    try:
+        for (i, _, filename), task in zip(samples, tasks):
+            text = await task
+            header = f"--- DOCUMENT {i}: {filename} ---\n"
+            if current_chars + len(text) > max_chars:
+                valid_len = max_chars - current_chars
+                samples_block += f"{header}{text[:valid_len]}...[TRUNCATED]\n\n"
+                print(f"    ⚠️ Truncated output (limit reached)")
+                break
+
+            samples_block += f"{header}{text}\n\n"
+            current_chars += len(text) + len(header)
+    finally:
+        # Early stop (or failure): samples past the budget are not needed
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            print(f"  ⏭️ Cancelled {len(pending)} remaining samples")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    print(f"  Note: Total context size: {current_chars} chars")
+    return samples_block
@@ -18,6 +18,7 @@ class LegalWorkflowState(TypedDict):
     # Workflow Control
     status: str # "processing", "awaiting_attorney_review", "completed", "error"
     current_step: str
+    error: Optional[str]
     
     # Feedback Loop
     attorney_feedback: Optional[str]
@@ -1,9 +1,10 @@
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
-from langchain_anthropic import ChatAnthropic
+from app.agents.workflows.drafting.llm_pool import llm_registry
 from langchain_core.messages import HumanMessage, SystemMessage
 from app.agents.workflows.templates.state import LegalWorkflowState
 from app.core.config import settings
+import asyncio
 import os
 
 # Helper to get LLM client lazily
@@ -12,10 +13,11 @@ def get_llm():
         print("⚠️ WARNING: ANTHROPIC_API_KEY not found. Agent will fail unless in simulation mode.")
         return None
         
-    return ChatAnthropic(
-        model="claude-sonnet-4-20250514", 
-        temperature=0.2,
-        api_key=settings.ANTHROPIC_API_KEY
+    # Shared client from the registry (built once, reused across revisions)
+    return llm_registry.get_client(
+        "anthropic",
+        "claude-sonnet-4-20250514",
+        temperature=0.2
     )
 
 def load_system_prompt():
@@ -26,15 +28,14 @@ def load_system_prompt():
     except FileNotFoundError:
         return "You are an expert legal drafter."
 
-def template_architect_agent(state: LegalWorkflowState):
+async def template_architect_agent(state: LegalWorkflowState):
     """Agent 1: Creates template from samples"""
     print("🔍 Template Architect analyzing samples...")
     
     # Mock Mode Check
     if state.get("is_simulation"):
         print("🤖 SIMULATION MODE: Returning mock response")
-        import time
-        time.sleep(2) # Simulate latency
+        await asyncio.sleep(2) # Simulate latency
         
         # Check if this is a revision (has feedback)
         if state.get("attorney_feedback"):
@@ -53,84 +54,10 @@ def template_architect_agent(state: LegalWorkflowState):
         }
     
     system_prompt = load_system_prompt()
-    
-    
-    from app.infrastructure.aws.s3_client import S3Client
-    from app.core.config import settings
-    import io
-    
-    # Initialize S3 Client
-    import urllib.parse
-    
-    # Initialize S3 Client
-    s3 = S3Client()
-    
-    MAX_TOTAL_CHARS = 100000 
-    current_chars = 0
-    
-    samples_block = "Analyze these uploaded sample documents:\n\n"
-    
-    for i, raw_s3_key in enumerate(state["sample_docs"], 1):
-        if not raw_s3_key:
-            continue
-            
-        # Handle potential encoding issues
-        s3_key = urllib.parse.unquote(raw_s3_key)
-        print(f"  📥 Processing Sample {i}: {s3_key}")
-        
-        filename = s3_key.split('/')[-1].lower()
-        text = ""
 
-        try:
-            # 1. Download from S3
-            response = s3.client.get_object(Bucket=settings.S3_BUCKET_NAME, Key=s3_key)
-            file_content = response['Body'].read()
-
-            # 2. Use DocumentProcessor for robust text extraction
-            from app.services.lib.document_processor import DocumentProcessor
-            processor = DocumentProcessor()
-            result = processor.process_document(file_content, filename)
-
-            # 3. Log format detection and extraction results
-            format_info = result.get("format", {})
-            print(f"    🔍 Format: {format_info.get('format_type', 'unknown')}")
-            print(f"    📋 Supported: {result.get('supported', False)}")
-            print(f"    📋 Scanned: {format_info.get('is_scanned', False)}")
-            print(f"    📊 Quality: {result.get('quality_score', 0.0)}")
-
-            # 4. Get extracted text
-            text = result.get("text", "")
-
-            if result.get("supported", False):
-                print(f"    ✓ Extracted {len(text)} chars using DocumentProcessor")
-                # Show text preview for debugging
-                text_preview = text[:300].replace('\n', ' ').replace('\r', ' ')
-                print(f"    📄 Text preview: {text_preview}...")
-            else:
-                print(f"    ⚠️ Format not fully supported: {result.get('error_message', 'Unknown error')}")
-                if not text.strip():
-                    text = f"[Unsupported format: {format_info.get('format_type', 'unknown')} - {result.get('error_message', '')}]"
-
-            if not text.strip():
-                 print("    ⚠️ Warning: Extracted text is empty")
-                 text = "[Empty Document]"
-
-        except Exception as e:
-            print(f"    ❌ Error reading file {s3_key}: {e}")
-            text = f"[Error reading file (Key: {s3_key}): {str(e)}]"
-
-        # 3. Append to block
-        header = f"--- DOCUMENT {i}: {filename} ---\n"
-        if current_chars + len(text) > MAX_TOTAL_CHARS:
-            valid_len = MAX_TOTAL_CHARS - current_chars
-            samples_block += f"{header}{text[:valid_len]}...[TRUNCATED]\n\n"
-            print(f"    ⚠️ Truncated output (limit reached)")
-            break
-        
-        samples_block += f"{header}{text}\n\n"
-        current_chars += len(text) + len(header)
-    
-    print(f"  Note: Total context size: {current_chars} chars")
+    # Samples are fetched and extracted concurrently, stopping at the prompt budget
+    from app.agents.workflows.templates.samples import build_samples_block
+    samples_block = await build_samples_block(state["sample_docs"])
 
     messages = [
         {
@@ -174,7 +101,7 @@ def template_architect_agent(state: LegalWorkflowState):
             "revision_summary": "Failed: API Key missing."
         }
 
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
     content = response.content
     
     # Check if we need to parse XML (only if revision was requested, or if LLM decided to use it)
@@ -267,6 +194,7 @@ workflow.add_edge("variable_collector", "document_drafter")
 workflow.add_edge("document_drafter", END)
 
 # Compile with checkpointing
+# The architect node is async: run the graph with `astream`/`ainvoke`
 memory = MemorySaver()
 agent_app = workflow.compile(
     checkpointer=memory,
@@ -28,6 +28,7 @@ class WorkflowResponse(BaseModel):
     current_node: str
     next_node: Optional[str]
     current_state: Dict[str, Any]
+    live_preview: Optional[Dict[str, Any]] = None # Streaming writer output for the section in progress
 
 class WorkflowResumeRequest(BaseModel):
     human_verdict: str # "approve", "reject", "refine"
@@ -100,6 +101,14 @@ async def start_workflow(request: WorkflowStartRequest, background_tasks: Backgr
         current_state=initial_state
     )
 
+@router.get("/metrics/llm")
+async def get_llm_metrics():
+    """
+    Shared LLM client pool and scheduler metrics for this process.
+    """
+    from app.agents.workflows.drafting.llm_pool import get_llm_pool_stats
+    return get_llm_pool_stats()
+
 @router.get("/{thread_id}/status", response_model=WorkflowResponse)
 async def get_workflow_status(thread_id: str):
     """
@@ -144,12 +153,17 @@ async def get_workflow_status(thread_id: str):
     elif "human_review" in next_node_str or "AgentNode.HUMAN" in next_node_str:
         status = "interrupted_for_human"
     
+    # Partial section text while the writer is still streaming
+    from app.agents.workflows.drafting.writer import get_live_preview
+    live_preview = get_live_preview(thread_id) if status == "running" else None
+
     return WorkflowResponse(
         thread_id=thread_id,
         status=status,
         current_node=next_node_str, # Use cleaned string
         next_node=next_node_str,
-        current_state=values
+        current_state=values,
+        live_preview=live_preview
     )
 
 @router.post("/{thread_id}/resume", response_model=WorkflowResponse)
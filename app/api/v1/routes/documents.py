@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File
 from typing import List, Dict, Any
 from app.services.core.document_service import DocumentService
-from app.api.v1.schemas.document import Document, DocumentCreate
+from app.api.v1.schemas.document import Document, DocumentCreate, BulkUploadRequest, BulkAnalyzeRequest, IngestionJob
+from app.services.core.ingestion_service import IngestionService
 from app.services.lib.document_processor import DocumentProcessor
 
 router = APIRouter()
@@ -9,6 +10,9 @@ router = APIRouter()
 def get_document_service():
     return DocumentService()
 
+def get_ingestion_service():
+    return IngestionService()
+
 from app.api.v1.dependencies import verify_company_access
 from fastapi import Header
 
@@ -64,7 +68,7 @@ def confirm_upload(
         raise HTTPException(status_code=404, detail="Document not found")
         
     if doc.aiStatus == "queued":
-        background_tasks.add_task(service.analyze_document, document_id)
+        background_tasks.add_task(service.analyze_document_async, document_id, "Unknown", x_company_id)
         return {"status": "processing_queued"}
         
     return {"status": "ok"}
@@ -80,5 +84,42 @@ def trigger_analysis(
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    background_tasks.add_task(service.analyze_document, document_id)
+    background_tasks.add_task(service.analyze_document_async, document_id, "Unknown", x_company_id)
     return {"status": "processing_started"}
+
+# Bulk ingestion: presign a whole case bundle, then analyse it as one job
+@router.post("/companies/{company_id}/documents/bulk-upload-urls", response_model=Dict[str, Any], dependencies=[Depends(verify_company_access)])
+def create_bulk_upload_urls(
+    company_id: str,
+    request: BulkUploadRequest,
+    service: DocumentService = Depends(get_document_service)
+):
+    try:
+        results = service.create_document_urls(company_id, request.documents)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "documents": [{"document": doc, "uploadUrl": upload_url} for doc, upload_url in results]
+    }
+
+@router.post("/companies/{company_id}/documents/bulk-analyze", response_model=IngestionJob, dependencies=[Depends(verify_company_access)])
+def start_bulk_analysis(
+    company_id: str,
+    request: BulkAnalyzeRequest,
+    background_tasks: BackgroundTasks,
+    ingestion: IngestionService = Depends(get_ingestion_service)
+):
+    job = ingestion.create_job(company_id, request.documentIds)
+    background_tasks.add_task(ingestion.run_job, job.jobId, request.clientPosition)
+    return job
+
+@router.get("/companies/{company_id}/documents/ingestion-jobs/{job_id}", response_model=IngestionJob, dependencies=[Depends(verify_company_access)])
+def get_ingestion_job(
+    company_id: str,
+    job_id: str,
+    ingestion: IngestionService = Depends(get_ingestion_service)
+):
+    job = ingestion.get_job(company_id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found")
+    return job
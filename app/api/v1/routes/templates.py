@@ -85,13 +85,24 @@ def generate_template(
 
 from app.agents.workflows.templates.template_architect import agent_app
 from app.api.v1.schemas.template import WorkflowStartRequest, WorkflowReviewRequest
+from fastapi import BackgroundTasks
 import uuid
 
+# Threads with a graph run in progress (this process)
+_running_threads = set()
+
 @router.post("/ai/workflow/start")
-def start_workflow(
+async def start_workflow(
     request: WorkflowStartRequest,
-    service: TemplateService = Depends(get_template_service)
+    background_tasks: BackgroundTasks
 ):
+    """
+    Start the template architect workflow.
+
+    Returns immediately; sample analysis and the template LLM call run as a
+    background task. Poll GET /ai/workflow/{thread_id} until the status is
+    "awaiting_attorney_review".
+    """
     thread_id = str(uuid.uuid4())
     config = {"configurable": {"thread_id": thread_id}}
     
@@ -103,22 +114,22 @@ def start_workflow(
         "is_simulation": request.is_simulation or False
     }
     
-    # Start the workflow
-    # Use invoke mostly, but stream could be better for long running. 
-    # For now we invoke to get to the first checkpoint.
-    result = agent_app.invoke(initial_state, config)
+    await agent_app.aupdate_state(config, initial_state)
+    _running_threads.add(thread_id)
+    background_tasks.add_task(run_architect_until_interrupt, config)
     
     return {
         "threadId": thread_id,
-        "status": result.get("status"),
-        "currentStep": result.get("current_step"),
-        "template": result.get("template")
+        "status": initial_state["status"],
+        "currentStep": initial_state["current_step"],
+        "template": None,
+        "running": True
     }
 
 @router.get("/ai/workflow/{thread_id}")
-def get_workflow_status(thread_id: str):
+async def get_workflow_status(thread_id: str):
     config = {"configurable": {"thread_id": thread_id}}
-    state = agent_app.get_state(config)
+    state = await agent_app.aget_state(config)
     
     if not state.values:
          raise HTTPException(status_code=404, detail="Workflow not found")
@@ -128,31 +139,58 @@ def get_workflow_status(thread_id: str):
         "status": state.values.get("status"),
         "currentStep": state.values.get("current_step"),
         "template": state.values.get("template"),
-        "template": state.values.get("template"),
         "attorneyFeedback": state.values.get("attorney_feedback"),
-        "revisionSummary": state.values.get("revision_summary")
+        "revisionSummary": state.values.get("revision_summary"),
+        "finalDocument": state.values.get("final_document"),
+        "error": state.values.get("error"),
+        "running": thread_id in _running_threads
     }
 
 @router.post("/ai/workflow/{thread_id}/review")
-def review_workflow(
+async def review_workflow(
     thread_id: str,
-    review: WorkflowReviewRequest
+    review: WorkflowReviewRequest,
+    background_tasks: BackgroundTasks
 ):
+    """Record the attorney's review and resume the workflow in the background."""
     config = {"configurable": {"thread_id": thread_id}}
+    if thread_id in _running_threads:
+        raise HTTPException(status_code=409, detail="Workflow is still running")
+
+    state = await agent_app.aget_state(config)
+    if not state.values:
+         raise HTTPException(status_code=404, detail="Workflow not found")
     
     # Update state with approval
-    agent_app.update_state(config, {
+    await agent_app.aupdate_state(config, {
         "template_approved": review.approved,
-        "attorney_feedback": review.feedback
+        "attorney_feedback": review.feedback,
+        "status": "processing",
+        "current_step": "variable_collector" if review.approved else "template_architect",
+        "error": None
     })
     
-    # Resume workflow
-    # We pass None as input because we just updated state
-    result = agent_app.invoke(None, config)
+    # Resume workflow (state is already updated, so the run starts from None)
+    _running_threads.add(thread_id)
+    background_tasks.add_task(run_architect_until_interrupt, config)
     
-    return {
-        "threadId": thread_id,
-        "status": result.get("status"),
-        "currentStep": result.get("current_step"),
-        "finalDocument": result.get("final_document")
-    }
+    return await get_workflow_status(thread_id)
+
+
+async def run_architect_until_interrupt(config):
+    """
+    Drain the graph until it pauses for attorney review or finishes.
+    """
+    thread_id = config["configurable"]["thread_id"]
+    try:
+        async for _ in agent_app.astream(None, config=config):
+            pass
+    except Exception as e:
+        print(f"❌ Template workflow {thread_id} failed: {e}")
+        # Save error to state so the UI stops polling
+        try:
+            await agent_app.aupdate_state(config, {"status": "error", "error": str(e)})
+        except Exception as update_err:
+            print(f"⚠️ Failed to save template workflow error: {update_err}")
+    finally:
+        _running_threads.discard(thread_id)
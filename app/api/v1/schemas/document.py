@@ -32,7 +32,37 @@ class Document(DocumentBase):
     aiSummary: Optional[str] = None
     aiConfidence: Optional[float] = None
     extractedData: Optional[Dict[str, Any]] = None
+    contentHash: Optional[str] = None  # sha256 of the uploaded file
+    sourceETag: Optional[str] = None  # S3 ETag of the file that was last analysed
 
     uploadedBy: Optional[str] = None
     createdAt: str
     updatedAt: str
+
+# Bulk ingestion
+class BulkUploadRequest(BaseModel):
+    documents: List[DocumentCreate] = Field(..., min_length=1, max_length=100)
+
+class BulkAnalyzeRequest(BaseModel):
+    documentIds: List[str] = Field(..., min_length=1, max_length=100)
+    clientPosition: str = "Unknown"
+
+class IngestionDocumentStatus(BaseModel):
+    documentId: str
+    status: str = "queued"  # queued | running | completed | failed
+    stage: Optional[str] = None  # downloading | extracting | summarizing | indexing
+    error: Optional[str] = None
+    startedAt: Optional[str] = None
+    finishedAt: Optional[str] = None
+
+class IngestionJob(BaseModel):
+    jobId: str
+    companyId: str
+    status: str = "queued"  # queued | running | completed | completed_with_errors
+    total: int
+    completed: int = 0
+    failed: int = 0
+    progress: float = 0.0
+    documents: List[IngestionDocumentStatus]
+    createdAt: str
+    updatedAt: str
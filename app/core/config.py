@@ -16,6 +16,7 @@ class Settings(BaseSettings):
     DYNAMODB_TABLE_DOCUMENTS: str = "chambers-iq-beta-documents"
     DYNAMODB_TABLE_TEMPLATES: str = "chambers-iq-beta-templates"
     DYNAMODB_TABLE_DRAFTS: str = "chambers-iq-beta-drafts"
+    DYNAMODB_TABLE_LLM_CACHE: str = "chambers-iq-beta-llm-cache"
     
     # S3 Bucket
     S3_BUCKET_NAME: str
@@ -34,6 +35,43 @@ class Settings(BaseSettings):
     # "claude-3-5-haiku-20241022" - Fast & cheap for simple tasks
 
 
+    # Document Index (per-case passage retrieval, see services/lib/document_index)
+    DOCUMENT_INDEX_ENABLED: bool = True
+    DOCUMENT_INDEX_EMBEDDER: str = "auto" # "auto", "hashed", "sentence-transformers"
+    DOCUMENT_INDEX_MODEL: str = "all-MiniLM-L6-v2" # Local CPU model when sentence-transformers is installed
+    DOCUMENT_INDEX_CHUNK_CHARS: int = 1200
+
+    # Document Summarizer (map-reduce for long documents)
+    SUMMARIZER_SINGLE_PASS_CHARS: int = 120000 # Up to ~30k tokens goes through one call
+    SUMMARIZER_CHUNK_CHARS: int = 40000 # Map chunk size for longer documents
+    SUMMARIZER_MAX_PARALLEL: int = 4 # Concurrent chunk calls per document
+    SUMMARIZER_ROUTER_HEAD_CHARS: int = 20000 # Router classifies long documents from their head + outline
+
+    # Bulk Ingestion
+    BULK_ANALYSIS_CONCURRENCY: int = 6 # Documents analysed concurrently per ingestion job
+    INGESTION_JOB_RETENTION_SECONDS: int = 24 * 3600 # In-memory job status retention
+
+    # Extraction Worker Pool (CPU-bound parsing off the web process, see document_processor/extraction_pool)
+    EXTRACTION_WORKERS: int = 2 # Worker processes; 0 extracts in a thread of the web process
+    EXTRACTION_PAGES_PER_TASK: int = 50 # PDFs longer than this are split into parallel page ranges
+    EXTRACTION_TIMEOUT_SECONDS: int = 300 # Per task; a timed-out worker is killed
+    EXTRACTION_WORKER_MEMORY_MB: int = 2048 # RLIMIT_AS per worker (POSIX), 0 for no cap
+    EXTRACTION_ARTEFACTS_ENABLED: bool = True # Store text + page/block layout next to each document
+
+    # OCR (scanned PDFs and images; needs pytesseract + the tesseract binary, see document_processor/ocr)
+    OCR_ENABLED: bool = True # Used only when tesseract is installed
+    OCR_LANGUAGES: str = "eng" # Tesseract languages, e.g. "eng+hin"
+    OCR_DPI: int = 300
+    OCR_PAGES_PER_TASK: int = 4 # Scanned PDFs are split finer across extraction workers
+    OCR_CACHE_DIR: str = "/tmp/chambers-iq-ocr" # Page text cache keyed by rendered image hash
+
+    # Template Samples (see agents/workflows/templates/samples)
+    TEMPLATE_SAMPLE_CONCURRENCY: int = 4 # Samples downloaded/extracted at once
+    TEMPLATE_SAMPLE_CACHE_SIZE: int = 64 # Extracted sample texts kept per process, by S3 key
+
+    # Upload Dedupe (reuse extraction/summary for identical files, see services/lib/document_artefacts)
+    DOCUMENT_DEDUPE_SCOPE: str = "company" # "company", "global", "off"
+
     # External APIs
     INDIAN_KANOON_API_TOKEN: Optional[str] = None
     
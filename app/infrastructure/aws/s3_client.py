@@ -39,12 +39,44 @@ class S3Client:
             print(f"Error deleting file from S3: {e}")
             return False
 
-    def get_file_content(self, object_name: str) -> bytes:
+    def get_file_content(self, object_name: str, missing_ok: bool = False) -> bytes:
         try:
             response = self.client.get_object(Bucket=settings.S3_BUCKET_NAME, Key=object_name)
             return response['Body'].read()
         except ClientError as e:
-            print(f"Error reading file from S3: {e}")
+            if not (missing_ok and e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404")):
+                print(f"Error reading file from S3: {e}")
             return None
 
+    def get_etag(self, object_name: str) -> str:
+        """ETag of an object (HEAD request), or None. Changes whenever the object is rewritten."""
+        try:
+            response = self.client.head_object(Bucket=settings.S3_BUCKET_NAME, Key=object_name)
+            return response.get('ETag')
+        except ClientError as e:
+            print(f"Error reading object metadata from S3: {e}")
+            return None
+
+    def download_to_file(self, object_name: str, path: str) -> bool:
+        """Stream an object to a local file (ranged, multipart GETs for large objects)."""
+        try:
+            self.client.download_file(settings.S3_BUCKET_NAME, object_name, path)
+            return True
+        except ClientError as e:
+            print(f"Error downloading file from S3: {e}")
+            return False
+
+    def put_file_content(self, object_name: str, content: bytes, content_type: str = "application/octet-stream") -> bool:
+        try:
+            self.client.put_object(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=object_name,
+                Body=content,
+                ContentType=content_type
+            )
+            return True
+        except ClientError as e:
+            print(f"Error writing file to S3: {e}")
+            return False
+
 s3_client = S3Client()
@@ -25,6 +25,21 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 def root():
     return {"message": "Welcome to Chambers IQ API"}
 
+@app.on_event("startup")
+def warm_up_llm_clients():
+    # Build shared LLM clients and their HTTP pools before the first request
+    from app.agents.workflows.drafting.llm_pool import warm_up_llm_clients as _warm_up
+    try:
+        result = _warm_up()
+        print(f"LLM client warm-up: {result['warmed']} clients ready, {len(result['failures'])} failures")
+    except Exception as e:
+        print(f"Warning: LLM client warm-up failed: {e}")
+
+@app.on_event("shutdown")
+def stop_extraction_pool():
+    from app.services.lib.document_processor.extraction_pool import shutdown_extraction_pool
+    shutdown_extraction_pool()
+
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 import json
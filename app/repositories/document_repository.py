@@ -3,6 +3,7 @@ from datetime import datetime
 from boto3.dynamodb.conditions import Key, Attr
 from app.repositories.base_repository import BaseRepository
 from app.core.config import settings
+from app.utils.dynamodb_utils import parse_float_to_decimal
 
 class DocumentRepository(BaseRepository):
     def __init__(self):
@@ -45,6 +46,13 @@ class DocumentRepository(BaseRepository):
         self.save(item)
         return item
 
+    def create_many(self, items: List[dict]) -> List[dict]:
+        # batch_writer groups puts into BatchWriteItem calls of 25 and retries unprocessed items
+        with self.table.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=parse_float_to_decimal(item))
+        return items
+
     def delete(self, parent_id: str, document_id: str) -> None:
         # 'parent_id' arg name legacy. It's actually company_id now.
         # We should rename the arg in interface, but for now treating as company_id
@@ -0,0 +1,19 @@
+from typing import Optional
+from app.repositories.base_repository import BaseRepository
+from app.core.config import settings
+
+class LLMResponseCacheRepository(BaseRepository):
+    """
+    Durable store for cached deterministic LLM responses.
+    Table key: cacheKey (HASH). `expiresAt` is an epoch-seconds TTL attribute.
+    """
+    def __init__(self):
+        super().__init__(settings.DYNAMODB_TABLE_LLM_CACHE)
+
+    def get_by_key(self, cache_key: str) -> Optional[dict]:
+        response = self.table.get_item(Key={"cacheKey": cache_key})
+        return response.get("Item")
+
+    def put(self, item: dict) -> dict:
+        self.save(item)
+        return item
@@ -1,5 +1,5 @@
 from typing import Optional, List
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
 from app.repositories.base_repository import BaseRepository
 from app.core.config import settings
 
@@ -26,6 +26,35 @@ class TemplateRepository(BaseRepository):
         items = response.get("Items", [])
         return items[0] if items else None
 
+    def get_for_company(self, company_id: str, template_id: str, document_type_id: Optional[str] = None) -> Optional[dict]:
+        """
+        Keyed lookup within the company partition: a direct get when the
+        document type (sort key prefix) is known, otherwise a paginated query.
+        """
+        if document_type_id:
+            response = self.table.get_item(Key={
+                "companyId": company_id,
+                "caseType#templateId": f"{document_type_id}#{template_id}"
+            })
+            if response.get("Item"):
+                return response["Item"]
+
+        start_key = None
+        while True:
+            kwargs = {
+                "KeyConditionExpression": Key("companyId").eq(company_id),
+                "FilterExpression": Attr("templateId").eq(template_id)
+            }
+            if start_key:
+                kwargs["ExclusiveStartKey"] = start_key
+            response = self.table.query(**kwargs)
+            items = response.get("Items", [])
+            if items:
+                return items[0]
+            start_key = response.get("LastEvaluatedKey")
+            if not start_key:
+                return None
+
     def create(self, item: dict) -> dict:
         self.save(item)
         return item
@@ -38,6 +67,18 @@ class TemplateRepository(BaseRepository):
         self.save(item)
         return item
 
+    def set_plan_cache(self, company_id: str, sort_key: str, plan_cache: dict):
+        """Write only the planCache attribute, so a concurrent template update isn't overwritten."""
+        self.table.update_item(
+            Key={
+                "companyId": company_id,
+                "caseType#templateId": sort_key
+            },
+            UpdateExpression="SET planCache = :plan_cache",
+            ConditionExpression="attribute_exists(companyId)",
+            ExpressionAttributeValues={":plan_cache": plan_cache}
+        )
+
     def delete(self, company_id: str, sort_key: str):
         self.table.delete_item(
             Key={
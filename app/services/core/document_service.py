@@ -1,4 +1,7 @@
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+import asyncio
+import os
+import tempfile
 import uuid
 from datetime import datetime
 from app.repositories.document_repository import DocumentRepository
@@ -24,6 +27,35 @@ class DocumentService:
                 # We can log warning or block. For now, let's block to enforce rules.
                 raise ValueError(f"Document Type {data.documentTypeId} is not allowed for this Case.")
 
+        doc_dict, presigned_url = self._build_document_record(company_id, data)
+        self.repo.create(doc_dict)
+
+        return Document(**doc_dict), presigned_url
+
+    def create_document_urls(self, company_id: str, items: List[DocumentCreate]) -> List[Tuple[Document, str]]:
+        """
+        Bulk variant of create_document_url for a case-bundle manifest.
+
+        The whole manifest is validated before anything is written (each
+        case/document-type pair is checked once), then all records are written
+        in DynamoDB batches and presigned together.
+        """
+        checked: Dict[Tuple[str, str], bool] = {}
+        for data in items:
+            if not data.documentTypeId:
+                continue
+            pair = (data.caseId, data.documentTypeId)
+            if pair not in checked:
+                checked[pair] = self.case_repo.validate_allowed_documents(company_id, data.caseId, data.documentTypeId)
+            if not checked[pair]:
+                raise ValueError(f"Document Type {data.documentTypeId} is not allowed for this Case.")
+
+        records = [self._build_document_record(company_id, data) for data in items]
+        self.repo.create_many([doc_dict for doc_dict, _ in records])
+
+        return [(Document(**doc_dict), presigned_url) for doc_dict, presigned_url in records]
+
+    def _build_document_record(self, company_id: str, data: DocumentCreate) -> Tuple[dict, str]:
         doc_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat()
         s3_key = f"{company_id}/{data.caseId}/{doc_id}/{data.name}"
@@ -49,10 +81,8 @@ class DocumentService:
             "createdAt": now,
             "updatedAt": now
         })
-        
-        self.repo.create(doc_dict)
-        
-        return Document(**doc_dict), presigned_url
+
+        return doc_dict, presigned_url
 
     def get_documents(self, company_id: str, case_id: str) -> List[Document]:
         items = self.repo.get_all_for_case(company_id, case_id)
@@ -85,10 +115,35 @@ class DocumentService:
         return True
 
     def analyze_document(self, document_id: str, client_position: str = "Unknown") -> bool:
+        """Synchronous wrapper for scripts and worker threads without an event loop."""
+        return asyncio.run(self.analyze_document_async(document_id, client_position))
+
+    async def analyze_document_async(
+        self,
+        document_id: str,
+        client_position: str = "Unknown",
+        company_id: Optional[str] = None,
+        on_stage: Optional[Callable[[str], None]] = None
+    ) -> bool:
+        """
+        Analyze a document without blocking the event loop.
+
+        Blocking boto3 calls and CPU-bound extraction run in worker threads;
+        the summarization graph runs natively async, so one worker process can
+        analyze many uploads concurrently.
+
+        Args:
+            company_id: When known, the document is read by key instead of a table scan
+            on_stage: Optional progress callback ("downloading", "extracting", "summarizing", "indexing")
+        """
         print(f"🔍 Starting document analysis for {document_id}")
+        stage = on_stage or (lambda _stage: None)
 
-        # Background task doesn't have company_id. Use global lookup (Scan SK).
-        item = self.repo.get_by_id_global(document_id)
+        if company_id:
+            item = await asyncio.to_thread(self.repo.get_by_id, company_id, document_id)
+        else:
+            # Caller doesn't have company_id. Use global lookup (Scan SK).
+            item = await asyncio.to_thread(self.repo.get_by_id_global, document_id)
         if not item:
             print(f"❌ Document {document_id} not found in database")
             return False
@@ -98,21 +153,80 @@ class DocumentService:
             print(f"❌ Document {document_id} has no S3 key")
             return False
 
-        print(f"📄 Processing document: {doc.name} ({doc.originalName})")
+        print(f"📄 Processing document: {doc.name} ({doc.mimeType})")
 
-        # 1. Fetch File
-        file_content = self.s3.get_file_content(doc.s3Key)
-        if not file_content:
-            print(f"❌ Failed to download file from S3: {doc.s3Key}")
-            return False
+        # Re-analysis of an unchanged file (same S3 ETag as last time) whose
+        # extraction is cached skips the download entirely
+        etag = await asyncio.to_thread(self.s3.get_etag, doc.s3Key)
+        if doc.contentHash and etag and etag == doc.sourceETag:
+            from app.services.lib.document_artefacts import document_artefact_store as artefacts
+
+            artefact = await asyncio.to_thread(artefacts.load, doc.companyId, doc.contentHash)
+            if artefacts.get_stage(artefact, "extraction", self._extraction_key(doc.contentHash)):
+                print(f"♻️ {doc.name} unchanged since last analysis, skipping download")
+                return await self._analyze_file(doc, None, client_position, stage,
+                                                digest=doc.contentHash, artefact=artefact, etag=etag)
+
+        # 1. Fetch File: spooled to local disk so large bundles never sit in memory
+        stage("downloading")
+        with tempfile.TemporaryDirectory(prefix="doc-") as spool_dir:
+            path = os.path.join(spool_dir, "source" + os.path.splitext(doc.name)[1])
+            downloaded = await asyncio.to_thread(self.s3.download_to_file, doc.s3Key, path)
+            if not downloaded or not os.path.getsize(path):
+                print(f"❌ Failed to download file from S3: {doc.s3Key}")
+                return False
+
+            print(f"📥 Downloaded {os.path.getsize(path)} bytes from S3")
+            return await self._analyze_file(doc, path, client_position, stage, etag=etag)
 
-        print(f"📥 Downloaded {len(file_content)} bytes from S3")
+    @staticmethod
+    def _extraction_key(digest: str) -> str:
+        from app.services.lib.document_artefacts import stage_key
+        from app.services.lib.document_processor import EXTRACTION_VERSION
+        return stage_key("extraction", EXTRACTION_VERSION, digest)
+
+    async def _analyze_file(self, doc: Document, path: Optional[str], client_position: str,
+                            stage: Callable[[str], None], digest: Optional[str] = None,
+                            artefact: Optional[dict] = None, etag: Optional[str] = None) -> bool:
+        """
+        Extract, summarize and index a document spooled to local disk.
+
+        Each stage (extraction, router, specialist) is reused from the
+        artefact record when its inputs and prompt versions are unchanged, so
+        identical uploads and re-analysis only re-run what changed. path is
+        None when the caller already knows the extraction is cached.
+        """
+        document_id = doc.documentId
+
+        from app.services.lib.document_artefacts import file_content_hash, document_artefact_store as artefacts
+
+        if digest is None:
+            digest = await asyncio.to_thread(file_content_hash, path)
+            artefact = await asyncio.to_thread(artefacts.load, doc.companyId, digest)
+        extraction_key = self._extraction_key(digest)
+        cached_extraction = artefacts.get_stage(artefact, "extraction", extraction_key)
+        new_stages = {}
 
         # 2. Process document using shared DocumentProcessor
-        from app.services.lib.document_processor import DocumentProcessor
+        stage("extracting")
+        if cached_extraction:
+            print(f"♻️ Reusing extraction for content hash {digest[:12]} (from {artefact.get('sourceDocumentId')})")
+            result = {**cached_extraction, "supported": True, "error_message": None}
+            if cached_extraction.get("layout"):
+                from app.services.lib.document_processor import ExtractionResult
+                result["extraction"] = ExtractionResult.from_layout(cached_extraction["text"], cached_extraction["layout"])
+        else:
+            from app.services.lib.document_processor import DocumentProcessor
+            from app.services.lib.document_processor.extraction_pool import get_extraction_pool
 
-        processor = DocumentProcessor()
-        result = processor.process_document(file_content, doc.name)
+            # Parsed in place from disk, page by page, in the extraction worker pool
+            pool = get_extraction_pool()
+            if pool.enabled:
+                result = await pool.process_document(path, doc.name)
+            else:
+                result = await asyncio.to_thread(DocumentProcessor().process_document, path, doc.name)
+            if result["supported"] and result["text"].strip():
+                new_stages["extraction"] = {"key": extraction_key, "output": self._extraction_artefact(result)}
 
         # Log format detection results
         format_info = result.get("format", {})
@@ -132,11 +246,13 @@ class DocumentService:
             else:
                 summary = result["error_message"] or "File uploaded successfully. AI processing not supported for this format yet."
 
-            self.repo.update(doc.companyId, document_id, {
+            await asyncio.to_thread(self.repo.update, doc.companyId, document_id, {
                 "aiStatus": "uploaded_only",  # Successfully uploaded, no AI processing
                 "aiSummary": summary,
                 "processingFormat": result["format"].get("format_type", "unknown"),
-                "qualityScore": 0.0
+                "qualityScore": 0.0,
+                "contentHash": digest,
+                "sourceETag": etag
             })
             return True  # Upload succeeded, just no AI processing
 
@@ -151,47 +267,126 @@ class DocumentService:
 
         if not text.strip():
              print(f"❌ Empty document text extracted")
-             self.repo.update(doc.companyId, document_id, {
+             await asyncio.to_thread(self.repo.update, doc.companyId, document_id, {
                 "aiStatus": "failed",
                 "aiSummary": "Empty document text",
-                "qualityScore": 0.0
+                "qualityScore": 0.0,
+                "contentHash": digest,
+                "sourceETag": etag
             })
              return False
 
+        # Page/block structure next to the original, for page slices and citations
+        extraction = result.get("extraction")
+        if path is not None:  # Otherwise unchanged since it was last stored
+            await asyncio.to_thread(self._save_extraction, doc, extraction)
+
         # 3. Run Agent
         try:
             from app.agents.workflows.summarization.document_summarizer import doc_analysis_app
+            # Router/specialist nodes reuse their previous results when their keys match
+            previous_stages = artefacts.get_stages(artefact)
             inputs = {
                 "document_text": text,
                 "client_position": client_position,
-                "is_bundle": False
+                "is_bundle": False,
+                "stages": previous_stages
+            }
+            stage("summarizing")
+            ai_result = await doc_analysis_app.ainvoke(inputs)
+            extracted_data = {
+                "category": ai_result.get("category"),
+                "docType": ai_result.get("doc_type"),
+                "scanQuality": ai_result.get("scan_quality"),
+                "specialistAnalysis": ai_result.get("specialist_analysis"),
+                "finalAdvice": ai_result.get("final_advice"),
+                "isBundle": ai_result.get("is_bundle")
             }
-            ai_result = doc_analysis_app.invoke(inputs)
+            for name, entry in (ai_result.get("stages") or {}).items():
+                if previous_stages.get(name) != entry:
+                    new_stages[name] = entry
+            final_advice = extracted_data.get("finalAdvice") or ""
 
             # 4. Save Results
             updates = {
                 "aiStatus": "completed",
-                "aiSummary": ai_result.get("final_advice", "")[:5000],
-                "description": ai_result.get("final_advice", "")[:5000], # Overwrite user description with AI summary
+                "aiSummary": final_advice[:5000],
+                "description": final_advice[:5000], # Overwrite user description with AI summary
                 "qualityScore": quality_score,
                 "processingFormat": result["format"].get("format_type", "unknown"),
-                "extractedData": {
-                    "category": ai_result.get("category"),
-                    "docType": ai_result.get("doc_type"),
-                    "scanQuality": ai_result.get("scan_quality"),
-                    "specialistAnalysis": ai_result.get("specialist_analysis"),
-                    "finalAdvice": ai_result.get("final_advice"),
-                    "isBundle": ai_result.get("is_bundle")
-                }
+                "extractedData": extracted_data,
+                "contentHash": digest,
+                "sourceETag": etag
             }
+            low_quality_pages = [p["page"] for p in result.get("page_quality") or [] if p["issues"]]
+            if low_quality_pages:
+                print(f"⚠️ {len(low_quality_pages)} low-quality pages: {low_quality_pages[:20]}")
+                updates["lowQualityPages"] = low_quality_pages
             # Update using companyId as parentId in repo arguments
-            self.repo.update(doc.companyId, document_id, updates)
+            await asyncio.to_thread(self.repo.update, doc.companyId, document_id, updates)
+
+            if new_stages:
+                print(f"💾 Storing re-run stages for {digest[:12]}: {', '.join(new_stages)}")
+                await asyncio.to_thread(self._save_artefact, doc, digest, artefact, new_stages)
+
+            stage("indexing")
+            await asyncio.to_thread(self._index_document, doc, updates["aiSummary"], text, extraction)
             return True
             
         except Exception as e:
             print(f"Agent Error: {e}")
-            self.repo.update(doc.companyId, document_id, {
+            await asyncio.to_thread(self.repo.update, doc.companyId, document_id, {
                 "aiStatus": "failed", 
                 "aiSummary": f"AI Error: {str(e)}"
             })
             return False
+
+    @staticmethod
+    def _extraction_artefact(result: dict) -> dict:
+        return {
+            "text": result["text"],
+            "quality_score": result["quality_score"],
+            "format": result["format"],
+            "page_quality": result.get("page_quality", []),
+            "layout": result["extraction"].layout() if result.get("extraction") else None
+        }
+
+    def _save_artefact(self, doc: Document, digest: str, artefact: Optional[dict], stages: Dict[str, dict]):
+        """Record this document's re-run stages under its content hash (best effort)."""
+        from app.services.lib.document_artefacts import document_artefact_store as artefacts
+
+        try:
+            artefacts.save(doc.companyId, digest, artefact, doc.documentId, stages)
+        except Exception as e:
+            print(f"⚠️ Failed to store artefacts for {doc.documentId}: {e}")
+
+    def _save_extraction(self, doc: Document, extraction):
+        """Store the structured extraction next to the document (best effort)."""
+        if not extraction or not settings.EXTRACTION_ARTEFACTS_ENABLED:
+            return
+        try:
+            from app.services.lib.document_processor.extraction_store import extraction_store
+
+            extraction_store.save(doc.s3Key, doc.documentId, extraction)
+        except Exception as e:
+            print(f"⚠️ Failed to store extraction for {doc.documentId}: {e}")
+
+    def _index_document(self, doc: Document, summary: str, text: str, extraction=None):
+        """Write the document's retrieval passages next to it (best effort)."""
+        if not settings.DOCUMENT_INDEX_ENABLED:
+            return
+        try:
+            from app.services.lib.document_index import build_document_passages, document_index_store
+
+            sidecar = build_document_passages(
+                doc.documentId,
+                summary,
+                text,
+                metadata={"filename": doc.name, "type": doc.documentTypeId, "case_id": doc.caseId},
+                chunk_chars=settings.DOCUMENT_INDEX_CHUNK_CHARS,
+                extraction=extraction
+            )
+            document_index_store.save_document(doc.s3Key, sidecar)
+            print(f"🗂️ Indexed {len(sidecar['passages'])} passages for {doc.documentId}")
+        except Exception as e:
+            print(f"⚠️ Document indexing failed for {doc.documentId}: {e}")
@@ -0,0 +1,100 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.api.v1.schemas.document import IngestionDocumentStatus, IngestionJob
+from app.core.config import settings
+from app.services.core.document_service import DocumentService
+
+
+class IngestionService:
+    """
+    Batch analysis of case bundles.
+
+    One job analyses many documents concurrently on the event loop, sharing a
+    single DocumentService (and with it the S3/DynamoDB clients) and the
+    process-wide LLM scheduler. Job progress is kept in memory per process.
+    """
+
+    _jobs: Dict[str, IngestionJob] = {}
+
+    def __init__(self):
+        self.documents = DocumentService()
+
+    def create_job(self, company_id: str, document_ids: List[str]) -> IngestionJob:
+        self._prune()
+        now = datetime.utcnow().isoformat()
+        job = IngestionJob(
+            jobId=str(uuid.uuid4()),
+            companyId=company_id,
+            total=len(document_ids),
+            # dict.fromkeys drops duplicate ids while keeping manifest order
+            documents=[IngestionDocumentStatus(documentId=doc_id) for doc_id in dict.fromkeys(document_ids)],
+            createdAt=now,
+            updatedAt=now
+        )
+        job.total = len(job.documents)
+        self._jobs[job.jobId] = job
+        return job
+
+    def get_job(self, company_id: str, job_id: str) -> Optional[IngestionJob]:
+        job = self._jobs.get(job_id)
+        if not job or job.companyId != company_id:
+            return None
+        return job
+
+    async def run_job(self, job_id: str, client_position: str = "Unknown"):
+        job = self._jobs[job_id]
+        job.status = "running"
+        self._touch(job)
+        semaphore = asyncio.Semaphore(max(1, settings.BULK_ANALYSIS_CONCURRENCY))
+
+        async def _analyze(entry: IngestionDocumentStatus):
+            async with semaphore:
+                entry.status = "running"
+                entry.startedAt = datetime.utcnow().isoformat()
+                self._touch(job)
+
+                def _on_stage(stage: str):
+                    entry.stage = stage
+                    self._touch(job)
+
+                try:
+                    ok = await self.documents.analyze_document_async(
+                        entry.documentId,
+                        client_position,
+                        company_id=job.companyId,
+                        on_stage=_on_stage
+                    )
+                    entry.status = "completed" if ok else "failed"
+                    if not ok:
+                        entry.error = "Analysis failed (see document aiStatus)"
+                except Exception as e:
+                    entry.status = "failed"
+                    entry.error = str(e)
+
+                entry.finishedAt = datetime.utcnow().isoformat()
+                if entry.status == "completed":
+                    job.completed += 1
+                else:
+                    job.failed += 1
+                job.progress = round((job.completed + job.failed) / job.total, 3) if job.total else 1.0
+                self._touch(job)
+
+        print(f"📦 Ingestion job {job_id}: analysing {job.total} documents "
+              f"(concurrency {settings.BULK_ANALYSIS_CONCURRENCY})")
+        await asyncio.gather(*(_analyze(entry) for entry in job.documents))
+
+        job.status = "completed" if job.failed == 0 else "completed_with_errors"
+        self._touch(job)
+        print(f"📦 Ingestion job {job_id}: {job.completed} completed, {job.failed} failed")
+
+    def _touch(self, job: IngestionJob):
+        job.updatedAt = datetime.utcnow().isoformat()
+
+    def _prune(self):
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.INGESTION_JOB_RETENTION_SECONDS)
+        for job_id, job in list(self._jobs.items()):
+            if job.status.startswith("completed") and datetime.fromisoformat(job.updatedAt) < cutoff:
+                del self._jobs[job_id]
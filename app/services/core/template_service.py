@@ -139,11 +139,34 @@ class TemplateService:
                 print(f"Error updating S3 content: {e}")
                 raise e
         
+        # Cached planner structure belongs to the previous version
+        existing.pop("planCache", None)
+
         # 4. Save to DB (repo handles updates via overwrite)
         self.repo.update(existing)
         
         # Return complete object with content
         return Template(**existing, content=data.content) # Return Updated version
+
+    def get_plan_cache(self, company_id: str, template_id: str, document_type_id: Optional[str] = None) -> dict:
+        """Parsed drafting plans stored on the template record ({key: entry})."""
+        item = self.repo.get_for_company(company_id, template_id, document_type_id)
+        return (item or {}).get("planCache") or {}
+
+    def save_plan_cache_entry(self, company_id: str, template_id: str, key: str, entry: dict,
+                              max_entries: int = 4, document_type_id: Optional[str] = None) -> bool:
+        """Add a parsed plan to the template record, keeping the newest few entries."""
+        item = self.repo.get_for_company(company_id, template_id, document_type_id)
+        if not item:
+            return False
+        plan_cache = dict(item.get("planCache") or {})
+        plan_cache[key] = entry
+        # Several keys only when the template is edited in the UI before drafting
+        newest = sorted(plan_cache, key=lambda k: plan_cache[k].get("createdAt", ""), reverse=True)
+        plan_cache = {k: plan_cache[k] for k in newest[:max_entries]}
+        self.repo.set_plan_cache(item["companyId"], item["caseType#templateId"], plan_cache)
+        return True
+
     async def delete_template(self, company_id: str, template_id: str) -> bool:
         item = self.repo.get_by_id_global(template_id)
         if not item:
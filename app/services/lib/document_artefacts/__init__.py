@@ -0,0 +1,136 @@
+"""
+Document Artefacts Library
+Content-addressed reuse of extraction and summarization results.
+
+The same file (an order, a vakalatnama, a standard annexure) is often
+uploaded to many cases. Each upload is hashed, and the results of analysing
+it are stored once per content hash under `artefacts/{scope}/{hash}.json`,
+so a duplicate upload reuses the extracted text, quality score and summary
+instead of re-running extraction and the LLM calls.
+
+Results are kept per pipeline stage ("extraction", "router", "specialist").
+Each stage records the key it was computed for: a hash of its inputs and
+of the prompt / extractor version. A stage is reused only when its key
+still matches, so re-analysis re-runs just the stages whose inputs changed.
+
+Scope follows settings.DOCUMENT_DEDUPE_SCOPE:
+    "company" - artefacts are shared between a company's own cases (default)
+    "global"  - artefacts are shared across companies
+    "off"     - no lookup, no writes
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import time
+from typing import Any, Dict, Optional
+
+ARTEFACT_PREFIX = "artefacts"
+ARTEFACT_VERSION = 2
+GLOBAL_SCOPE = "_global"
+
+
+def content_hash(content: bytes) -> str:
+    """sha256 hex digest of the raw file bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_content_hash(path: str) -> str:
+    """sha256 of a file on disk, hashed through mmap instead of reading it into memory."""
+    with open(path, "rb") as fh:
+        if not os.fstat(fh.fileno()).st_size:
+            return content_hash(b"")
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return content_hash(mapped)
+
+
+def stage_key(*parts: Any) -> str:
+    """Key for a stage result: sha256 over its inputs and versions."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class DocumentArtefactStore:
+    """Reads and writes per-hash artefact records in S3."""
+
+    def __init__(self):
+        self._s3 = None
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            from app.infrastructure.aws.s3_client import S3Client
+            self._s3 = S3Client()
+        return self._s3
+
+    @property
+    def scope_mode(self) -> str:
+        from app.core.config import settings
+        return settings.DOCUMENT_DEDUPE_SCOPE
+
+    @property
+    def enabled(self) -> bool:
+        return self.scope_mode in ("company", "global")
+
+    def artefact_key(self, company_id: str, digest: str) -> str:
+        scope = GLOBAL_SCOPE if self.scope_mode == "global" else company_id
+        return f"{ARTEFACT_PREFIX}/{scope}/{digest}.json"
+
+    def load(self, company_id: str, digest: str) -> Optional[Dict[str, Any]]:
+        """Artefact record for a content hash, or None."""
+        if not self.enabled:
+            return None
+        content = self.s3.get_file_content(self.artefact_key(company_id, digest), missing_ok=True)
+        if not content:
+            return None
+        try:
+            record = json.loads(content)
+        except ValueError:
+            return None
+        return record if record.get("version") == ARTEFACT_VERSION else None
+
+    def get_stages(self, record: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """All stage records ({stage: {"key", "output"}})."""
+        return dict((record or {}).get("stages") or {})
+
+    def get_stage(self, record: Optional[Dict[str, Any]], stage: str, key: str) -> Optional[Dict[str, Any]]:
+        """Output of a stage, if it was computed for the same key."""
+        entry = self.get_stages(record).get(stage)
+        return entry["output"] if entry and entry.get("key") == key else None
+
+    def save(self, company_id: str, digest: str, record: Optional[Dict[str, Any]],
+             source_document_id: str, stages: Dict[str, Dict[str, Any]]) -> bool:
+        """
+        Merge new stage results into the artefact record and write it back.
+
+        Args:
+            record: Record returned by load() (None when there was none)
+            stages: {stage: {"key", "output"}} for the stages that were re-run
+        """
+        if not self.enabled or not stages:
+            return False
+        record = dict(record or {"version": ARTEFACT_VERSION, "hash": digest})
+        record.setdefault("sourceDocumentId", source_document_id)
+        record["stages"] = {**self.get_stages(record), **stages}
+        record["updatedAt"] = int(time.time())
+
+        body = json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")
+        return bool(self.s3.put_file_content(
+            self.artefact_key(company_id, digest), body, content_type="application/json"
+        ))
+
+
+# Global store (one per process)
+document_artefact_store = DocumentArtefactStore()
+
+__all__ = [
+    "DocumentArtefactStore",
+    "content_hash",
+    "document_artefact_store",
+    "file_content_hash",
+    "stage_key",
+]
@@ -0,0 +1,286 @@
+"""
+Document Index Library
+Per-case passage retrieval over document summaries and extracted text.
+
+Each analysed document gets a passage sidecar stored next to it in S3
+(`{company}/{case}/{document}/.index/passages.json`). Writing one sidecar per
+document keeps updates incremental and free of read-modify-write races; the
+case index is the union of its documents' sidecars, loaded on demand.
+"""
+
+import json
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .embedders import HashedTfidfEmbedder, SentenceTransformerEmbedder, get_embedder
+
+SIDECAR_NAME = ".index/passages.json"
+SIDECAR_VERSION = 1
+
+
+def sidecar_key(document_s3_key: str) -> str:
+    """S3 key of the passage sidecar for a document."""
+    return f"{document_s3_key.rsplit('/', 1)[0]}/{SIDECAR_NAME}"
+
+
+def chunk_text(text: str, chunk_chars: int = 1200, overlap_chars: int = 150) -> List[str]:
+    """
+    Split text into passages of about chunk_chars, preferring paragraph
+    and sentence boundaries.
+    """
+    text = text or ""
+    return [text[start:end].strip() for start, end in chunk_spans(text, chunk_chars, overlap_chars)]
+
+
+def chunk_spans(text: str, chunk_chars: int = 1200, overlap_chars: int = 150) -> List[Tuple[int, int]]:
+    """(start, end) offsets of the chunks chunk_text() returns."""
+    if not (text or "").strip():
+        return []
+
+    spans, start, length = [], 0, len(text)
+    while start < length:
+        end = min(start + chunk_chars, length)
+        if end < length:
+            # Back off to the last paragraph/sentence break in the second half of the window
+            window = text[start:end]
+            cut = max(window.rfind("\n\n"), window.rfind(". "), window.rfind("\n"))
+            if cut > chunk_chars // 2:
+                end = start + cut + 1
+        if text[start:end].strip():
+            spans.append((start, end))
+        if end >= length:
+            break
+        start = max(end - overlap_chars, start + 1)
+    return spans
+
+
+def build_document_passages(document_id: str, summary: str, text: str,
+                            metadata: Optional[Dict[str, Any]] = None,
+                            chunk_chars: int = 1200, extraction: Any = None) -> Dict[str, Any]:
+    """
+    Build the sidecar payload for one document: its summary plus text chunks,
+    each with an embedding from the process-wide embedder.
+
+    Args:
+        extraction: ExtractionResult for text, used to tag chunks with their page
+    """
+    embedder = get_embedder()
+    text = text or ""
+    passages = []
+    if summary:
+        passages.append({"kind": "summary", "text": summary})
+    for start, end in chunk_spans(text, chunk_chars):
+        passage = {"kind": "chunk", "text": text[start:end].strip()}
+        page = extraction.page_at(start) if extraction is not None else None
+        if page is not None:
+            passage["page"] = page
+        passages.append(passage)
+
+    vectors = embedder.embed_many([p["text"] for p in passages])
+    for i, (passage, vector) in enumerate(zip(passages, vectors)):
+        passage["id"] = f"{document_id}:{i}"
+        passage["vector"] = _encode_vector(vector)
+
+    return {
+        "version": SIDECAR_VERSION,
+        "document_id": document_id,
+        "embedder": embedder.name,
+        "metadata": metadata or {},
+        "created_at": int(time.time()),
+        "passages": passages
+    }
+
+
+def format_passage_source(passage: Dict[str, Any]) -> str:
+    """Citation label for a passage, e.g. "Petition.pdf, p. 12"."""
+    source = passage.get("filename") or passage.get("document_id") or "document"
+    return f"{source}, p. {passage['page']}" if passage.get("page") else source
+
+
+def _encode_vector(vector: Any) -> Any:
+    # Sparse vectors as parallel index/weight lists (JSON object keys must be strings)
+    if isinstance(vector, dict):
+        return {"i": list(vector.keys()), "w": [round(w, 4) for w in vector.values()]}
+    return vector
+
+
+def _decode_vector(vector: Any) -> Any:
+    if isinstance(vector, dict):
+        return dict(zip(vector["i"], vector["w"]))
+    return vector
+
+
+class CaseDocumentIndex:
+    """In-memory passage index for one case."""
+
+    def __init__(self, embedder: Any = None):
+        self.embedder = embedder or get_embedder()
+        self.passages: List[Dict[str, Any]] = []
+        self._idf: Optional[Dict[int, float]] = None
+        self._norms: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def add_sidecar(self, sidecar: Dict[str, Any]):
+        """Add (or replace) one document's passages."""
+        document_id = sidecar["document_id"]
+        self.passages = [p for p in self.passages if p["document_id"] != document_id]
+
+        raw = sidecar.get("passages", [])
+        if sidecar.get("embedder") == self.embedder.name:
+            vectors = [_decode_vector(p["vector"]) for p in raw]
+        else:
+            # Embedder changed since the sidecar was written: re-embed from stored text
+            vectors = self.embedder.embed_many([p["text"] for p in raw])
+
+        metadata = sidecar.get("metadata", {})
+        for passage, vector in zip(raw, vectors):
+            self.passages.append({
+                "id": passage["id"],
+                "document_id": document_id,
+                "kind": passage["kind"],
+                "text": passage["text"],
+                "page": passage.get("page"),
+                "vector": vector,
+                "filename": metadata.get("filename"),
+                "type": metadata.get("type")
+            })
+        self._idf = None
+
+    def _prepare(self):
+        if self._idf is not None:
+            return
+        if self.embedder.sparse:
+            df: Dict[int, int] = {}
+            for p in self.passages:
+                for bucket in p["vector"]:
+                    df[bucket] = df.get(bucket, 0) + 1
+            n = len(self.passages)
+            self._idf = {bucket: math.log((1 + n) / (1 + count)) + 1.0 for bucket, count in df.items()}
+            self._norms = [
+                math.sqrt(sum((w * self._idf[b]) ** 2 for b, w in p["vector"].items())) or 1.0
+                for p in self.passages
+            ]
+        else:
+            self._idf = {}
+
+    def search(self, query: str, top_k: int = 6, kinds: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Top-k passages by cosine similarity (TF-IDF weighted for sparse vectors)."""
+        if not self.passages or not query:
+            return []
+        self._prepare()
+        query_vector = self.embedder.embed(query)
+
+        scored = []
+        if self.embedder.sparse:
+            q = {b: w * self._idf[b] for b, w in query_vector.items() if b in self._idf}
+            q_norm = math.sqrt(sum(w * w for w in q.values())) or 1.0
+            for i, p in enumerate(self.passages):
+                vec = p["vector"]
+                dot = sum(w * vec[b] * self._idf[b] for b, w in q.items() if b in vec)
+                if dot > 0:
+                    scored.append((dot / (q_norm * self._norms[i]), i))
+        else:
+            for i, p in enumerate(self.passages):
+                dot = sum(a * b for a, b in zip(query_vector, p["vector"]))
+                if dot > 0:
+                    scored.append((dot, i))
+
+        results = []
+        for score, i in sorted(scored, reverse=True):
+            p = self.passages[i]
+            if kinds and p["kind"] not in kinds:
+                continue
+            results.append({**{k: v for k, v in p.items() if k != "vector"}, "score": round(score, 4)})
+            if len(results) >= top_k:
+                break
+        return results
+
+
+class DocumentIndexStore:
+    """Reads and writes passage sidecars in S3, caching loaded case indexes."""
+
+    def __init__(self, cache_ttl_seconds: int = 300):
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._cases: Dict[str, Any] = {}  # case_key -> (loaded_at, document ids, index)
+        self._lock = threading.Lock()
+        self._s3 = None
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            from app.infrastructure.aws.s3_client import S3Client
+            self._s3 = S3Client()
+        return self._s3
+
+    def save_document(self, document_s3_key: str, sidecar: Dict[str, Any]) -> bool:
+        """Persist one document's passages next to the document."""
+        body = json.dumps(sidecar, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        ok = self.s3.put_file_content(sidecar_key(document_s3_key), body, content_type="application/json")
+        with self._lock:
+            # Drop cached case indexes containing this document so the next load sees it
+            for case_key in [k for k, (_, doc_ids, _) in self._cases.items() if sidecar["document_id"] in doc_ids]:
+                del self._cases[case_key]
+        return bool(ok)
+
+    def load_document(self, document_s3_key: str) -> Optional[Dict[str, Any]]:
+        content = self.s3.get_file_content(sidecar_key(document_s3_key), missing_ok=True)
+        if not content:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+
+    def load_case(self, case_key: str, documents: List[Dict[str, Any]]) -> CaseDocumentIndex:
+        """
+        Index over the given documents' sidecars.
+
+        Args:
+            case_key: Cache key, e.g. "{company_id}/{case_id}"
+            documents: Document records (need documentId and s3Key)
+        """
+        doc_ids = frozenset(d.get("documentId") for d in documents if d.get("s3Key"))
+        with self._lock:
+            cached = self._cases.get(case_key)
+            if cached and cached[1] == doc_ids and time.time() - cached[0] < self.cache_ttl_seconds:
+                return cached[2]
+
+        index = CaseDocumentIndex()
+        for doc in documents:
+            if not doc.get("s3Key"):
+                continue
+            sidecar = self.load_document(doc["s3Key"])
+            if not sidecar and doc.get("aiSummary"):
+                # Analysed before indexing existed: index the stored summary in memory only
+                sidecar = build_document_passages(doc.get("documentId"), doc["aiSummary"], "")
+            if sidecar:
+                metadata = sidecar.setdefault("metadata", {})
+                metadata.setdefault("filename", doc.get("name"))
+                metadata.setdefault("type", doc.get("documentTypeId"))
+                index.add_sidecar(sidecar)
+
+        with self._lock:
+            self._cases[case_key] = (time.time(), doc_ids, index)
+        return index
+
+
+# Global store (one per process)
+document_index_store = DocumentIndexStore()
+
+__all__ = [
+    "CaseDocumentIndex",
+    "DocumentIndexStore",
+    "HashedTfidfEmbedder",
+    "SentenceTransformerEmbedder",
+    "build_document_passages",
+    "chunk_spans",
+    "chunk_text",
+    "document_index_store",
+    "format_passage_source",
+    "get_embedder",
+    "sidecar_key",
+]
@@ -0,0 +1,85 @@
+"""
+Embedding Backends
+CPU-only text embedders for the per-case document index.
+"""
+
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, List
+
+_TERM_PATTERN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "with"
+})
+
+
+class HashedTfidfEmbedder:
+    """
+    Sparse hashed TF vectors (unigrams + bigrams). IDF weighting is applied
+    by the index at query time, so vectors stay valid as documents are added.
+
+    Pure Python, no model download; used when sentence-transformers is absent.
+    """
+
+    sparse = True
+
+    def __init__(self, dim: int = 2 ** 18):
+        self.dim = dim
+        self.name = f"hashed-tfidf-{dim}"
+
+    def _terms(self, text: str) -> List[str]:
+        words = [w for w in _TERM_PATTERN.findall(text.lower()) if len(w) > 1 and w not in _STOPWORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, text: str) -> Dict[int, float]:
+        counts = Counter(zlib.crc32(term.encode("utf-8")) % self.dim for term in self._terms(text))
+        # Sublinear TF dampens repeated boilerplate
+        return {bucket: 1.0 + math.log(tf) for bucket, tf in counts.items()}
+
+    def embed_many(self, texts: List[str]) -> List[Dict[int, float]]:
+        return [self.embed(t) for t in texts]
+
+
+class SentenceTransformerEmbedder:
+    """Dense embeddings from a local sentence-transformers model (CPU)."""
+
+    sparse = False
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer  # Optional dependency
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.name = f"st-{model_name}"
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(texts, batch_size=32, normalize_embeddings=True, show_progress_bar=False)
+        return [[round(float(x), 5) for x in v] for v in vectors]
+
+
+_embedder = None
+
+
+def get_embedder() -> Any:
+    """
+    Process-wide embedder chosen by settings.DOCUMENT_INDEX_EMBEDDER:
+    "hashed", "sentence-transformers", or "auto" (sentence-transformers if installed).
+    """
+    global _embedder
+    if _embedder is None:
+        from app.core.config import settings
+
+        choice = settings.DOCUMENT_INDEX_EMBEDDER
+        if choice in ("auto", "sentence-transformers"):
+            try:
+                _embedder = SentenceTransformerEmbedder(settings.DOCUMENT_INDEX_MODEL)
+            except Exception as e:
+                if choice == "sentence-transformers":
+                    print(f"⚠️ sentence-transformers unavailable ({e}), using hashed TF-IDF")
+        if _embedder is None:
+            _embedder = HashedTfidfEmbedder()
+    return _embedder
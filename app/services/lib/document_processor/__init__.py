@@ -4,9 +4,16 @@ Shared utilities for document processing across the application.
 """
 
 from .format_detector import FormatDetector
+from .parse_context import DocumentSource, ParseContext
+from .extraction_result import ExtractionResult, TextBlock
+from .extraction_store import ExtractionStore, extraction_store
+from .ocr import ocr_available
 from .text_extractors import TextExtractor
 from .quality_assessor import QualityAssessor
 
+# Bump when extraction output changes, so cached extractions are re-run
+EXTRACTION_VERSION = 2
+
 
 class DocumentProcessor:
     """
@@ -19,22 +26,29 @@ class DocumentProcessor:
         self.text_extractor = TextExtractor()
         self.quality_assessor = QualityAssessor()
 
-    def process_document(self, file_content: bytes, filename: str) -> dict:
+    def process_document(self, file_content: DocumentSource, filename: str) -> dict:
         """
         Process a document and return structured results.
 
         Args:
-            file_content: Raw file bytes
+            file_content: Raw file bytes, or path to a local file. Paths are
+                parsed in place a page at a time, which keeps memory flat for
+                large bundles.
             filename: Original filename
 
         Returns:
             dict: Processing results with format info, text, and quality metrics
         """
+        # One parse shared by detection, extraction and quality assessment
+        with ParseContext(file_content, filename, ocr=ocr_available()) as context:
+            return self._process(context)
+
+    def _process(self, context: ParseContext) -> dict:
         # Detect format and check if supported
-        format_result = self.format_detector.detect_format(file_content, filename)
+        format_result = self.format_detector.detect(context)
 
         result = {
-            "filename": filename,
+            "filename": context.filename,
             "format": format_result,
             "supported": format_result["supported"],
             "text": "",
@@ -45,12 +59,16 @@ class DocumentProcessor:
         # Extract text if supported
         if format_result["supported"]:
             try:
-                text = self.text_extractor.extract_text(file_content, format_result)
+                extraction = self.text_extractor.extract(context, format_result)
+                text = extraction.text
                 result["text"] = text
+                result["extraction"] = extraction  # Blocks with page/offset positions
 
-                # Assess quality
-                quality = self.quality_assessor.assess_quality(text, format_result)
+                # Assess quality (per page too, when the format has pages)
+                quality = self.quality_assessor.assess_quality(text, format_result, pages=extraction.page_texts())
                 result["quality_score"] = quality["score"]
+                result["page_quality"] = quality.get("pages", [])
+                result["ocr_pages"] = list(context.ocr_pages)
 
             except Exception as e:
                 result["supported"] = False
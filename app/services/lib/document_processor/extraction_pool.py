@@ -0,0 +1,216 @@
+"""
+Extraction Worker Pool
+Runs CPU-bound document extraction in worker processes.
+
+Extraction holds the GIL for the whole parse, so running it on the web
+process's threads slows request handling during bulk ingestion. The pool
+moves it to separate processes. Large PDFs are split into page ranges that
+are extracted in parallel, so one 500-page bundle scales across cores.
+
+Each job has a timeout, and each worker's address space is capped with
+RLIMIT_AS (on POSIX). Hung workers are killed by recycling the pool.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+
+from .extraction_result import ExtractionResult
+from .parse_context import ParseContext
+
+
+def _init_worker(memory_limit_mb: int):
+    """Cap the worker's address space so a pathological file fails alone."""
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"⚠️ Extraction worker memory cap not applied: {e}")
+
+
+def _process_or_plan(path: str, filename: str, split_pages: int, ocr_split_pages: int) -> Dict[str, Any]:
+    """
+    Worker: process the document fully, or, for a PDF longer than
+    split_pages (ocr_split_pages for scans), return only the detection
+    result so it can be split.
+    """
+    from . import DocumentProcessor
+    from .ocr import ocr_available
+
+    processor = DocumentProcessor()
+    with ParseContext(path, filename, ocr=ocr_available()) as context:
+        format_result = processor.format_detector.detect(context)
+        limit = ocr_split_pages if format_result.get("ocr") else split_pages
+        if format_result["supported"] and format_result.get("page_count", 0) > limit:
+            return {"split": True, "format": format_result}
+        return processor._process(context)
+
+
+def _extract_page_range(path: str, filename: str, start: int, stop: int) -> Dict[str, Any]:
+    """Worker: text blocks of PDF pages [start, stop), and which pages needed OCR."""
+    from .ocr import ocr_available
+
+    with ParseContext(path, filename, ocr=ocr_available()) as context:
+        pages = [context.page_blocks(index) for index in range(start, min(stop, context.page_count))]
+        return {"pages": pages, "ocr_pages": context.ocr_pages}
+
+
+class ExtractionPool:
+    """Process pool for document extraction (created on first use)."""
+
+    def __init__(self, workers: int, pages_per_task: int = 50, timeout_seconds: int = 300,
+                 memory_limit_mb: int = 2048, ocr_pages_per_task: int = 4):
+        self.workers = workers
+        self.pages_per_task = pages_per_task
+        self.ocr_pages_per_task = ocr_pages_per_task
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: workers don't inherit the web process's threads, sockets or boto3 clients
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.memory_limit_mb,),
+                    max_tasks_per_child=200
+                )
+                print(f"⚙️ Extraction pool started with {self.workers} workers")
+            return self._executor
+
+    def _recycle(self, executor: ProcessPoolExecutor):
+        """Replace the pool, killing its workers (a timed-out job may still be running)."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    async def _run(self, fn, *args, retry: bool = True) -> Any:
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(executor, fn, *args), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self._recycle(executor)
+            raise TimeoutError(f"Extraction timed out after {self.timeout_seconds}s")
+        except BrokenProcessPool:
+            with self._lock:
+                recycled_elsewhere = self._executor is not executor
+            if recycled_elsewhere and retry:
+                # Another job's timeout replaced the pool under us; this task is innocent
+                return await self._run(fn, *args, retry=False)
+            # A worker died (e.g. hit the memory cap); start fresh for the next job
+            self._recycle(executor)
+            raise MemoryError("Extraction worker crashed (memory limit or parser fault)")
+
+    async def process_document(self, path: str, filename: str) -> Dict[str, Any]:
+        """
+        DocumentProcessor.process_document for a local file, run in the pool.
+
+        Returns the same result dict; extraction errors are reported in it.
+        """
+        try:
+            result = await self._run(_process_or_plan, path, filename, self.pages_per_task, self.ocr_pages_per_task)
+            if not result.get("split"):
+                return result
+            return await self._process_split(path, filename, result["format"])
+        except (TimeoutError, MemoryError) as e:
+            return {
+                "filename": filename,
+                "format": {"format_type": "unknown"},
+                "supported": False,
+                "text": "",
+                "quality_score": 0.0,
+                "error_message": f"Extraction failed: {str(e)}"
+            }
+
+    async def _process_split(self, path: str, filename: str, format_result: Dict[str, Any]) -> Dict[str, Any]:
+        from .quality_assessor import QualityAssessor
+
+        page_count = format_result["page_count"]
+        # OCR is ~100x slower per page than text extraction, so scans are split finer
+        step = self.ocr_pages_per_task if format_result.get("ocr") else self.pages_per_task
+        ranges = [(start, start + step) for start in range(0, page_count, step)]
+        print(f"⚙️ Extracting {page_count} pages of {filename} in {len(ranges)} parallel ranges")
+
+        result = {
+            "filename": filename,
+            "format": format_result,
+            "supported": True,
+            "text": "",
+            "quality_score": 0.0,
+            "error_message": None
+        }
+        try:
+            page_ranges = await asyncio.gather(
+                *(self._run(_extract_page_range, path, filename, start, stop) for start, stop in ranges)
+            )
+        except Exception as e:
+            result["supported"] = False
+            result["error_message"] = f"Extraction failed: {str(e)}"
+            return result
+
+        extraction, ocr_pages = ExtractionResult(), []
+        for (start, _), page_range in zip(ranges, page_ranges):
+            ocr_pages.extend(page_range["ocr_pages"])
+            for page_number, blocks in enumerate(page_range["pages"], start=start + 1):
+                for block in blocks:
+                    extraction.add(block, "block", page=page_number)
+        text = extraction.text
+        quality = await asyncio.to_thread(
+            QualityAssessor().assess_quality, text, format_result, extraction.page_texts()
+        )
+        result["text"] = text
+        result["extraction"] = extraction
+        result["quality_score"] = quality["score"]
+        result["page_quality"] = quality.get("pages", [])
+        result["ocr_pages"] = ocr_pages
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_extraction_pool: Optional[ExtractionPool] = None
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Process-wide extraction pool configured from settings."""
+    global _extraction_pool
+    if _extraction_pool is None:
+        from app.core.config import settings
+
+        _extraction_pool = ExtractionPool(
+            workers=settings.EXTRACTION_WORKERS,
+            pages_per_task=settings.EXTRACTION_PAGES_PER_TASK,
+            timeout_seconds=settings.EXTRACTION_TIMEOUT_SECONDS,
+            memory_limit_mb=settings.EXTRACTION_WORKER_MEMORY_MB,
+            ocr_pages_per_task=settings.OCR_PAGES_PER_TASK
+        )
+    return _extraction_pool
+
+
+def shutdown_extraction_pool():
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown()
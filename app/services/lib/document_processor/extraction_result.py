@@ -0,0 +1,115 @@
+"""
+Extraction Result
+Extracted text as an ordered list of blocks with their positions.
+
+Extractors append blocks (PDF text blocks, DOCX paragraphs and table rows)
+to a list and the document text is joined once, so assembly is linear in
+the size of the document. Each block remembers its page and its character
+offset in the joined text, so a passage can be cited back to its page.
+
+layout() serializes the block positions column-wise (one list per field)
+with both character and UTF-8 byte offsets, so a stored copy of the text can
+be sliced by page with ranged reads.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+BLOCK_SEPARATOR = "\n"
+LAYOUT_VERSION = 1
+
+
+@dataclass
+class TextBlock:
+    text: str
+    kind: str  # "block" (PDF), "paragraph" or "table_row" (DOCX)
+    page: Optional[int] = None  # 1-based page number (PDF only)
+    offset: int = 0  # Start of the block in ExtractionResult.text
+
+
+@dataclass
+class ExtractionResult:
+    blocks: List[TextBlock] = field(default_factory=list)
+    _text: Optional[str] = field(default=None, repr=False)
+    _offsets: List[int] = field(default_factory=list, repr=False)
+
+    def add(self, text: str, kind: str, page: Optional[int] = None):
+        """Append a block; whitespace-only blocks are skipped."""
+        text = (text or "").strip()
+        if text:
+            self.blocks.append(TextBlock(text=text, kind=kind, page=page))
+            self._text = None
+
+    @property
+    def text(self) -> str:
+        """All blocks joined once, recording each block's offset."""
+        if self._text is None:
+            offset, self._offsets = 0, []
+            for block in self.blocks:
+                block.offset = offset
+                self._offsets.append(offset)
+                offset += len(block.text) + len(BLOCK_SEPARATOR)
+            self._text = BLOCK_SEPARATOR.join(block.text for block in self.blocks)
+        return self._text
+
+    @property
+    def page_count(self) -> int:
+        return max((block.page or 0 for block in self.blocks), default=0)
+
+    def block_at(self, offset: int) -> Optional[TextBlock]:
+        """Block containing a character offset of the joined text."""
+        self.text  # Ensure offsets are current
+        index = bisect_right(self._offsets, offset) - 1
+        return self.blocks[index] if index >= 0 else None
+
+    def page_at(self, offset: int) -> Optional[int]:
+        """Page number for a character offset (None for DOCX)."""
+        block = self.block_at(offset)
+        return block.page if block else None
+
+    def page_texts(self) -> List[Dict[str, Any]]:
+        """[{"page", "text"}] per page, in page order (empty for DOCX)."""
+        pages: List[Dict[str, Any]] = []
+        for block in self.blocks:
+            if block.page is None:
+                continue
+            if pages and pages[-1]["page"] == block.page:
+                pages[-1]["parts"].append(block.text)
+            else:
+                pages.append({"page": block.page, "parts": [block.text]})
+        return [{"page": p["page"], "text": BLOCK_SEPARATOR.join(p["parts"])} for p in pages]
+
+    def layout(self) -> Dict[str, Any]:
+        """Columnar block positions (character and UTF-8 byte offsets)."""
+        self.text
+        byte_starts, byte_lengths, position = [], [], 0
+        for block in self.blocks:
+            size = len(block.text.encode("utf-8"))
+            byte_starts.append(position)
+            byte_lengths.append(size)
+            position += size + len(BLOCK_SEPARATOR)
+        return {
+            "version": LAYOUT_VERSION,
+            "separator": BLOCK_SEPARATOR,
+            "blocks": {
+                "page": [block.page for block in self.blocks],
+                "kind": [block.kind for block in self.blocks],
+                "char_start": [block.offset for block in self.blocks],
+                "char_length": [len(block.text) for block in self.blocks],
+                "byte_start": byte_starts,
+                "byte_length": byte_lengths
+            }
+        }
+
+    @classmethod
+    def from_layout(cls, text: str, layout: Dict[str, Any]) -> "ExtractionResult":
+        """Rebuild blocks from the joined text and its layout()."""
+        columns = layout["blocks"]
+        result = cls()
+        for page, kind, start, length in zip(columns["page"], columns["kind"],
+                                             columns["char_start"], columns["char_length"]):
+            result.blocks.append(TextBlock(text=text[start:start + length], kind=kind, page=page, offset=start))
+        result._offsets = list(columns["char_start"])
+        result._text = text
+        return result
@@ -0,0 +1,53 @@
+"""
+Extraction Store
+Persists structured extraction results next to the original in S3.
+
+Each document gets two objects under `{company}/{case}/{document}/.extraction/`:
+    text.txt     - the joined UTF-8 text
+    layout.json  - columnar block positions (page, kind, char/byte offsets)
+
+The layout records block positions as both character and UTF-8 byte
+offsets into text.txt, so page ranges can be sliced from it without
+re-extracting the document.
+"""
+
+import json
+from typing import Dict
+
+from .extraction_result import ExtractionResult
+
+EXTRACTION_DIR = ".extraction"
+
+
+def extraction_keys(document_s3_key: str) -> Dict[str, str]:
+    """S3 keys of the text and layout objects for a document."""
+    base = f"{document_s3_key.rsplit('/', 1)[0]}/{EXTRACTION_DIR}"
+    return {"text": f"{base}/text.txt", "layout": f"{base}/layout.json"}
+
+
+class ExtractionStore:
+    """Writes extraction artefacts to S3."""
+
+    def __init__(self):
+        self._s3 = None
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            from app.infrastructure.aws.s3_client import S3Client
+            self._s3 = S3Client()
+        return self._s3
+
+    def save(self, document_s3_key: str, document_id: str, extraction: ExtractionResult) -> bool:
+        keys = extraction_keys(document_s3_key)
+        layout = {"document_id": document_id, **extraction.layout()}
+        ok = self.s3.put_file_content(
+            keys["text"], extraction.text.encode("utf-8"), content_type="text/plain; charset=utf-8"
+        )
+        return bool(ok and self.s3.put_file_content(
+            keys["layout"], json.dumps(layout, separators=(",", ":")).encode("utf-8"), content_type="application/json"
+        ))
+
+
+# Global store (one per process)
+extraction_store = ExtractionStore()
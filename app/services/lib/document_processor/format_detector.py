@@ -4,9 +4,10 @@ Handles file format detection and scanned document identification.
 """
 
 import puremagic
-import io
-from typing import Dict, Any
-from pypdf import PdfReader
+from typing import Dict, Any, Tuple
+
+from .ocr import ocr_available
+from .parse_context import DocumentSource, ParseContext
 
 
 class FormatDetector:
@@ -18,39 +19,33 @@ class FormatDetector:
         # puremagic is stateless, no initialization needed
         pass
 
-    def detect_format(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+    def detect_format(self, file_content: DocumentSource, filename: str) -> Dict[str, Any]:
         """
         Detect document format and processing capabilities.
 
         Args:
-            file_content: Raw file bytes
+            file_content: Raw file bytes, or path to a local file
             filename: Original filename
 
         Returns:
             dict: Format detection results
         """
-        # Determine format using puremagic
-        try:
-            # Returns a list of matches, e.g. [[mime, name, confidence]]
-            matches = puremagic.magic_string(file_content)
-            if matches:
-                 # Take the most likely match (first one)
-                 # matches[0] is typically [mime_type, name, confidence]
-                 # But puremagic structure can vary, safely extract mime
-                 mime_type = matches[0].mime_type if hasattr(matches[0], 'mime_type') else matches[0][0]
-                 file_info = matches[0].name if hasattr(matches[0], 'name') else matches[0][1]
-            else:
-                 mime_type = "application/octet-stream"
-                 file_info = "Unknown Binary"
-        except Exception:
-             # Fallback
-             mime_type = "application/octet-stream"
-             file_info = "Unknown"
+        with ParseContext(file_content, filename, ocr=ocr_available()) as context:
+            return self.detect(context)
+
+    def detect(self, context: ParseContext) -> Dict[str, Any]:
+        """
+        Detect format from a parse context shared with extraction.
+
+        Only the header bytes are sniffed; for PDFs the first pages are read
+        through the context's single open document.
+        """
+        mime_type, file_info = self._sniff(context)
 
         result = {
             "mime_type": mime_type,
             "file_info": file_info,
-            "filename": filename,
+            "filename": context.filename,
             "format_type": None,
             "is_scanned": False,
             "supported": False,
@@ -60,10 +55,15 @@ class FormatDetector:
         # Determine format type
         if mime_type == "application/pdf":
             result["format_type"] = "pdf"
-            result["is_scanned"] = self._is_scanned_pdf(file_content)
-            result["supported"] = not result["is_scanned"]  # Text PDFs supported, scanned not yet
-            if result["is_scanned"]:
+            result["is_scanned"] = self._is_scanned_pdf(context)
+            # Text PDFs are always supported; scanned ones when OCR is available
+            result["supported"] = not result["is_scanned"] or context.ocr
+            if result["is_scanned"] and context.ocr:
+                result["ocr"] = True
+            if not result["supported"]:
                 result["error_message"] = "Scanned PDF processing not yet supported. Please upload text-based PDFs or DOCX files."
+            else:
+                result["page_count"] = context.page_count
 
         elif mime_type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                           "application/msword"]:
@@ -72,8 +72,11 @@ class FormatDetector:
 
         elif mime_type.startswith("image/"):
             result["format_type"] = "image"
-            result["supported"] = False
-            result["error_message"] = "Image processing not yet supported. Please upload PDF or DOCX files."
+            result["supported"] = context.ocr
+            if context.ocr:
+                result["ocr"] = True
+            else:
+                result["error_message"] = "Image processing not yet supported. Please upload PDF or DOCX files."
 
         else:
             result["format_type"] = "unknown"
@@ -82,25 +85,49 @@ class FormatDetector:
 
         return result
 
-    def _is_scanned_pdf(self, file_content: bytes) -> bool:
+    def _sniff(self, context: ParseContext) -> Tuple[str, str]:
+        """MIME type and description from the header bytes."""
+        header = context.header
+        # PDF readers accept the signature anywhere in the first 1 KB
+        if b"%PDF-" in header[:1024]:
+            return "application/pdf", "PDF document"
+
+        # Determine format using puremagic
+        try:
+            # Returns a list of matches, e.g. [[mime, name, confidence]]
+            matches = puremagic.magic_string(header, context.filename)
+            if matches:
+                 # Take the most likely match (first one)
+                 # matches[0] is typically [mime_type, name, confidence]
+                 # But puremagic structure can vary, safely extract mime
+                 mime_type = matches[0].mime_type if hasattr(matches[0], 'mime_type') else matches[0][0]
+                 file_info = matches[0].name if hasattr(matches[0], 'name') else matches[0][1]
+            else:
+                 mime_type = "application/octet-stream"
+                 file_info = "Unknown Binary"
+        except Exception:
+             # Fallback
+             mime_type = "application/octet-stream"
+             file_info = "Unknown"
+
+        return mime_type, file_info
+
+    def _is_scanned_pdf(self, context: ParseContext) -> bool:
         """
         Check if a PDF is scanned (image-based) vs text-based.
 
         Args:
-            file_content: PDF file bytes
+            context: Parse context of the PDF (page text read here is reused by extraction)
 
         Returns:
             bool: True if PDF appears to be scanned
         """
         try:
-            reader = PdfReader(io.BytesIO(file_content))
-
             # Check first few pages for extractable text
-            pages_to_check = min(3, len(reader.pages))
+            pages_to_check = min(ParseContext.SNIFF_PAGES, context.page_count)
 
             for page_num in range(pages_to_check):
-                page = reader.pages[page_num]
-                text = page.extract_text()
+                text = "\n".join(context.text_layer(page_num))
 
                 # If we find substantial text, it's likely not scanned
                 if text and len(text.strip()) > 50:  # Reasonable text threshold
@@ -0,0 +1,106 @@
+"""
+OCR Utility
+CPU-only text recognition for scanned PDF pages and images.
+
+Uses Tesseract through pytesseract (optional dependency; the `tesseract`
+binary must be installed with the language packs in settings.OCR_LANGUAGES).
+PDF pages are rendered with PyMuPDF. Recognised text is cached on local
+disk keyed by the hash of the rendered image, so re-uploads, duplicate
+annexures and retried jobs skip recognition. The cache is shared by the
+extraction worker processes.
+"""
+
+import hashlib
+import io
+import os
+from typing import Iterator, Optional
+
+# Pages with less text than this in their text layer are treated as scans
+MIN_TEXT_LAYER_CHARS = 50
+
+_available: Optional[bool] = None
+
+
+def _settings():
+    from app.core.config import settings
+    return settings
+
+
+def ocr_available() -> bool:
+    """True when OCR is enabled and pytesseract, Pillow and tesseract are present."""
+    global _available
+    if _available is None:
+        _available = False
+        if _settings().OCR_ENABLED:
+            try:
+                import pytesseract  # Optional dependency
+                from PIL import Image  # noqa: F401
+                pytesseract.get_tesseract_version()
+                _available = True
+            except Exception as e:
+                print(f"⚠️ OCR unavailable ({e}); scanned documents will not be processed")
+    return _available
+
+
+def _cache_path(image_hash: str) -> str:
+    settings = _settings()
+    return os.path.join(settings.OCR_CACHE_DIR, settings.OCR_LANGUAGES, image_hash[:2], f"{image_hash}.txt")
+
+
+def _read_cache(image_hash: str) -> Optional[str]:
+    try:
+        with open(_cache_path(image_hash), "r", encoding="utf-8") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def _write_cache(image_hash: str, text: str):
+    path = _cache_path(image_hash)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so concurrent workers never read a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ OCR cache write failed: {e}")
+
+
+def ocr_image_bytes(image_bytes: bytes) -> str:
+    """Recognise text in an encoded image (PNG/JPEG/TIFF frame), using the page cache."""
+    image_hash = hashlib.sha256(image_bytes).hexdigest()
+    cached = _read_cache(image_hash)
+    if cached is not None:
+        return cached
+
+    import pytesseract
+    from PIL import Image
+
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        text = pytesseract.image_to_string(image, lang=_settings().OCR_LANGUAGES)
+    _write_cache(image_hash, text)
+    return text
+
+
+def ocr_pdf_page(page) -> str:
+    """Render a PyMuPDF page and recognise its text."""
+    pixmap = page.get_pixmap(dpi=_settings().OCR_DPI, colorspace="gray")
+    return ocr_image_bytes(pixmap.tobytes("png"))
+
+
+def iter_image_frames(image_bytes: bytes) -> Iterator[bytes]:
+    """PNG-encoded frames of an image file (multi-page TIFFs have several)."""
+    from PIL import Image, ImageSequence
+
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        for frame in ImageSequence.Iterator(image):
+            buffer = io.BytesIO()
+            frame.convert("L").save(buffer, format="PNG")
+            yield buffer.getvalue()
+
+
+def page_needs_ocr(page, text_layer: str) -> bool:
+    """A page with almost no text layer but with images is a scan."""
+    return len(text_layer.strip()) < MIN_TEXT_LAYER_CHARS and bool(page.get_images())
@@ -0,0 +1,150 @@
+"""
+Parse Context
+One open document shared by format detection, text extraction and quality
+assessment, so each file is parsed once per processing run.
+"""
+
+import io
+import os
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# Documents are passed either as bytes or as a path to a local file
+DocumentSource = Union[bytes, str, os.PathLike]
+
+
+def is_file_source(source: DocumentSource) -> bool:
+    """True when the source is a path on disk rather than bytes in memory."""
+    return isinstance(source, (str, os.PathLike))
+
+
+class ParseContext:
+    """
+    Lazily opened view of one document.
+
+    Magic detection only sees the header bytes. The PDF is opened once
+    (PyMuPDF, or pypdf when PyMuPDF is missing) and the text blocks of the
+    first pages, read during scanned-document detection, are kept for
+    extraction. Later pages are not cached so memory stays flat for long
+    bundles.
+
+    With ocr=True, PDF pages that are scans (images with almost no text
+    layer) are recognised with OCR during extraction; detection always sees
+    the text layer only.
+
+    Use as a context manager, or call close().
+    """
+
+    HEADER_BYTES = 8192
+    SNIFF_PAGES = 3
+
+    def __init__(self, source: DocumentSource, filename: str, ocr: bool = False):
+        self.source = source
+        self.filename = filename
+        self.ocr = ocr
+        self.ocr_pages: List[int] = []
+        self.is_file = is_file_source(source)
+        self._header: Optional[bytes] = None
+        self._pdf: Any = None
+        self._pdf_backend: Optional[str] = None
+        self._handle = None
+        self._page_blocks: Dict[int, List[str]] = {}
+
+    def __enter__(self) -> "ParseContext":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def header(self) -> bytes:
+        """First HEADER_BYTES bytes of the file."""
+        if self._header is None:
+            if self.is_file:
+                with open(self.source, "rb") as fh:
+                    self._header = fh.read(self.HEADER_BYTES)
+            else:
+                self._header = bytes(self.source[:self.HEADER_BYTES])
+        return self._header
+
+    def read_bytes(self) -> bytes:
+        """The whole file (for formats parsed in memory, e.g. images)."""
+        if self.is_file:
+            with open(self.source, "rb") as fh:
+                return fh.read()
+        return bytes(self.source)
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.source) if self.is_file else len(self.source)
+
+    @property
+    def pdf(self) -> Any:
+        """The open PDF document (raises if the file cannot be parsed)."""
+        if self._pdf is None:
+            try:
+                import fitz  # PyMuPDF
+            except ImportError:
+                print("Warning: PyMuPDF not available, falling back to pypdf")
+                from pypdf import PdfReader
+
+                # PdfReader(path) would read the whole file into memory; a handle is read lazily
+                self._handle = open(self.source, "rb") if self.is_file else io.BytesIO(self.source)
+                self._pdf = PdfReader(self._handle)
+                self._pdf_backend = "pypdf"
+            else:
+                if self.is_file:
+                    self._pdf = fitz.open(self.source)
+                else:
+                    self._pdf = fitz.open(stream=self.source, filetype="pdf")
+                self._pdf_backend = "fitz"
+        return self._pdf
+
+    @property
+    def page_count(self) -> int:
+        pdf = self.pdf
+        return len(pdf.pages) if self._pdf_backend == "pypdf" else pdf.page_count
+
+    def text_layer(self, index: int) -> List[str]:
+        """
+        Text-layer blocks of one PDF page in reading order (the first
+        SNIFF_PAGES pages are cached). pypdf has no layout blocks and yields
+        the page.
+        """
+        if index in self._page_blocks:
+            return self._page_blocks[index]
+
+        pdf = self.pdf
+        if self._pdf_backend == "pypdf":
+            blocks = [pdf.pages[index].extract_text() or ""]
+        else:
+            # (x0, y0, x1, y1, text, block_no, block_type); type 0 is text, 1 is image
+            blocks = [b[4] for b in pdf.load_page(index).get_text("blocks", sort=True) if b[6] == 0]
+
+        if index < self.SNIFF_PAGES:
+            self._page_blocks[index] = blocks
+        return blocks
+
+    def page_blocks(self, index: int) -> List[str]:
+        """Text blocks of one PDF page, recognised with OCR when the page is a scan."""
+        blocks = self.text_layer(index)
+        if self.ocr and self._pdf_backend == "fitz":
+            from .ocr import ocr_pdf_page, page_needs_ocr
+
+            page = self.pdf.load_page(index)
+            if page_needs_ocr(page, "\n".join(blocks)):
+                self.ocr_pages.append(index + 1)
+                return [ocr_pdf_page(page)]
+        return blocks
+
+    def iter_page_blocks(self) -> Iterator[List[str]]:
+        for index in range(self.page_count):
+            yield self.page_blocks(index)
+
+    def close(self):
+        if self._pdf is not None and self._pdf_backend == "fitz":
+            self._pdf.close()
+        if self._handle is not None:
+            self._handle.close()
+        self._pdf = None
+        self._handle = None
+        self._page_blocks.clear()
@@ -3,25 +3,77 @@ Quality Assessment Utility
 Evaluates the quality and completeness of extracted text.
 """
 
-from typing import Dict, Any
+from collections import Counter
+from typing import Dict, Any, List, Optional
 import re
 
+_WORD_PATTERN = re.compile(r'\b\w+\b')
+
+# Common document structure indicators, one alternation matched per line
+_STRUCTURE_PATTERN = re.compile(
+    r'^(?:'
+    r'[A-Z][A-Z\s]{10,}$'  # ALL CAPS HEADINGS
+    r'|\d+\.'  # Numbered lists
+    r'|•'  # Bullet points
+    r'|[IVX]+\.'  # Roman numerals
+    r'|\([a-z]\)'  # Lowercase letter lists
+    r')',
+    re.IGNORECASE
+)
+
+# Common English words and legal terms
+ENGLISH_INDICATORS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+    'agreement', 'contract', 'party', 'parties', 'court', 'case', 'law', 'legal',
+    'shall', 'hereby', 'witness', 'whereas', 'therefore'
+})
+
+# Document completeness indicators
+COMPLETENESS_INDICATORS = frozenset({
+    'witness', 'signature', 'executed', 'agreement', 'contract', 'date', 'party', 'parties'
+})
+
+# Texts longer than this are sampled rather than tokenized in full
+SAMPLE_THRESHOLD_CHARS = 200_000
+SAMPLE_WINDOWS = 20
+SAMPLE_WINDOW_CHARS = 10_000
+
+# A page with less text than this is flagged (likely a scanned or image-only page)
+LOW_TEXT_PAGE_CHARS = 200
+
+
+def sample_text(text: str) -> str:
+    """
+    The whole text if short, else evenly spaced windows covering its head
+    and tail (where titles, dates and signature blocks sit).
+    """
+    if len(text) <= SAMPLE_THRESHOLD_CHARS:
+        return text
+    step = (len(text) - SAMPLE_WINDOW_CHARS) / (SAMPLE_WINDOWS - 1)
+    windows = [text[int(i * step):int(i * step) + SAMPLE_WINDOW_CHARS] for i in range(SAMPLE_WINDOWS)]
+    return "\n".join(windows)
+
 
 class QualityAssessor:
     """
     Assesses the quality of extracted document text.
+
+    Words are tokenized once (over a sample for large documents) and the
+    language and completeness checks read from the same token counts.
     """
 
-    def assess_quality(self, text: str, format_result: Dict[str, Any]) -> Dict[str, Any]:
+    def assess_quality(self, text: str, format_result: Dict[str, Any],
+                       pages: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Assess the quality of extracted text.
 
         Args:
             text: Extracted text content
             format_result: Format detection results
+            pages: Optional [{"page", "text"}] for per-page results
 
         Returns:
-            dict: Quality assessment results
+            dict: Quality assessment results (with "pages" when pages were given)
         """
         if not text or not text.strip():
             return {
@@ -43,7 +95,7 @@ class QualityAssessor:
         # Generate recommendations
         recommendations = self._generate_recommendations(checks, format_result)
 
-        return {
+        result = {
             "score": round(score, 2),
             "grade": grade,
             "issues": checks.get("issues", []),
@@ -55,6 +107,9 @@ class QualityAssessor:
                 "completeness_score": checks.get("completeness_score", 0)
             }
         }
+        if pages:
+            result["pages"] = self.assess_pages(pages)
+        return result
 
     def _perform_quality_checks(self, text: str, format_result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -87,21 +142,28 @@ class QualityAssessor:
         # Structure detection
         checks["has_structure"] = self._has_document_structure(text)
 
+        # Single tokenization shared by the language and completeness checks
+        sample = sample_text(text)
+        counts = Counter(_WORD_PATTERN.findall(sample.lower()))
+        total_words = sum(counts.values())
+        # Scale the sampled count to the whole document for the short-text penalty
+        estimated_words = total_words * len(text) / len(sample) if sample else 0
+
         # Language detection (basic check for English)
-        checks["language_confidence"] = self._detect_language_confidence(text)
+        checks["language_confidence"] = self._detect_language_confidence(counts, total_words, estimated_words)
 
         if checks["language_confidence"] < 0.5:
             checks["issues"].append("Low language confidence - possible OCR errors")
 
         # Completeness check
-        checks["completeness_score"] = self._check_completeness(text)
+        checks["completeness_score"] = self._check_completeness(counts)
 
         if checks["completeness_score"] < 0.3:
             checks["issues"].append("Document appears incomplete")
 
         # Format-specific checks
         format_type = format_result.get("format_type")
-        if format_type == "pdf" and format_result.get("is_scanned"):
+        if format_type == "pdf" and format_result.get("is_scanned") and not format_result.get("ocr"):
             checks["issues"].append("Document appears to be scanned - OCR may be needed")
 
         return checks
@@ -116,85 +178,86 @@ class QualityAssessor:
         Returns:
             bool: True if structured content detected
         """
-        # Look for common document structure indicators
-        structure_indicators = [
-            r'^[A-Z][A-Z\s]{10,}$',  # ALL CAPS HEADINGS
-            r'^\d+\.',  # Numbered lists
-            r'^•',  # Bullet points
-            r'^[IVX]+\.',  # Roman numerals
-            r'^\([a-z]\)',  # Lowercase letter lists
-        ]
-
-        lines = text.split('\n')
+        # Check first 50 lines (without splitting the whole document)
         structured_lines = 0
-
-        for line in lines[:50]:  # Check first 50 lines
+        for line in text.split('\n', 50)[:50]:
             line = line.strip()
-            if not line:
-                continue
-
-            for pattern in structure_indicators:
-                if re.match(pattern, line, re.IGNORECASE):
-                    structured_lines += 1
-                    break
+            if line and _STRUCTURE_PATTERN.match(line):
+                structured_lines += 1
 
         # Consider it structured if > 20% of lines have structure
-        return (structured_lines / max(1, len(lines))) > 0.2
+        total_lines = text.count('\n') + 1
+        return (structured_lines / max(1, total_lines)) > 0.2
 
-    def _detect_language_confidence(self, text: str) -> float:
+    def _detect_language_confidence(self, counts: Counter, total_words: int, estimated_words: float) -> float:
         """
         Basic language confidence check (focused on English legal text).
 
         Args:
-            text: Extracted text
+            counts: Word counts of the (sampled) text
+            total_words: Number of words counted
+            estimated_words: Word count estimated for the whole document
 
         Returns:
             float: Confidence score (0.0 to 1.0)
         """
-        # Common English words and legal terms
-        english_indicators = [
-            'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
-            'agreement', 'contract', 'party', 'parties', 'court', 'case', 'law', 'legal',
-            'shall', 'hereby', 'witness', 'whereas', 'therefore'
-        ]
-
-        words = re.findall(r'\b\w+\b', text.lower())
-        if not words:
+        if not total_words:
             return 0.0
 
-        english_words = sum(1 for word in words if word in english_indicators)
-        confidence = english_words / len(words)
+        english_words = sum(counts[word] for word in ENGLISH_INDICATORS)
+        confidence = english_words / total_words
 
         # Penalize very short texts
-        if len(words) < 50:
+        if estimated_words < 50:
             confidence *= 0.5
 
         return min(1.0, confidence * 2)  # Scale up for better sensitivity
 
-    def _check_completeness(self, text: str) -> float:
+    def _check_completeness(self, counts: Counter) -> float:
         """
         Check if document appears complete.
 
         Args:
-            text: Extracted text
+            counts: Word counts of the (sampled) text
 
         Returns:
             float: Completeness score (0.0 to 1.0)
         """
-        # Look for document completeness indicators
-        completeness_indicators = [
-            r'witness', r'signature', r'executed', r'agreement',
-            r'contract', r'date', r'party', r'parties'
-        ]
+        found_indicators = sum(1 for indicator in COMPLETENESS_INDICATORS if indicator in counts)
+        return found_indicators / len(COMPLETENESS_INDICATORS)
 
-        found_indicators = 0
-        text_lower = text.lower()
+    def assess_pages(self, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Cheap per-page quality, to find scanned or garbled pages inside an
+        otherwise good bundle.
 
-        for indicator in completeness_indicators:
-            if re.search(r'\b' + indicator + r'\b', text_lower):
-                found_indicators += 1
+        Args:
+            pages: [{"page": int, "text": str}]
 
-        return found_indicators / len(completeness_indicators)
+        Returns:
+            list: [{"page", "chars", "score", "issues"}]
+        """
+        results = []
+        for entry in pages:
+            text = entry["text"]
+            counts = Counter(_WORD_PATTERN.findall(text.lower()))
+            total_words = sum(counts.values())
+            issues = []
+
+            if len(text) < LOW_TEXT_PAGE_CHARS:
+                issues.append("low_text")
+            language = self._detect_language_confidence(counts, total_words, total_words)
+            if total_words and language < 0.5:
+                issues.append("low_language_confidence")
+
+            density = min(1.0, len(text) / 2000)
+            results.append({
+                "page": entry["page"],
+                "chars": len(text),
+                "score": round(density * 0.6 + language * 0.4, 2),
+                "issues": issues
+            })
+        return results
 
     def _calculate_quality_score(self, checks: Dict[str, Any]) -> float:
         """
@@ -272,7 +335,7 @@ class QualityAssessor:
             recommendations.append("Document appears incomplete - check original file")
 
         format_type = format_result.get("format_type")
-        if format_type == "pdf" and format_result.get("is_scanned"):
+        if format_type == "pdf" and format_result.get("is_scanned") and not format_result.get("ocr"):
             recommendations.append("Scanned PDF detected - OCR processing recommended for Phase 1B")
 
         return recommendations if recommendations else ["Document quality appears good"]
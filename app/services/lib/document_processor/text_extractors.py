@@ -4,133 +4,132 @@ Handles text extraction from different document formats.
 """
 
 import io
-from typing import Dict, Any, Optional
-from pypdf import PdfReader
+from typing import Dict, Any
 from docx import Document as DocxDocument
 
+from .extraction_result import ExtractionResult
+from .ocr import ocr_available
+from .parse_context import DocumentSource, ParseContext
+
+# WordprocessingML element names
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_P, _TBL, _TR, _TC, _T, _TAB, _BR, _CR = (
+    _W + "p", _W + "tbl", _W + "tr", _W + "tc", _W + "t", _W + "tab", _W + "br", _W + "cr"
+)
+
 
 class TextExtractor:
     """
     Extracts text from various document formats.
     """
 
-    def extract_text(self, file_content: bytes, format_result: Dict[str, Any]) -> str:
+    def extract_text(self, file_content: DocumentSource, format_result: Dict[str, Any]) -> str:
         """
         Extract text from document based on detected format.
 
         Args:
-            file_content: Raw file bytes
+            file_content: Raw file bytes, or path to a local file
             format_result: Format detection results from FormatDetector
 
         Returns:
             str: Extracted text content
 
+        Raises:
+            ValueError: If format is not supported or extraction fails
+        """
+        ocr = bool(format_result.get("ocr")) and ocr_available()
+        with ParseContext(file_content, format_result.get("filename", ""), ocr=ocr) as context:
+            return self.extract(context, format_result).text
+
+    def extract(self, context: ParseContext, format_result: Dict[str, Any]) -> ExtractionResult:
+        """
+        Extract text blocks through a parse context shared with format detection.
+
+        Returns:
+            ExtractionResult: Ordered blocks (pages, paragraphs, table rows) with positions
+
         Raises:
             ValueError: If format is not supported or extraction fails
         """
         format_type = format_result.get("format_type")
 
         if format_type == "pdf":
-            return self._extract_pdf_text(file_content)
+            # Page by page: only the current page's blocks are parsed at a time
+            result = ExtractionResult()
+            try:
+                for page_number, blocks in enumerate(context.iter_page_blocks(), start=1):
+                    for block in blocks:
+                        result.add(block, "block", page=page_number)
+            except Exception as e:
+                raise ValueError(f"PDF text extraction failed: {str(e)}")
+            return result
         elif format_type == "docx":
-            return self._extract_docx_text(file_content)
+            return self._extract_docx(context.source)
         elif format_type == "image":
-            raise ValueError("Image processing not yet supported")
+            if not context.ocr:
+                raise ValueError("Image processing not yet supported")
+            return self._extract_image(context)
         else:
             raise ValueError(f"Unsupported format for text extraction: {format_type}")
 
-    def _extract_pdf_text(self, file_content: bytes) -> str:
-        """
-        Extract text from PDF using PyMuPDF (fitz).
+    def _extract_image(self, context: ParseContext) -> ExtractionResult:
+        """OCR each frame of an image (multi-page TIFFs have several) as a page."""
+        from .ocr import iter_image_frames, ocr_image_bytes
 
-        Args:
-            file_content: PDF file bytes
-
-        Returns:
-            str: Extracted text
-        """
+        result = ExtractionResult()
         try:
-            import fitz  # PyMuPDF
-
-            # Open PDF from bytes
-            doc = fitz.open(stream=file_content, filetype="pdf")
-            text = ""
-
-            # Extract text from all pages
-            for page in doc:
-                page_text = page.get_text()
-                if page_text.strip():
-                    text += page_text + "\n"
-
-            doc.close()
-            return text.strip()
-
-        except ImportError:
-            # Fallback to pypdf if PyMuPDF not available
-            print("Warning: PyMuPDF not available, falling back to pypdf")
-            return self._extract_pdf_text_pypdf(file_content)
+            for page_number, frame in enumerate(iter_image_frames(context.read_bytes()), start=1):
+                result.add(ocr_image_bytes(frame), "block", page=page_number)
+                context.ocr_pages.append(page_number)
         except Exception as e:
-            raise ValueError(f"PDF text extraction failed: {str(e)}")
+            raise ValueError(f"Image OCR failed: {str(e)}")
+        return result
 
-    def _extract_pdf_text_pypdf(self, file_content: bytes) -> str:
+    def _extract_docx(self, file_content: DocumentSource) -> ExtractionResult:
         """
-        Fallback PDF extraction using pypdf.
+        Extract DOCX paragraphs and table rows in document order.
 
-        Args:
-            file_content: PDF file bytes
-
-        Returns:
-            str: Extracted text
-        """
-        try:
-            reader = PdfReader(io.BytesIO(file_content))
-            text = ""
-
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text.strip():
-                    text += page_text + "\n"
-
-            return text.strip()
-
-        except Exception as e:
-            raise ValueError(f"PDF fallback extraction failed: {str(e)}")
-
-    def _extract_docx_text(self, file_content: bytes) -> str:
-        """
-        Extract text from DOCX document.
+        Walks the body XML directly: python-docx's row.cells rebuilds the
+        cell grid for every row, which is quadratic on long tables.
 
         Args:
-            file_content: DOCX file bytes
+            file_content: DOCX file bytes or path
 
         Returns:
-            str: Extracted text
+            ExtractionResult: Paragraph and table-row blocks
         """
         try:
-            # Create a BytesIO object for python-docx
-            docx_file = io.BytesIO(file_content)
-            doc = DocxDocument(docx_file)
-
-            text = ""
-
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text += paragraph.text + "\n"
-
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text += cell.text + " "
-                    text += "\n"
-
-            return text.strip()
+            # python-docx reads paths directly; bytes go through BytesIO
+            docx_file = io.BytesIO(file_content) if isinstance(file_content, (bytes, bytearray)) else file_content
+            body = DocxDocument(docx_file).element.body
+
+            result = ExtractionResult()
+            for element in body.iterchildren():
+                if element.tag == _P:
+                    result.add(self._paragraph_text(element), "paragraph")
+                elif element.tag == _TBL:
+                    for row in element.iter(_TR):
+                        cells = [self._cell_text(cell) for cell in row.iterchildren(_TC)]
+                        result.add(" ".join(cell for cell in cells if cell.strip()), "table_row")
+            return result
 
         except Exception as e:
             raise ValueError(f"DOCX text extraction failed: {str(e)}")
 
+    def _paragraph_text(self, paragraph) -> str:
+        parts = []
+        for node in paragraph.iter(_T, _TAB, _BR, _CR):
+            if node.tag == _T:
+                parts.append(node.text or "")
+            elif node.tag == _TAB:
+                parts.append("\t")
+            else:
+                parts.append("\n")
+        return "".join(parts)
+
+    def _cell_text(self, cell) -> str:
+        return "\n".join(self._paragraph_text(p) for p in cell.iterchildren(_P))
+
     def get_extraction_stats(self, text: str, format_result: Dict[str, Any]) -> Dict[str, Any]:
         """
         Get statistics about the extracted text.
@@ -0,0 +1,35 @@
+import boto3
+from app.core.config import settings
+
+def create_llm_cache_table():
+    dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION)
+    client = boto3.client('dynamodb', region_name=settings.AWS_REGION)
+    table_name = settings.DYNAMODB_TABLE_LLM_CACHE
+    
+    print(f"Creating table: {table_name}")
+    
+    try:
+        table = dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {'AttributeName': 'cacheKey', 'KeyType': 'HASH'}  # Partition key
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'cacheKey', 'AttributeType': 'S'}
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        print("Table status:", table.table_status)
+        table.wait_until_exists()
+
+        # Expire entries automatically
+        client.update_time_to_live(
+            TableName=table_name,
+            TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expiresAt'}
+        )
+        print("Table created successfully!")
+    except Exception as e:
+        print(f"Error creating table: {e}")
+
+if __name__ == "__main__":
+    create_llm_cache_table()
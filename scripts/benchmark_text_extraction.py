@@ -0,0 +1,109 @@
+"""
+Benchmark DOCX/PDF text assembly.
+
+Builds a synthetic long contract (numbered clauses plus a large schedule
+table) and compares the old extraction loop (string += and python-docx
+row.cells) with TextExtractor's XML walk and join-once assembly.
+
+Usage:
+    python scripts/benchmark_text_extraction.py [--paragraphs 5000] [--rows 2000] [--cols 6]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+# Add app to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document as DocxDocument
+
+from app.services.lib.document_processor.extraction_result import ExtractionResult
+from app.services.lib.document_processor.text_extractors import TextExtractor
+
+
+def build_contract(paragraphs: int, rows: int, cols: int) -> bytes:
+    doc = DocxDocument()
+    for i in range(paragraphs):
+        doc.add_paragraph(
+            f"{i + 1}. The Licensee shall indemnify the Licensor against all claims arising "
+            f"under clause {i + 1} of this Agreement, save as provided in the Schedule."
+        )
+    table = doc.add_table(rows=rows, cols=cols)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"Item {r}.{c}"
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_docx_text(content: bytes) -> str:
+    """The previous implementation, kept here for comparison."""
+    doc = DocxDocument(io.BytesIO(content))
+    text = ""
+    for paragraph in doc.paragraphs:
+        if paragraph.text.strip():
+            text += paragraph.text + "\n"
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                if cell.text.strip():
+                    text += cell.text + " "
+            text += "\n"
+    return text.strip()
+
+
+def legacy_pdf_assembly(pages) -> str:
+    text = ""
+    for page_text in pages:
+        if page_text.strip():
+            text += page_text + "\n"
+    return text.strip()
+
+
+def pdf_assembly(pages) -> str:
+    result = ExtractionResult()
+    for number, page_text in enumerate(pages, start=1):
+        result.add(page_text, "block", page=number)
+    return result.text
+
+
+def timed(label: str, fn, *args):
+    start = time.perf_counter()
+    output = fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms  ({len(output):,} chars)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--cols", type=int, default=6)
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"Building contract: {args.paragraphs} paragraphs, {args.rows}x{args.cols} table...")
+    content = build_contract(args.paragraphs, args.rows, args.cols)
+    print(f"DOCX size: {len(content) / 1024:.0f} KB\n")
+
+    print("DOCX extraction")
+    extractor = TextExtractor()
+    old = timed("legacy (+=, row.cells)", legacy_docx_text, content)
+    new = timed("XML walk + join once", lambda c: extractor._extract_docx(c).text, content)
+    print(f"  speedup: {old / new:.1f}x\n")
+
+    print(f"PDF page assembly ({args.pages} pages)")
+    pages = [f"Page {i}\n" + "The petitioner submits that the impugned order is bad in law. " * 40
+             for i in range(args.pages)]
+    old = timed("legacy (+=)", legacy_pdf_assembly, pages)
+    new = timed("ExtractionResult", pdf_assembly, pages)
+    print(f"  speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from app.agents.workflows.drafting.context_packer import (
+    ContextItem,
+    extract_terms,
+    pack_context,
+    relevance_score
+)
+
+
+def test_extract_terms_splits_identifiers():
+    terms = extract_terms("court_name caseNumber of the Petition")
+    assert terms == {"court", "name", "case", "number", "petition"}
+
+
+def test_relevance_prefers_matching_items():
+    query = extract_terms("court_name")
+    assert relevance_score(query, "Filed before the Delhi court") > relevance_score(query, "Bank statement for March")
+
+
+def test_pack_respects_budget_and_keeps_required():
+    items = [
+        ContextItem(key="required", text="caseName: Sharma v Sharma", required=True),
+        ContextItem(key="relevant", text="court " * 200, score=1.0),
+        ContextItem(key="filler", text="misc " * 200, score=0.1),
+        ContextItem(key="large", text="word " * 5000, score=0.9),
+    ]
+    result = pack_context(items, budget=700)
+
+    keys = [item.key for item in result.selected]
+    assert keys == ["required", "relevant", "filler"]
+    assert result.used_tokens <= 700
+    assert [item.key for item in result.dropped] == ["large"]
+
+
+def test_pack_skips_zero_score_items():
+    items = [ContextItem(key="irrelevant", text="nothing useful", score=0.0)]
+    assert pack_context(items, budget=1000).selected == []
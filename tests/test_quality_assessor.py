@@ -0,0 +1,25 @@
+from app.services.lib.document_processor.quality_assessor import QualityAssessor, sample_text
+
+PARAGRAPH = "1. The parties executed the agreement dated 14.03.2015 before the court and a witness.\n"
+
+
+def test_structure_ratio_uses_total_line_count():
+    assessor = QualityAssessor()
+    assert assessor._has_document_structure(PARAGRAPH * 40)
+    # Only the first 50 lines are inspected, but the ratio is over all lines
+    checks = assessor._perform_quality_checks(PARAGRAPH * 5000, {})
+    assert not checks["has_structure"]
+    assert checks["completeness_score"] > 0.5
+
+
+def test_large_text_is_sampled_from_head_to_tail():
+    text = "HEAD " + "x" * 500_000 + " TAIL"
+    sample = sample_text(text)
+    assert len(sample) < len(text)
+    assert sample.startswith("HEAD") and sample.endswith("TAIL")
+
+
+def test_per_page_quality_flags_empty_pages():
+    pages = [{"page": 1, "text": PARAGRAPH * 30}, {"page": 2, "text": ""}]
+    result = QualityAssessor().assess_quality(PARAGRAPH * 30, {"page_count": 2}, pages=pages)
+    assert [p["page"] for p in result["pages"] if p["issues"]] == [2]
@@ -0,0 +1,40 @@
+from app.agents.workflows.drafting.template_compiler import compile_template
+
+TEMPLATE = (
+    "IN THE {court_name}\n{{ case_number }}\n"
+    "{{#if child_name}}One child, {child_name}, was born.{{else}}No child was born.{{/if}}\n"
+    "[NARRATIVE_SECTION]"
+)
+
+
+def test_placeholders_conditions_and_markers_are_indexed():
+    compiled = compile_template(TEMPLATE)
+    assert compiled.placeholder_order == ("court_name", "case_number", "child_name")
+    assert compiled.conditions == {"child_name"}
+    assert compiled.markers == ("[NARRATIVE_SECTION]",)
+    assert not compiled.is_deterministic
+    assert compile_template(TEMPLATE) is compiled
+
+
+def test_render_resolves_conditionals_and_marks_missing():
+    compiled = compile_template(TEMPLATE)
+    text = compiled.render({"court_name": "Family Court, Dwarka", "child_name": "Aarav"})
+    assert "IN THE Family Court, Dwarka" in text
+    assert "[MISSING: case_number]" in text
+    assert "One child, Aarav, was born." in text
+    assert "No child" not in text
+    assert "{{ case_number }}" in compiled.render({}, missing=None)
+
+
+def test_keep_missing_preserves_unresolved_conditionals():
+    compiled = compile_template(TEMPLATE)
+    kept = compiled.render({"court_name": "Family Court"}, missing=None)
+    assert "{{#if child_name}}One child, {child_name}, was born.{{else}}No child was born.{{/if}}" in kept
+    assert "IN THE Family Court" in kept
+    assert "No child was born." in compiled.render({"child_name": ""}, missing=None)
+
+
+def test_unbalanced_tags_are_kept_as_text():
+    compiled = compile_template("Dated {date} {{/if}} {{#if signed}}by {name}")
+    assert compiled.placeholder_order == ("date", "name")
+    assert compiled.render({"date": "1 May", "name": "R"}) == "Dated 1 May {{/if}} {{#if signed}}by R"